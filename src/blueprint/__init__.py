@@ -1,52 +1,182 @@
 """blueprint -- magical blueprints for procedural generation of content.
 
 Based roughly on http://www.squidi.net/mapmaker/musings/m100402.php
+
+Submodules, and the public names they provide, are imported on first use,
+so that ``import blueprint`` stays cheap for short-lived processes.
 """
 
-from blueprint import base, collection, dice, factories, fields, mods, taggables
+from __future__ import annotations
+
+import importlib
+
 from blueprint._version import VERSION
-from blueprint.base import Blueprint
-from blueprint.collection import BlueprintCollection
-from blueprint.factories import Factory
-from blueprint.fields import (
-    All,
-    Dice,
-    DiceTable,
-    Field,
-    FormatTemplate,
-    PickFrom,
-    PickOne,
-    Property,
-    RandomInt,
-    WithTags,
-    defer_to_end,
-    depends_on,
-    generator,
-    resolve,
-)
-from blueprint.markov import MarkovChain
-from blueprint.mods import Mod
+
+# Avoid importing ``typing`` at runtime; type checkers treat this name specially.
+TYPE_CHECKING = False  # noqa: RUF067
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from blueprint import (
+        alias,
+        base,
+        chunks,
+        collection,
+        dice,
+        factories,
+        fields,
+        grammar,
+        grid,
+        loot,
+        manifest,
+        mods,
+        noise,
+        outcomes,
+        pool,
+        prefetch,
+        tables,
+        taggables,
+    )
+    from blueprint.base import Blueprint
+    from blueprint.chunks import ChunkCollection
+    from blueprint.collection import BlueprintCollection
+    from blueprint.factories import Factory
+    from blueprint.fields import (
+        All,
+        Attr,
+        CachedProperty,
+        Dice,
+        DiceTable,
+        Equal,
+        Field,
+        FormatTemplate,
+        ListOf,
+        Max,
+        Min,
+        NotEqual,
+        PickFrom,
+        PickOne,
+        Property,
+        RandomInt,
+        ShuffleBag,
+        Stream,
+        WeightedPickOne,
+        Where,
+        WithTags,
+        defer_to_end,
+        depends_on,
+        generator,
+        resolve,
+    )
+    from blueprint.grammar import Grammar
+    from blueprint.grid import Grid
+    from blueprint.loot import LootTable
+    from blueprint.markov import MarkovChain
+    from blueprint.mods import Mod
+    from blueprint.noise import Noise
+    from blueprint.tables import TableField
 
 __version__ = VERSION
 
+_SUBMODULES = frozenset({  # noqa: RUF067
+    'alias',
+    'base',
+    'chunks',
+    'collection',
+    'dice',
+    'factories',
+    'fields',
+    'grammar',
+    'grid',
+    'loot',
+    'manifest',
+    'markov',
+    'mods',
+    'noise',
+    'outcomes',
+    'pool',
+    'prefetch',
+    'tables',
+    'taggables',
+})
+
+_ATTRIBUTES = {  # noqa: RUF067
+    'All': 'fields',
+    'Attr': 'fields',
+    'Blueprint': 'base',
+    'BlueprintCollection': 'collection',
+    'CachedProperty': 'fields',
+    'ChunkCollection': 'chunks',
+    'Dice': 'fields',
+    'DiceTable': 'fields',
+    'Equal': 'fields',
+    'Factory': 'factories',
+    'Field': 'fields',
+    'FormatTemplate': 'fields',
+    'Grammar': 'grammar',
+    'Grid': 'grid',
+    'ListOf': 'fields',
+    'LootTable': 'loot',
+    'MarkovChain': 'markov',
+    'Max': 'fields',
+    'Min': 'fields',
+    'Mod': 'mods',
+    'Noise': 'noise',
+    'NotEqual': 'fields',
+    'PickFrom': 'fields',
+    'PickOne': 'fields',
+    'Property': 'fields',
+    'RandomInt': 'fields',
+    'ShuffleBag': 'fields',
+    'Stream': 'fields',
+    'TableField': 'tables',
+    'WeightedPickOne': 'fields',
+    'Where': 'fields',
+    'WithTags': 'fields',
+    'defer_to_end': 'fields',
+    'depends_on': 'fields',
+    'generator': 'fields',
+    'resolve': 'fields',
+}
+
 __all__ = [
     'All',
+    'Attr',
     'Blueprint',
     'BlueprintCollection',
+    'CachedProperty',
+    'ChunkCollection',
     'Dice',
     'DiceTable',
+    'Equal',
     'Factory',
     'Field',
     'FormatTemplate',
+    'Grammar',
+    'Grid',
+    'ListOf',
+    'LootTable',
     'MarkovChain',
+    'Max',
+    'Min',
     'Mod',
+    'Noise',
+    'NotEqual',
     'PickFrom',
     'PickOne',
     'Property',
     'RandomInt',
+    'ShuffleBag',
+    'Stream',
+    'TableField',
+    'WeightedPickOne',
+    'Where',
     'WithTags',
     '__version__',
+    'alias',
     'base',
+    'chunks',
     'collection',
     'defer_to_end',
     'depends_on',
@@ -54,7 +184,45 @@ __all__ = [
     'factories',
     'fields',
     'generator',
+    'grammar',
+    'grid',
+    'loot',
+    'manifest',
     'mods',
+    'noise',
+    'outcomes',
+    'pool',
+    'prefetch',
     'resolve',
+    'tables',
     'taggables',
 ]
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    """Import submodules and their public names on first access.
+
+    Args:
+        name: The attribute being looked up on the package.
+
+    Returns:
+        The requested submodule, class or function.
+
+    Raises:
+        AttributeError: If the package does not provide ``name``.
+
+    """
+    if name in _SUBMODULES:
+        value = importlib.import_module(f'{__name__}.{name}')
+    elif name in _ATTRIBUTES:
+        value = getattr(importlib.import_module(f'{__name__}.{_ATTRIBUTES[name]}'), name)
+    else:
+        msg = f'module {__name__!r} has no attribute {name!r}'
+        raise AttributeError(msg)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List the package's public names, including those not yet imported."""
+    return sorted(set(globals()) | set(__all__) | _SUBMODULES)
@@ -0,0 +1,117 @@
+"""blueprint.alias -- constant-time weighted sampling with alias tables."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+__all__ = ['AliasTable']
+
+
+class _Random(Protocol):
+    def random(self) -> float: ...
+
+
+class AliasTable:
+    """A Walker/Vose alias table for drawing weighted indices in O(1).
+
+    Building the table takes O(n) time. Each draw then costs a single call to
+    ``random()`` and one table lookup, however many entries there are, and
+    depends only on the random number generator's state, so draws are
+    reproducible for a given seed.
+
+    Example:
+        >>> import random
+        >>> table = AliasTable([1, 2, 1])
+        >>> len(table)
+        3
+        >>> table.sample(random.Random('loot')) in {0, 1, 2}
+        True
+
+    Attributes:
+        weights: The weights the table was built from.
+        probabilities: For each slot, the probability of keeping the slot's own index.
+        aliases: For each slot, the index drawn when the slot's own index is not kept.
+
+    """
+
+    weights: tuple[float, ...]
+    probabilities: tuple[float, ...]
+    aliases: tuple[int, ...]
+
+    def __init__(self, weights: Iterable[float]) -> None:
+        """Build the table.
+
+        Args:
+            weights: Non-negative relative weights, one per index.
+
+        Raises:
+            ValueError: If there are no weights, any weight is negative, or
+                all weights are zero.
+
+        """
+        self.weights = tuple(weights)
+        count = len(self.weights)
+        total = sum(self.weights)
+        if not count or total <= 0 or min(self.weights) < 0:
+            msg = f'Alias table weights must be non-negative with a positive total, not {self.weights!r}'
+            raise ValueError(msg)
+
+        scaled = [weight * count / total for weight in self.weights]
+        probabilities = [1.0] * count
+        aliases = list(range(count))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probabilities[less] = scaled[less]
+            aliases[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever remains is 1.0 up to rounding error, and keeps its own index.
+        self.probabilities = tuple(probabilities)
+        self.aliases = tuple(aliases)
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def __repr__(self) -> str:
+        return f'<AliasTable: {len(self)} entries>'
+
+    def sample(self, random: _Random) -> int:
+        """Draw a weighted index.
+
+        Args:
+            random: A random number generator, e.g. ``parent.meta.random``.
+
+        Returns:
+            An index into the table's weights.
+
+        """
+        u = random.random() * len(self.probabilities)
+        index = int(u)
+        return index if u - index < self.probabilities[index] else self.aliases[index]
+
+    def sample_many(self, random: _Random, n: int) -> list[int]:
+        """Draw ``n`` weighted indices, as if by calling ``sample`` ``n`` times.
+
+        Args:
+            random: A random number generator, e.g. ``parent.meta.random``.
+            n: The number of indices to draw.
+
+        Returns:
+            A list of ``n`` indices into the table's weights.
+
+        """
+        draw = random.random
+        count = len(self.probabilities)
+        probabilities = self.probabilities
+        aliases = self.aliases
+        indices = []
+        for _ in range(n):
+            u = draw() * count
+            index = int(u)
+            indices.append(index if u - index < probabilities[index] else aliases[index])
+        return indices
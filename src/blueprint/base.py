@@ -15,9 +15,12 @@ from collections import deque
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
 
-from . import fields, taggables
+    from .outcomes import Outcomes
+    from .pool import BlueprintPool
+
+from . import fields, manifest, taggables
 
 __all__ = ['Blueprint']
 
@@ -42,6 +45,8 @@ class Meta:
         seed: Seed value used to initialize the random number generator. Can be a
             string or float for reproducible generation.
         kwargs: Additional keyword arguments passed during blueprint instantiation.
+        cache: Values cached by fields for this mastered blueprint, keyed by field.
+            Never copied: each copy of a Meta starts with an empty cache.
 
     """
 
@@ -53,6 +58,7 @@ class Meta:
     random: random.Random
     seed: str | float
     kwargs: dict[str, Any]
+    cache: dict[Any, Any]
 
     def __init__(self) -> None:
         """Initialize Meta with default values.
@@ -66,6 +72,7 @@ class Meta:
         self.abstract = False
         self.source = None
         self.parent = None
+        self.cache = {}
 
         self.random = random.Random()  # noqa: S311
         self.seed = random.random()  # noqa: S311
@@ -77,6 +84,7 @@ class Meta:
         Special handling for certain attributes:
         - source and parent are shallow-copied to preserve relationships
         - random gets a new Random() instance to avoid shared state
+        - cache starts out empty
         - All other attributes are deep-copied
 
         Args:
@@ -97,7 +105,7 @@ class Meta:
                 setattr(meta, name, value)
             elif name == 'random':
                 meta.random = random.Random()  # noqa: S311
-            else:
+            elif name != 'cache':
                 setattr(meta, name, copy.deepcopy(value, memo))
         memo[self_id] = meta
         return meta
@@ -175,6 +183,7 @@ class BlueprintMeta(type):
                         cls.tags.update(base_tags)
             if cls.tag_repo is not None and not cls.meta.abstract:  # pragma: no branch
                 cls.tag_repo.add_object(cls)  # type: ignore[arg-type]
+                manifest.evict_proxies(cls.tag_repo, cls)  # type: ignore[arg-type]
 
     def __new__(
         cls: type[BlueprintMeta],
@@ -248,6 +257,70 @@ class BlueprintMeta(type):
         else:
             setattr(cls, name, value)
 
+    def pool(cls, size: int, *, debug: bool = False) -> BlueprintPool:
+        """Return a pool that recycles mastered instances of this blueprint.
+
+        Meant for transient blueprints that are mastered and discarded at a
+        high rate. Released instances are re-mastered in place, reusing their
+        instance dictionary, ``Meta`` and random number generator::
+
+            with Encounter.pool(64) as p:
+                encounter = p.master(seed=tick)
+                ...
+                p.release(encounter)
+
+        Args:
+            cls: The Blueprint class to pool.
+            size: The maximum number of released instances kept for reuse.
+            debug: If True, released instances raise
+                ``blueprint.pool.ReleasedBlueprintError`` when used.
+
+        Returns:
+            A new ``blueprint.pool.BlueprintPool``.
+
+        """
+        from .pool import BlueprintPool
+
+        return BlueprintPool(cls, size, debug=debug)  # type: ignore[arg-type]
+
+    def enumerate_outcomes(
+        cls,
+        names: Iterable[str] | None = None,
+        *,
+        joint: bool = False,
+        max_states: int = 100_000,
+        samples: int = 10_000,
+        seed: str = 'outcomes',
+    ) -> Outcomes:
+        """Compute the distribution of values each field of this blueprint can take.
+
+        Fields built from static values, ``RandomInt``, ``PickOne``,
+        ``WeightedPickOne``, static ``DiceTable`` rolls and operator trees over
+        them are computed exactly; the rest are estimated by sampling. See ``blueprint.outcomes``.
+
+        Args:
+            cls: The Blueprint class to analyse.
+            names: Field names to include. Defaults to all fields.
+            joint: Whether to compute the joint distribution as well.
+            max_states: The maximum state-space size of any exact distribution.
+            samples: How many blueprints to master when sampling is needed.
+            seed: Base seed for sampling.
+
+        Returns:
+            A ``blueprint.outcomes.Outcomes`` instance.
+
+        """
+        from .outcomes import enumerate_outcomes
+
+        return enumerate_outcomes(
+            cls,  # type: ignore[arg-type]
+            names,
+            joint=joint,
+            max_states=max_states,
+            samples=samples,
+            seed=seed,
+        )
+
     def __repr__(cls) -> str:
         """Return a detailed string representation of the Blueprint class.
 
@@ -355,17 +428,33 @@ class Blueprint(taggables.TaggableClass, metaclass=BlueprintMeta):
 
         """
         self.meta = copy.deepcopy(self.meta)
+        self._master(parent, seed, kwargs)
+
+    def _master(self, parent: Blueprint | None, seed: str | float | None, kwargs: dict[str, Any]) -> None:
+        """Seed this instance, apply keyword overrides and resolve its fields.
+
+        Expects ``self.meta`` to already be an instance-specific copy of the
+        class metadata. Split out of ``__init__`` so that instance pools can
+        re-master recycled instances in place.
+
+        Args:
+            parent: Optional parent blueprint for nested blueprints.
+            seed: Optional seed for reproducible random generation.
+            kwargs: Keyword arguments to override field values.
+
+        """
+        meta = self.meta
         if parent is not None:
-            self.meta.parent = parent
-        self.meta.mastered = True
+            meta.parent = parent
+        meta.mastered = True
         if seed is not None:
-            self.meta.seed = seed
+            meta.seed = seed
         elif parent is not None:
-            self.meta.seed = parent.meta.seed
+            meta.seed = parent.meta.seed
         else:
-            self.meta.seed = random.random()  # noqa: S311
-        self.meta.random.seed(self.meta.seed)
-        self.meta.kwargs = kwargs
+            meta.seed = random.random()  # noqa: S311
+        meta.random.seed(meta.seed)
+        meta.kwargs = kwargs
         for name, value in kwargs.items():
             setattr(self, name, value)
 
@@ -391,19 +480,21 @@ class Blueprint(taggables.TaggableClass, metaclass=BlueprintMeta):
         deferred_to_end: deque[str] = deque()
         deferred_to_end_names: set[str] = set()
 
-        def resolve(name: str, field: Any) -> None:  # noqa: ANN401
-            # print "Can we resolve", name
+        def resolve(name: str, field: Any) -> bool:  # noqa: ANN401
+            """Resolve a field, or defer it; return whether it was deferred again."""
             if callable(field):
                 if hasattr(field, 'depends_on') and not field.depends_on.issubset(resolved):
                     if field.depends_on.intersection(deferred_to_end_names):  # pragma: no cover
                         deferred_to_end.append(name)
                     else:
                         deferred.appendleft((name, field))
+                        return True
                 else:
                     setattr(self, name, fields.resolve(self, field))
                     resolved.add(name)
             else:
                 resolved.add(name)
+            return False
 
         for name in self.meta.fields:
             class_field = getattr(self.__class__, name)
@@ -414,9 +505,17 @@ class Blueprint(taggables.TaggableClass, metaclass=BlueprintMeta):
                 field = getattr(self, name)
                 resolve(name, field)
 
+        stalled = 0
         while deferred:
             name, field = deferred.pop()
-            resolve(name, field)
+            stalled = stalled + 1 if resolve(name, field) else 0
+            if stalled > len(deferred):
+                # A whole round of deferred fields went by without any being resolved.
+                unmet = {
+                    name: sorted(getattr(field, 'depends_on', set()) - resolved) for name, field in sorted(deferred)
+                }
+                msg = f'{self.__class__.__name__} fields depend on fields that never resolve: {unmet}'
+                raise ValueError(msg)
 
         deferred_to_end_names.clear()
         while deferred_to_end:
@@ -0,0 +1,364 @@
+"""blueprint.chunks -- open worlds of blueprints addressed by chunk coordinates.
+
+A ``ChunkCollection`` is like a ``BlueprintCollection`` indexed by 2D (or
+any-D) integer coordinates instead of a single index. Each chunk's seed is
+a cheap integer hash of the collection's seed and the chunk's coordinates,
+so a chunk is the same however and whenever it is reached. Mastered chunks
+are kept in a size-bounded LRU cache, and background threads master the
+chunks around the most recently accessed one before they are needed.
+
+Example:
+    >>> import blueprint as bp
+    >>> class Chunk(bp.Blueprint):
+    ...     trees = bp.RandomInt(0, 20)
+    >>> with ChunkCollection(Chunk, seed='world') as world:
+    ...     here = world[3, -2]
+    ...     row = world[0:4, 0]
+    >>> here.trees == ChunkCollection(Chunk, seed='world', start=False)[3, -2].trees
+    True
+    >>> len(row)
+    4
+
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import hashlib
+import itertools
+import threading
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from types import TracebackType
+    from typing import Self
+
+    from .base import Blueprint
+
+__all__ = ['ChunkCollection', 'chunk_seed']
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+Coords = tuple[int, ...]
+
+
+class _Pending:
+    """A chunk being mastered, which waiters are notified of, with the error it raised, if any."""
+
+    event: threading.Event
+    error: Exception | None
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.error = None
+
+
+def _mix(h: int) -> int:
+    """Scramble a 64-bit integer with the SplitMix64 finalizer."""
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK
+    return h ^ (h >> 31)
+
+
+def chunk_seed(base: int, coords: Iterable[int]) -> int:
+    """Hash a 64-bit base seed and integer coordinates to a 64-bit chunk seed.
+
+    Args:
+        base: The world's base seed, as a 64-bit integer.
+        coords: The chunk's integer coordinates.
+
+    Returns:
+        A seed that differs for every coordinate within 64-bit range.
+
+    Example:
+        >>> chunk_seed(1, (0, 0)) == chunk_seed(1, (0, 0))
+        True
+        >>> chunk_seed(1, (0, 1)) == chunk_seed(1, (1, 0))
+        False
+
+    """
+    h = base
+    for coord in coords:
+        h = _mix(((h ^ (coord & _MASK)) + _GOLDEN) & _MASK)
+    return h
+
+
+class ChunkCollection:
+    """An LRU cache of blueprints mastered on demand at integer chunk coordinates.
+
+    Index with one integer per dimension to get a chunk, e.g.
+    ``world[x, y]``. Use slices to get a whole region at once, as nested
+    lists in axis order: ``world[0:2, 0:3]`` is two lists of three chunks,
+    and ``world[0:3, 5]`` is a list of three chunks. Slices must have a stop.
+
+    Each access queues the chunks within ``radius`` of it, nearest first,
+    for background mastering, replacing any queued chunks that have not
+    been started yet. ``cache_size`` should comfortably exceed
+    ``(2 * radius + 1) ** dims`` so that prefetched chunks are not evicted
+    before they are used.
+
+    Attributes:
+        blueprint: The Blueprint class mastered for each chunk.
+        seed: The world's seed.
+        dims: The number of coordinates per chunk.
+        kwargs: Keyword arguments passed to every chunk.
+        cache_size: The most mastered chunks kept.
+        radius: How many chunks around each access are prefetched.
+        workers: The number of background prefetch threads.
+        on_evict: Called as ``on_evict(coords, chunk)`` when a chunk is evicted.
+        hits: Number of accesses served from the cache.
+        misses: Number of accesses that mastered the chunk inline.
+        evictions: Number of chunks evicted from the cache.
+
+    """
+
+    blueprint: type[Blueprint]
+    seed: str | float
+    dims: int
+    kwargs: dict[str, Any]
+    cache_size: int
+    radius: int
+    workers: int
+    on_evict: Callable[[Coords, Blueprint], Any] | None
+    hits: int
+    misses: int
+    evictions: int
+    _base: int
+    _coords_name: str | None
+    _offsets: list[Coords]
+    _chunks: collections.OrderedDict[Coords, Blueprint]
+    _pending: dict[Coords, _Pending]
+    _queue: collections.deque[Coords]
+    _condition: threading.Condition
+    _stopped: bool
+    _threads: list[threading.Thread]
+
+    def __init__(
+        self,
+        blueprint: type[Blueprint],
+        seed: str | float = '',
+        dims: int = 2,
+        *,
+        cache_size: int = 256,
+        radius: int = 1,
+        workers: int = 1,
+        on_evict: Callable[[Coords, Blueprint], Any] | None = None,
+        coords_name: str | None = None,
+        start: bool = True,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        """Initialize the collection, and start prefetching unless ``start`` is False.
+
+        Args:
+            blueprint: The Blueprint class mastered for each chunk.
+            seed: The world's seed.
+            dims: The number of coordinates per chunk.
+            cache_size: The most mastered chunks kept.
+            radius: How many chunks around each access are prefetched.
+            workers: The number of background prefetch threads.
+            on_evict: Called as ``on_evict(coords, chunk)`` when a chunk is evicted.
+            coords_name: If given, each chunk is mastered with its coordinates
+                as this keyword argument.
+            start: Whether to start the background threads immediately.
+            **kwargs: Keyword arguments passed to every chunk.
+
+        """
+        self.blueprint = blueprint
+        self.seed = seed
+        self.dims = dims
+        self.kwargs = kwargs
+        self.cache_size = cache_size
+        self.radius = radius
+        self.workers = workers
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._base = int.from_bytes(hashlib.blake2b(str(seed).encode(), digest_size=8).digest(), 'little')
+        self._coords_name = coords_name
+        span = range(-radius, radius + 1)
+        self._offsets = sorted(
+            (offset for offset in itertools.product(span, repeat=dims) if any(offset)),
+            key=lambda offset: sum(d * d for d in offset),
+        )
+        self._chunks = collections.OrderedDict()
+        self._pending = {}
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._stopped = True
+        self._threads = []
+        if start:
+            self.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of chunks currently cached."""
+        return len(self._chunks)
+
+    def __contains__(self, coords: object) -> bool:
+        """Return whether the chunk at ``coords`` is currently cached."""
+        return coords in self._chunks
+
+    def seed_for(self, coords: Iterable[int]) -> int:
+        """Return the seed of the chunk at ``coords``."""
+        return chunk_seed(self._base, coords)
+
+    def __getitem__(self, key: int | slice | tuple[int | slice, ...]) -> Any:  # noqa: ANN401
+        axes = key if isinstance(key, tuple) else (key,)
+        if len(axes) != self.dims:
+            msg = f'ChunkCollection has {self.dims} dimensions, not {len(axes)}'
+            raise IndexError(msg)
+        if not any(isinstance(axis, slice) for axis in axes):
+            coords = tuple(int(axis) for axis in axes)  # type: ignore[arg-type]
+            chunk = self._get(coords)
+            self._prefetch(coords)
+            return chunk
+        return self._region(axes, ())
+
+    def _region(self, axes: tuple[int | slice, ...], prefix: Coords) -> Any:  # noqa: ANN401
+        if not axes:
+            return self._get(prefix)
+        axis, rest = axes[0], axes[1:]
+        if not isinstance(axis, slice):
+            return self._region(rest, (*prefix, int(axis)))
+        if axis.stop is None:
+            msg = 'ChunkCollection regions need a stop on every slice'
+            raise IndexError(msg)
+        return [self._region(rest, (*prefix, i)) for i in range(axis.start or 0, axis.stop, axis.step or 1)]
+
+    def _master(self, coords: Coords) -> Blueprint:
+        kwargs = dict(self.kwargs)
+        if self._coords_name is not None:
+            kwargs[self._coords_name] = coords
+        return self.blueprint(seed=self.seed_for(coords), **kwargs)
+
+    def _get(self, coords: Coords) -> Blueprint:
+        while True:
+            with self._condition:
+                chunk = self._chunks.get(coords)
+                if chunk is not None:
+                    self._chunks.move_to_end(coords)
+                    self.hits += 1
+                    return chunk
+                pending = self._pending.get(coords)
+                if pending is None:
+                    self._pending[coords] = _Pending()
+                    self.misses += 1
+                    break
+            # Being mastered in the background: wait for it, then look again.
+            pending.event.wait()
+            if pending.error is not None:
+                raise pending.error
+        return self._store(coords)
+
+    def _store(self, coords: Coords) -> Blueprint:
+        chunk = None
+        error = None
+        evicted = []
+        try:
+            chunk = self._master(coords)
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            with self._condition:
+                if chunk is not None:
+                    self._chunks[coords] = chunk
+                    while len(self._chunks) > self.cache_size:
+                        evicted.append(self._chunks.popitem(last=False))
+                    self.evictions += len(evicted)
+                pending = self._pending.pop(coords)
+                pending.error = error
+                pending.event.set()
+                self._condition.notify_all()
+        if self.on_evict is not None:
+            for old_coords, old_chunk in evicted:
+                self.on_evict(old_coords, old_chunk)
+        return chunk
+
+    def _prefetch(self, coords: Coords) -> None:
+        with self._condition:
+            if self._stopped:
+                return
+            self._queue.clear()
+            for offset in self._offsets:
+                neighbour = tuple(c + d for c, d in zip(coords, offset, strict=True))
+                if neighbour not in self._chunks and neighbour not in self._pending:
+                    self._queue.append(neighbour)
+            self._condition.notify_all()
+
+    def prefetched(self, timeout: float | None = None) -> bool:
+        """Block until every queued chunk has been mastered.
+
+        Args:
+            timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            True if the queue drained, False if the timeout expired first.
+
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and not self._pending, timeout)
+
+    def clear(self) -> None:
+        """Evict every cached chunk, calling ``on_evict`` for each."""
+        with self._condition:
+            evicted = list(self._chunks.items())
+            self._chunks.clear()
+            self.evictions += len(evicted)
+        if self.on_evict is not None:
+            for coords, chunk in evicted:
+                self.on_evict(coords, chunk)
+
+    def start(self) -> None:
+        """Start the background prefetch threads, if they are not already running."""
+        with self._condition:
+            if not self._stopped:
+                return
+            self._stopped = False
+        self._threads = [
+            threading.Thread(target=self._prefetcher, name=f'ChunkCollection-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def close(self) -> None:
+        """Stop the background prefetch threads and wait for them to finish."""
+        with self._condition:
+            self._stopped = True
+            self._queue.clear()
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _prefetcher(self) -> None:
+        condition = self._condition
+        queue = self._queue
+        while True:
+            with condition:
+                condition.wait_for(lambda: self._stopped or bool(queue))
+                if self._stopped:
+                    return
+                coords = queue.popleft()
+                if coords in self._chunks or coords in self._pending:
+                    continue
+                self._pending[coords] = _Pending()
+            # A failed chunk is not cached: its error goes to any waiters, and
+            # to whoever accesses it next, when it is mastered again.
+            with contextlib.suppress(Exception):
+                self._store(coords)
@@ -22,6 +22,7 @@ Example:
 
 """
 
+import contextvars
 import itertools as it
 import sys
 from collections.abc import Generator, Iterator, Sequence
@@ -29,7 +30,12 @@ from typing import Any, overload
 
 from blueprint.base import Blueprint
 
-__all__ = ['BlueprintCollection']
+__all__ = ['BlueprintCollection', 'current_item']
+
+#: The collection and index of the item being mastered by index, if any.
+current_item: contextvars.ContextVar[tuple['BlueprintCollection', int] | None] = contextvars.ContextVar(
+    'current_item', default=None
+)
 
 
 class BlueprintCollection(Sequence[Blueprint]):
@@ -50,6 +56,7 @@ class BlueprintCollection(Sequence[Blueprint]):
         blueprint: The Blueprint class to instantiate.
         seed: Base seed string used for deterministic generation.
         kwargs: Default keyword arguments passed to blueprint instances.
+        cache: Values cached by fields for this collection, keyed by field.
 
     Example:
         >>> from blueprint.base import Blueprint
@@ -72,6 +79,7 @@ class BlueprintCollection(Sequence[Blueprint]):
     blueprint: type[Blueprint]
     seed: str
     kwargs: dict[str, Any]
+    cache: dict[Any, Any]
 
     def __init__(self, blueprint: type[Blueprint], seed: str = '', **kwargs: Any) -> None:  # noqa: ANN401
         """Initialize a blueprint collection.
@@ -99,6 +107,7 @@ class BlueprintCollection(Sequence[Blueprint]):
         self.blueprint = blueprint
         self.seed = seed
         self.kwargs = kwargs
+        self.cache = {}
 
     def __len__(self) -> int:
         """Return the theoretical maximum size of the collection.
@@ -254,9 +263,15 @@ class BlueprintCollection(Sequence[Blueprint]):
 
         """
         if isinstance(idx, slice):
-            seed = f'{self.seed}%s'
             if idx.stop is None:
-                return (self(seed=seed % i, **self.kwargs) for i in it.count(idx.start or 0, idx.step or 1))
-            return [self(seed=seed % i) for i in range(idx.start or 0, idx.stop, idx.step or 1)]
-        seed = f'{self.seed}{idx}'
-        return self(seed=seed)
+                return (self._item(i) for i in it.count(idx.start or 0, idx.step or 1))
+            return [self._item(i) for i in range(idx.start or 0, idx.stop, idx.step or 1)]
+        return self._item(idx)
+
+    def _item(self, idx: int) -> Blueprint:
+        """Master the item at the given index, with ``current_item`` set for its fields."""
+        token = current_item.set((self, idx))
+        try:
+            return self(seed=f'{self.seed}{idx}')
+        finally:
+            current_item.reset(token)
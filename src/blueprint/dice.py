@@ -1,12 +1,14 @@
 """Dice rolling and expression evaluation for procedural generation.
 
 This module provides a flexible dice rolling system that supports standard RPG dice
-notation (e.g., '3d6', '2d20+5') and Fudge/FATE dice. Dice expressions are compiled
-into Python code for efficient evaluation and can include mathematical operations,
-function calls like sum(), min(), max(), and random.choice().
+notation (e.g., '3d6', '2d20+5') and Fudge/FATE dice. Dice expressions can include
+arithmetic and the functions sum(), sorted(), min(), max(), abs() and random.choice().
 
-The module uses regex-based parsing to convert dice notation into executable Python
-expressions, with safety checks to prevent code injection.
+Expressions are parsed against a small grammar, so anything else is rejected when
+the expression is compiled, and then compiled to a plain Python function that rolls
+the dice directly with the random number generator. Dice are drawn exactly as
+``random.randint`` and ``random.choice`` would draw them, so seeded rolls are
+reproducible.
 
 Example:
     >>> import random
@@ -22,42 +24,56 @@ Example:
 
 from __future__ import annotations
 
+import functools
+import random
 import re
-from typing import TYPE_CHECKING, Any, TypeVar
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, NamedTuple, NoReturn, TypeVar, cast
 
 if TYPE_CHECKING:
-    from types import CodeType
-
-__all__ = ['dcompile', 'roll']
+    from collections.abc import Callable, Iterable
+
+__all__ = [
+    'DiceCache',
+    'DiceExpression',
+    'InvalidDiceExpression',
+    'cache',
+    'dcompile',
+    'distribution',
+    'normalize',
+    'roll',
+]
 
 T = TypeVar('T')
 
 
-dice_cp: re.Pattern[str] = re.compile(r'(?P<num>\d+)d(?P<sides>\d+)')
-fudge_cp: re.Pattern[str] = re.compile(r'(?P<num>\d+)d[fF]')
+FUDGE_FACES = (-1, -1, 0, 0, 1, 1)
+
+# The sides of a Fudge die, in the parsed expression.
+FUDGE = 'F'
 
-safe_cp: re.Pattern[str] = re.compile(
+token_cp: re.Pattern[str] = re.compile(
     r"""
-^(?:
-    \d+d\d+  # Dice expression
-  | \d+d[Ff] # Fudge dice
-  | \d+
-  | sum\(
-  | sorted\(
-  | max\(
-  | min\(
-  | abs\(
-  | random\.choice\(
-  | \(
-  | \)
-  | [+-/*%]
-  | \s
-)+$
+\s*(?:
+    (?P<dice>\d+d(?:\d+|[fF]))(?![\w.])
+  | (?P<number>\d+(?:\.\d+)?)(?![\w.])
+  | (?P<name>random\.choice|sum|sorted|max|min|abs)(?![\w.])
+  | (?P<op>\*\*|//|[-+*/%(),])
+)
 """,
     re.VERBOSE,
 )
 
 
+class InvalidDiceExpression(AssertionError, ValueError):  # noqa: N818
+    """Raised when a dice expression does not follow the dice grammar.
+
+    Subclasses ``AssertionError`` for code written against earlier versions,
+    which checked expressions with an assertion.
+    """
+
+
 class results(list[int]):
     """List of dice roll results that behaves like a number in arithmetic operations.
 
@@ -141,93 +157,531 @@ class results(list[int]):
         return bool(b != self._convert(b))
 
 
-def dcompile(dice_expr: str) -> CodeType:
-    """Compile a dice expression string into an executable code object.
+class _Node(NamedTuple):
+    """A node of a parsed dice expression.
+
+    ``tag`` is ``'number'``, ``'dice'``, ``'unary'``, ``'binary'`` or
+    ``'call'``. ``type`` is the static type of the node's value: ``'dice'``
+    for a ``results`` list, ``'list'``, ``'int'``, ``'float'``, or
+    ``'number'`` when it may be either.
+    """
+
+    tag: str
+    type: str
+    value: Any = None
+    args: tuple[_Node, ...] = ()
+
+
+def _fail(dice_expr: str, reason: str) -> NoReturn:
+    msg = f'Invalid dice expression: {dice_expr} ({reason})'
+    raise InvalidDiceExpression(msg)
+
+
+def _tokenize(dice_expr: str) -> list[tuple[str, str]]:
+    """Split a dice expression into ``(kind, text)`` tokens."""
+    tokens = []
+    pos, end = 0, len(dice_expr.rstrip())
+    while pos < end:
+        match = token_cp.match(dice_expr, pos)
+        if match is None:
+            _fail(dice_expr, f'unexpected {dice_expr[pos:end].split(maxsplit=1)[0]!r}')
+        kind = cast('str', match.lastgroup)
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize(dice_expr: str) -> str:
+    """Return the canonical spelling of a dice expression, for use as a cache key.
+
+    Raises:
+        InvalidDiceExpression: If the expression contains anything but dice
+            expression tokens.
+
+    Example:
+        >>> normalize('sum(3df)+max( 2d6 ,1 )')
+        'sum(3dF) + max(2d6, 1)'
+
+    """
+    text = previous = previous_kind = ''
+    unary = False
+    for kind, part in _tokenize(dice_expr):
+        call = part == '(' and previous_kind == 'name'
+        if not (unary or call or previous in {'', '('} or part in {')', ','}):
+            text += ' '
+        # A sign is unary at the start, or after an operator other than a closing parenthesis.
+        unary = part in {'+', '-'} and (not text or (previous_kind == 'op' and previous != ')'))
+        text += part.replace('f', FUDGE) if kind == 'dice' else part
+        previous, previous_kind = part, kind
+    return text
+
+
+def _numeric_type(*types: str) -> str:
+    """Return the static type of arithmetic between values of ``types``."""
+    if 'float' in types:
+        return 'float'
+    return 'number' if 'number' in types else 'int'
+
+
+class _Parser:
+    """Parses a dice expression by recursive descent.
+
+    The grammar, from loosest to tightest binding::
+
+        expr    := product (('+' | '-') product)*
+        product := unary (('*' | '/' | '//' | '%') unary)*
+        unary   := ('+' | '-') unary | power
+        power   := atom ('**' unary)?
+        atom    := NUMBER | DICE | FUNCTION '(' expr (',' expr)* ')' | '(' expr ')'
+    """
+
+    expr: str
+    tokens: list[tuple[str, str]]
+    pos: int
+
+    def __init__(self, dice_expr: str) -> None:
+        self.expr = dice_expr
+        self.tokens = _tokenize(dice_expr)
+        self.pos = 0
+
+    def fail(self, reason: str) -> NoReturn:
+        _fail(self.expr, reason)
+
+    def peek(self) -> str | None:
+        return self.tokens[self.pos][1] if self.pos < len(self.tokens) else None
+
+    def next(self) -> tuple[str, str]:
+        if self.pos == len(self.tokens):
+            self.fail('unexpected end')
+        self.pos += 1
+        return self.tokens[self.pos - 1]
+
+    def expect(self, text: str) -> None:
+        if self.next()[1] != text:
+            self.fail(f'expected {text!r} after {self.tokens[self.pos - 2][1]!r}')
+
+    def parse(self) -> _Node:
+        node = self.sum()
+        if self.pos < len(self.tokens):
+            self.fail(f'unexpected {self.peek()!r}')
+        return node
+
+    def sum(self) -> _Node:
+        node = self.product()
+        while self.peek() in {'+', '-'}:
+            op = self.next()[1]
+            node = self.binary(op, node, self.product())
+        return node
+
+    def product(self) -> _Node:
+        node = self.unary()
+        while self.peek() in {'*', '/', '//', '%'}:
+            op = self.next()[1]
+            node = self.binary(op, node, self.unary())
+        return node
+
+    def unary(self) -> _Node:
+        if self.peek() not in {'+', '-'}:
+            return self.power()
+        op = self.next()[1]
+        operand = self.numeric(op, self.unary())
+        return _Node('unary', _numeric_type(operand.type), op, (operand,))
+
+    def power(self) -> _Node:
+        node = self.atom()
+        if self.peek() == '**':
+            self.next()
+            node = self.binary('**', node, self.unary())
+        return node
+
+    def atom(self) -> _Node:
+        kind, text = self.next()
+        if kind == 'number':
+            return _Node('number', 'float' if '.' in text else 'int', float(text) if '.' in text else int(text))
+        if kind == 'dice':
+            count, sides = text.split('d')
+            if sides.upper() == FUDGE:
+                return _Node('dice', 'dice', (int(count), FUDGE))
+            if not int(sides):
+                self.fail(f'{text} has no sides')
+            return _Node('dice', 'dice', (int(count), int(sides)))
+        if kind == 'name':
+            self.expect('(')
+            args = [self.sum()]
+            while self.peek() == ',':
+                self.next()
+                args.append(self.sum())
+            self.expect(')')
+            return self.call(text, tuple(args))
+        if text != '(':
+            self.fail(f'unexpected {text!r}')
+        node = self.sum()
+        self.expect(')')
+        return node
+
+    def numeric(self, op: str, node: _Node) -> _Node:
+        """Check that ``node`` can be an operand of arithmetic."""
+        if node.type == 'list':
+            self.fail(f'{op} needs a number, not a list')
+        return node
+
+    def binary(self, op: str, left: _Node, right: _Node) -> _Node:
+        self.numeric(op, left)
+        self.numeric(op, right)
+        if op == '/':
+            kind = 'float'
+        elif op == '**':
+            kind = 'float' if 'float' in {left.type, right.type} else 'number'
+        else:
+            kind = _numeric_type(left.type, right.type)
+        return _Node('binary', kind, op, (left, right))
+
+    def call(self, name: str, args: tuple[_Node, ...]) -> _Node:
+        if name in {'max', 'min'} and len(args) > 1:
+            for arg in args:
+                self.numeric(f'{name}()', arg)
+            types = {'int' if arg.type == 'dice' else arg.type for arg in args}
+            return _Node('call', types.pop() if len(types) == 1 else 'number', name, args)
+        if len(args) > 1:
+            self.fail(f'{name}() takes one argument')
+        if name == 'abs':
+            return _Node('call', _numeric_type(self.numeric('abs()', args[0]).type), name, args)
+        if args[0].type not in {'dice', 'list'}:
+            self.fail(f'{name}() needs dice or a list')
+        return _Node('call', 'list' if name == 'sorted' else 'int', name, args)
+
+
+class _DiceCompiler:
+    """Generates the source of a function rolling a parsed dice expression.
+
+    Dice are rolled in statements, in the order they appear in the
+    expression, so that the expression itself is plain arithmetic on locals.
+    With ``fast``, the function takes a ``getrandbits`` method and draws each
+    die by rejection sampling, exactly as ``random.randint`` does. Otherwise
+    it takes any object with ``randint()`` and ``choice()`` methods.
+    """
+
+    fast: bool
+    lines: list[str]
+    uses: set[str]
+
+    def __init__(self, *, fast: bool) -> None:
+        self.fast = fast
+        self.lines = []
+        self.uses = set()
+
+    def build(self, tree: _Node, dice_expr: str) -> Callable[[Any], Any]:
+        value = self.node(tree, numeric=False)
+        if self.fast:
+            signature, prologue = '_bits', []
+        else:
+            signature = 'random'
+            prologue = [f'    _{name} = random.{name}' for name in sorted(self.uses)]
+        source = '\n'.join([f'def _roll({signature}):', *prologue, *self.lines, f'    return {value}'])
+        namespace: dict[str, Any] = {'results': results, '_FUDGE': FUDGE_FACES}
+        exec(compile(source, f'<dice {dice_expr}>', 'exec'), namespace)  # noqa: S102
+        return cast('Callable[[Any], Any]', namespace['_roll'])
+
+    def local(self) -> str:
+        return f'_v{len(self.lines)}'
+
+    def node(self, node: _Node, *, numeric: bool) -> str:
+        """Compile a node to an expression, with dice as their sum if ``numeric``."""
+        if node.tag == 'number':
+            return repr(node.value)
+        if node.tag == 'dice':
+            return self.dice(*node.value, numeric=numeric)
+        if node.tag == 'unary':
+            return f'({node.value}{self.node(node.args[0], numeric=True)})'
+        if node.tag == 'binary':
+            left, right = (self.node(arg, numeric=True) for arg in node.args)
+            return f'({left} {node.value} {right})'
+        return self.call(node.value, node.args)
+
+    def call(self, name: str, args: tuple[_Node, ...]) -> str:
+        if name == 'random.choice':
+            return self.choice(self.node(args[0], numeric=False))
+        if name == 'sum' and args[0].tag == 'dice':
+            return self.node(args[0], numeric=True)
+        numeric = name == 'abs' or len(args) > 1
+        return f'{name}({", ".join(self.node(arg, numeric=numeric) for arg in args)})'
+
+    def draw(self, n: int, indent: str) -> str:
+        """Add statements drawing ``_r`` uniformly from ``range(n)``, and return the draw."""
+        k = n.bit_length()
+        self.lines += [
+            f'{indent}_r = _bits({k})',
+            f'{indent}while _r >= {n}:',
+            f'{indent}    _r = _bits({k})',
+        ]
+        return '_r'
+
+    def face(self, sides: int | str, indent: str) -> str:
+        """Add statements rolling one die, and return the expression for its face."""
+        if sides == FUDGE:
+            if not self.fast:
+                self.uses.add('choice')
+                return '_choice(_FUDGE)'
+            return f'_FUDGE[{self.draw(len(FUDGE_FACES), indent)}]'
+        if not self.fast:
+            self.uses.add('randint')
+            return f'_randint(1, {sides})'
+        return f'{self.draw(cast("int", sides), indent)} + 1'
+
+    def dice(self, count: int, sides: int | str, *, numeric: bool) -> str:
+        if not count:
+            return '0' if numeric else 'results()'
+        local = self.local()
+        if count == 1:
+            face = self.face(sides, '    ')
+            self.lines.append(f'    {local} = {face}' if numeric else f'    {local} = results(({face},))')
+            return local
+        self.lines += [f'    {local} = 0' if numeric else f'    {local} = results()', f'    for _ in range({count}):']
+        face = self.face(sides, '        ')
+        self.lines.append(f'        {local} += {face}' if numeric else f'        {local}.append({face})')
+        return local
+
+    def choice(self, sequence: str) -> str:
+        local = self.local()
+        if not self.fast:
+            self.uses.add('choice')
+            self.lines.append(f'    {local} = _choice({sequence})')
+            return local
+        self.lines += [
+            f'    {local} = {sequence}',
+            f'    _n = len({local})',
+            '    if not _n:',
+            "        raise IndexError('Cannot choose from an empty sequence')",
+            '    _k = _n.bit_length()',
+            '    _r = _bits(_k)',
+            '    while _r >= _n:',
+            '        _r = _bits(_k)',
+            f'    {local} = {local}[_r]',
+        ]
+        return local
+
+
+class DiceExpression:
+    """A compiled dice expression. Call it to roll the dice.
+
+    Attributes:
+        expr: The dice expression.
+        tree: The parsed expression.
+        type: The static type of a roll: ``'dice'`` for a ``results`` list
+            of individual dice, ``'list'`` for a plain list, ``'int'``,
+            ``'float'``, or ``'number'`` when it may be either.
+
+    Example:
+        >>> expr = dcompile('3d6 + 2')
+        >>> expr
+        <DiceExpression: 3d6 + 2>
+        >>> expr.type
+        'int'
+        >>> dcompile('sorted(4dF)').type
+        'list'
+
+    """
+
+    expr: str
+    tree: _Node
+    type: str
+    _fast: Callable[[Any], Any]
+    _generic: Callable[[Any], Any] | None
+
+    def __init__(self, dice_expr: str) -> None:
+        """Parse and compile ``dice_expr``.
+
+        Raises:
+            InvalidDiceExpression: If the expression does not follow the dice grammar.
+
+        """
+        self.expr = dice_expr
+        self.tree = _Parser(dice_expr).parse()
+        self.type = self.tree.type
+        self._fast = _DiceCompiler(fast=True).build(self.tree, dice_expr)
+        self._generic = None
+
+    def __repr__(self) -> str:
+        return f'<DiceExpression: {self.expr}>'
+
+    def __call__(self, random_obj: Any = None) -> Any:  # noqa: ANN401
+        """Roll the dice with ``random_obj``, or the ``random`` module if None.
+
+        Random number generators with a ``getrandbits()`` method, such as
+        ``random.Random``, are drawn from directly. Other objects need
+        ``randint()`` and ``choice()`` methods.
+        """
+        if random_obj is None:
+            random_obj = random
+        try:
+            getrandbits = random_obj.getrandbits
+        except AttributeError:
+            if self._generic is None:
+                self._generic = _DiceCompiler(fast=False).build(self.tree, self.expr)
+            return self._generic(random_obj)
+        return self._fast(getrandbits)
+
 
-    This function parses and compiles dice notation expressions into Python code objects
-    that can be evaluated efficiently. It supports standard RPG dice notation (NdS format,
-    where N is the number of dice and S is the number of sides) and Fudge dice (NdF format).
+class DiceCache:
+    """A bounded LRU cache of compiled dice expressions, keyed by their normalized text.
 
-    The function performs safety validation to prevent code injection by checking the
-    expression against a whitelist of allowed operations. Dice expressions are transformed
-    into list comprehensions that generate random values, then compiled for later evaluation.
+    Spellings of an expression that differ only in whitespace or the case
+    of Fudge dice share one ``DiceExpression``.
+
+    Attributes:
+        maxsize: The maximum number of cached expressions.
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that had to compile their expression.
+        evictions: Number of expressions dropped to stay within ``maxsize``.
+
+    """
+
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
+    _entries: OrderedDict[str, DiceExpression]
+    _lock: threading.Lock
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: The maximum number of cached expressions.
+
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, dice_expr: object) -> bool:
+        if not isinstance(dice_expr, str):
+            return False
+        try:
+            return normalize(dice_expr) in self._entries
+        except InvalidDiceExpression:
+            return False
+
+    def get(self, dice_expr: str) -> DiceExpression:
+        """Return the compiled expression, compiling and caching it on a miss.
+
+        Raises:
+            InvalidDiceExpression: If the expression does not follow the dice grammar.
+
+        """
+        key = normalize(dice_expr)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+        compiled = DiceExpression(dice_expr)
+        with self._lock:
+            # Another thread may have compiled it meanwhile; keep the first, so expressions stay interned.
+            compiled = self._entries.setdefault(key, compiled)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return compiled
+
+    def warm(self, dice_exprs: Iterable[str]) -> None:
+        """Compile and cache each of ``dice_exprs`` ahead of use."""
+        for dice_expr in dice_exprs:
+            self.get(dice_expr)
+
+    def clear(self) -> None:
+        """Drop all cached expressions."""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> dict[str, int]:
+        """Return the cache's statistics.
+
+        Returns:
+            A mapping with ``hits``, ``misses``, ``evictions``, ``size`` and ``maxsize``.
+
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+
+#: The process-wide cache used by ``dcompile()``, ``roll()`` and dice fields.
+cache = DiceCache()
+
+
+def dcompile(dice_expr: str) -> DiceExpression:
+    """Compile a dice expression string into a callable ``DiceExpression``.
 
     Supported dice notations:
         - Standard dice: '3d6', '2d20', '1d100'
         - Fudge dice: '4dF', '2df' (results in -1, 0, or 1)
-        - Math operations: '+', '-', '*', '/', '//', '%'
+        - Numbers: '2', '1.5'
+        - Math operations: '+', '-', '*', '/', '//', '%', '**' and parentheses
         - Functions: sum(), sorted(), max(), min(), abs(), random.choice()
 
+    Dice on their own roll to a ``results`` list. Dice in arithmetic, or in
+    ``abs()`` or ``max()`` and ``min()`` with several arguments, count as
+    their sum, so such expressions roll to plain numbers.
+
     Args:
-        dice_expr: A string containing the dice expression to compile. Must match the
-            safety regex pattern to prevent code injection. Examples: '3d6+2', '2d20-5',
-            'max(4d6)', '4dF'.
+        dice_expr: A string containing the dice expression to compile. Examples:
+            '3d6+2', '2d20-5', 'max(4d6)', '4dF'.
+
+    Compiled expressions are interned in the process-wide ``cache``, so
+    compiling an expression again, or another spelling of it, returns the
+    same ``DiceExpression``. Pre-warm it at startup with ``cache.warm()``.
 
     Returns:
-        A compiled code object that can be passed to the roll() function or evaluated
-        directly with eval() using the appropriate namespace.
+        A ``DiceExpression``, which rolls the dice when called with a random
+        number generator.
 
     Raises:
-        AssertionError: If the dice expression contains unsafe or invalid syntax that
-            doesn't match the safety validation pattern.
+        InvalidDiceExpression: If the expression does not follow the dice grammar,
+            or applies arithmetic to a list.
 
     Example:
-        >>> code = dcompile('3d6 + 2')
-        >>> code  # doctest: +ELLIPSIS
-        <code object <module> at 0x...>
-        >>> code = dcompile('2d20 + sum(3d6)')
-        >>> code  # doctest: +ELLIPSIS
-        <code object <module> at 0x...>
-
-    Note:
-        The compiled code object expects specific variables in its evaluation namespace:
-        'random' (a random module or object), 'results' (the results class), and
-        'xrange' (mapped to range).
+        >>> dcompile('2d20 + sum(3d6)')
+        <DiceExpression: 2d20 + sum(3d6)>
+        >>> dcompile('2d20+sum( 3d6 )') is dcompile('2d20 + sum(3d6)')
+        True
+        >>> dcompile('import os')
+        Traceback (most recent call last):
+        ...
+        blueprint.dice.InvalidDiceExpression: Invalid dice expression: import os (unexpected 'import')
 
     """
-    assert safe_cp.match(dice_expr), f'Invalid dice expression: {dice_expr}'  # noqa: S101
-    expr = dice_cp.sub(
-        r'results(random.randint(1, \g<sides>) '
-        r'for x in xrange(\g<num>))',
-        dice_expr,
-    )
-    expr = fudge_cp.sub(
-        (
-            'results(random.choice([-1, -1, 0, 0, 1, 1]) '
-            r'for x in xrange(\g<num>))'
-        ),
-        expr,
-    )
-    return compile(expr, f'dice_expression: ({dice_expr})', 'eval')
-
-
-def roll(dice_expr: str | CodeType, random_obj: Any = None, **kwargs: Any) -> Any:  # noqa: ANN401
-    """Evaluate a dice expression and return the rolled result.
+    return cache.get(dice_expr)
 
-    This function evaluates dice expressions to produce random results according to
-    standard RPG dice notation. It accepts either a string expression (which is compiled
-    automatically) or a pre-compiled code object from dcompile(). Results are returned
-    as a results object that can be used as a list of individual rolls or as a numeric
-    sum in arithmetic operations.
 
-    The function handles the complete evaluation context, including importing the random
-    module if needed, setting up the namespace with required functions and classes, and
-    executing the compiled expression.
+def roll(dice_expr: str | DiceExpression, random_obj: Any = None, **kwargs: Any) -> Any:  # noqa: ANN401, ARG001
+    """Evaluate a dice expression and return the rolled result.
 
     Args:
         dice_expr: Either a string containing a dice expression (e.g., '3d6+2', '2d20')
-            or a pre-compiled code object from dcompile(). String expressions are
-            automatically compiled before evaluation.
+            or a compiled expression from dcompile(). String expressions are
+            compiled with dcompile(), so each is only compiled once.
         random_obj: Optional random number generator object or module. If None (default),
-            the standard library random module is imported and used. Can be any object
-            with randint() and choice() methods for custom random behavior or seeding.
-        **kwargs: Additional keyword arguments to add to the evaluation namespace. This
-            allows passing custom variables that can be referenced in the dice expression.
+            the standard library random module is used. Can be any object with
+            getrandbits(), or with randint() and choice() methods.
+        **kwargs: Ignored. Dice expressions cannot refer to names.
 
     Returns:
-        A results object containing the dice roll outcomes. This can be used as a list
-        to access individual roll values, or as a number (via int() or float()) to get
-        the sum of all rolls. The exact type depends on the expression evaluated.
+        A results object for dice on their own, which can be used as a list of
+        individual rolls or as their sum, or else the value of the expression.
 
     Example:
         >>> import random
@@ -239,24 +693,88 @@ def roll(dice_expr: str | CodeType, random_obj: Any = None, **kwargs: Any) -> An
         8
         >>> roll('2d20 + 5', random_obj=random)
         22
-        >>> int(roll('max(4d6)'))
+        >>> roll('max(4d6)')
         6
 
-    Note:
-        The evaluation uses eval() internally after safety validation. Only use dice
-        expressions from trusted sources or those validated by dcompile().
-
     """
-    if random_obj is None:
-        import random
-
-        random_obj = random
     if isinstance(dice_expr, str):
         dice_expr = dcompile(dice_expr)
+    return dice_expr(random_obj)
+
+
+def _convolve(a: dict[int, int], b: dict[int, int]) -> dict[int, int]:
+    result: dict[int, int] = {}
+    for x, x_ways in a.items():
+        for y, y_ways in b.items():
+            result[x + y] = result.get(x + y, 0) + x_ways * y_ways
+    return result
+
+
+def _sum_terms(node: _Node, sign: int, terms: list[tuple[int, int, int | str | None]]) -> bool:
+    """Split a sum of dice and integer constants into ``(sign, num, sides)`` terms."""
+    if node.tag == 'number' and node.type == 'int':
+        terms.append((sign, node.value, None))
+    elif node.tag == 'dice':
+        terms.append((sign, *node.value))
+    elif node.tag == 'unary':
+        return _sum_terms(node.args[0], -sign if node.value == '-' else sign, terms)
+    elif node.tag == 'binary' and node.value in {'+', '-'}:
+        left, right = node.args
+        return _sum_terms(left, sign, terms) and _sum_terms(right, -sign if node.value == '-' else sign, terms)
+    else:
+        return False
+    return True
+
 
-    local_vars: dict[str, Any] = dict(**kwargs)
-    local_vars['random'] = random_obj
-    local_vars['results'] = results
-    local_vars['xrange'] = range
+def distribution(dice_expr: str, limit: int | None = None) -> dict[int, int] | None:
+    """Count the ways each total of a simple dice expression can be rolled.
 
-    return eval(dice_expr, local_vars)  # noqa: S307
+    Only sums and differences of dice and integer constants (e.g. ``'3d6'``,
+    ``'2d10 + 1d4 - 2'``, ``'4dF'``) can be analysed. The totals are the
+    values that ``int()`` of the roll would produce, which is what a
+    ``DiceTable`` looks up.
+
+    Args:
+        dice_expr: The dice expression to analyse.
+        limit: If given, give up when there would be more than ``limit``
+            distinct totals.
+
+    Returns:
+        A mapping of each possible total to the number of equally likely
+        ways to roll it, or None if the expression cannot be analysed.
+
+    Example:
+        >>> distribution('2d4')
+        {2: 1, 3: 2, 4: 3, 5: 4, 6: 3, 7: 2, 8: 1}
+        >>> distribution('1d2 + 10')
+        {11: 1, 12: 1}
+        >>> distribution('max(4d6)') is None
+        True
+
+    """
+    terms: list[tuple[int, int, int | str | None]] = []
+    try:
+        tree = dcompile(dice_expr).tree
+    except InvalidDiceExpression:
+        return None
+    if not _sum_terms(tree, 1, terms):
+        return None
+
+    span = 1
+    for _, num, sides in terms:
+        if sides is not None:
+            span += num * (2 if sides == FUDGE else int(sides) - 1)
+    if limit is not None and span > limit:
+        return None
+
+    counts = {0: 1}
+    for sign, num, sides in terms:
+        if sides is None:
+            counts = {total + sign * num: ways for total, ways in counts.items()}
+            continue
+        die: dict[int, int] = {}
+        for face in FUDGE_FACES if sides == FUDGE else range(1, int(sides) + 1):
+            die[sign * face] = die.get(sign * face, 0) + 1
+        for _ in range(num):
+            counts = _convolve(counts, die)
+    return dict(sorted(counts.items()))
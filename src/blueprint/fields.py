@@ -4,34 +4,54 @@
 # ruff: noqa: ANN401
 from __future__ import annotations
 
+import bisect
+import functools
 import inspect
+import itertools
 import operator
 import pprint
+import random
 import re
-from collections import defaultdict
-from collections.abc import Callable
+import string
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from typing import Any, TypeVar, cast
 
 from . import dice
+from .alias import AliasTable
 
 # Type variable for function decorators
 _F = TypeVar('_F', bound=Callable[..., Any])  # Function type
 
 __all__ = [
     'All',
+    'Attr',
+    'CachedProperty',
     'Dice',
     'DiceTable',
+    'Equal',
     'Field',
     'FormatTemplate',
+    'ListOf',
+    'Max',
+    'Min',
+    'NotEqual',
     'PickFrom',
     'PickOne',
     'Property',
     'RandomInt',
+    'ResolvedStream',
+    'ShuffleBag',
+    'Stream',
+    'WeightedPickOne',
+    'Where',
     'WithTags',
     'defer_to_end',
     'depends_on',
     'generator',
+    'load_numpy',
     'resolve',
+    'template_names',
 ]
 
 
@@ -88,13 +108,64 @@ class Field:
     def __rfloordiv__(self, a: Any) -> FloorDivide:
         return FloorDivide(a, self)
 
+    def __mod__(self, b: Any) -> Modulo:
+        return Modulo(self, b)
+
+    def __rmod__(self, a: Any) -> Modulo:
+        return Modulo(a, self)
+
+    def __pow__(self, b: Any) -> Power:
+        return Power(self, b)
+
+    def __rpow__(self, a: Any) -> Power:
+        return Power(a, self)
+
+    def __neg__(self) -> Negative:
+        return Negative(self)
+
+    def __lt__(self, b: Any) -> LessThan:
+        return LessThan(self, b)
+
+    def __le__(self, b: Any) -> LessOrEqual:
+        return LessOrEqual(self, b)
+
+    def __gt__(self, b: Any) -> GreaterThan:
+        return GreaterThan(self, b)
+
+    def __ge__(self, b: Any) -> GreaterOrEqual:
+        return GreaterOrEqual(self, b)
+
+    def __and__(self, b: Any) -> And:
+        return And(self, b)
+
+    def __rand__(self, a: Any) -> And:
+        return And(a, self)
+
+    def __or__(self, b: Any) -> Or:
+        return Or(self, b)
+
+    def __ror__(self, a: Any) -> Or:
+        return Or(a, self)
+
+    def __invert__(self) -> Not:
+        return Not(self)
+
 
 class _Operator(Field):
-    """Base class for all operator fields."""
+    """Base class for all operator fields.
+
+    An operator tree is compiled into a single flat function the first time
+    it is needed, or when its blueprint class is created: nested operators are
+    inlined, constant sub-expressions are folded, and the leaves are
+    evaluated in order. Leaf fields are resolved exactly as ``resolve`` would
+    resolve them, so compiled trees consume random numbers in the same order
+    as evaluating the tree node by node.
+    """
 
     op: Callable[[Any, Any], Any] | None = None
     sym: str = ''
     items: tuple[Any, ...]
+    _compiled: Callable[[Any], Any] | None = None
 
     def __init__(self, *items: Any) -> None:
         self.items = items
@@ -105,21 +176,65 @@ class _Operator(Field):
     def __str__(self) -> str:
         return (f' {self.sym} ').join(repr(i) for i in self.items)
 
-    def __call__(self, parent: Any) -> Any:
-        result: Any = None
-        for item in self.items:
-            if result is None:
-                result = self.resolve(parent, item)
-            else:
-                assert self.op is not None, 'op must be set in subclass'  # noqa: S101
-                result = self.op(result, self.resolve(parent, item))
-        return result
+    def __call__(self, parent: Any, seed: Any = None) -> Any:  # noqa: ARG002
+        # ``seed`` is accepted, and ignored, so that ``resolve`` need not
+        # retry the call after a TypeError.
+        compiled = self._compiled
+        if compiled is None:
+            compiled = self.compile()
+        return compiled(parent)
+
+    def contribute_to_class(self, cls: type[Any], name: str) -> None:
+        """Compile the operator tree when it is added to a blueprint class."""
+        self.compile()
+        setattr(cls, name, self)
+
+    def compile(self) -> Callable[[Any], Any]:
+        """Compile the operator tree into a single function of the parent blueprint.
+
+        Returns:
+            The compiled function, which is also cached on the operator.
+
+        """
+        compiler = _OperatorCompiler()
+        self._compiled = compiler.build(self)
+        return self._compiled
 
     def resolve(self, parent: Any, item: Any) -> Any:  # noqa: PLR6301
         if isinstance(item, _Operator):
             return item(parent)
         return resolve(parent, item)
 
+    @property
+    def depends_on(self) -> set[str]:
+        """The fields that the tree's leaves depend on."""
+        names: set[str] = set()
+        for item in self.items:
+            names.update(getattr(item, 'depends_on', ()))
+        return names
+
+    def evaluate_batch(self, instances: Sequence[Any]) -> Any:
+        """Evaluate the operator tree column-wise over a batch of mastered blueprints.
+
+        ``Attr`` leaves read a whole column of values at once, other leaf
+        fields are resolved once per instance, and each operator is then
+        applied to whole columns: NumPy arrays when NumPy is installed, and
+        lists otherwise.
+
+        Args:
+            instances: The mastered blueprints.
+
+        Returns:
+            One value per instance, as a NumPy array or a list.
+
+        """
+        evaluator = _BatchEvaluator(instances)
+        is_column, value = evaluator.node(self)
+        if is_column:
+            return value
+        np = evaluator.np
+        return np.full(len(instances), value) if np is not None else [value] * len(instances)
+
 
 class Add(_Operator):
     """When resolved, adds all the provided arguments and returns the result."""
@@ -156,6 +271,361 @@ class FloorDivide(_Operator):
     sym: str = '//'
 
 
+class Modulo(_Operator):
+    """When resolved, takes the remainder of dividing all the provided arguments and returns the result."""
+
+    op: Callable[[Any, Any], Any] = operator.mod
+    sym: str = '%'
+
+
+class Power(_Operator):
+    """When resolved, raises each argument to the power of the next, left to right, and returns the result."""
+
+    op: Callable[[Any, Any], Any] = operator.pow
+    sym: str = '**'
+
+
+class Negative(_Operator):
+    """When resolved, negates the single provided argument and returns the result."""
+
+    sym: str = '-'
+
+    def __init__(self, item: Any) -> None:
+        super().__init__(item)
+
+    def __str__(self) -> str:
+        return f'-{self.items[0]!r}'
+
+
+class Min(_Operator):
+    """When resolved, returns the smallest of the provided arguments."""
+
+    op: Callable[[Any, Any], Any] = min
+    sym: str = 'min'
+
+    def __str__(self) -> str:
+        return f'min({", ".join(repr(i) for i in self.items)})'
+
+    __repr__ = __str__
+
+
+class Max(_Operator):
+    """When resolved, returns the largest of the provided arguments."""
+
+    op: Callable[[Any, Any], Any] = max
+    sym: str = 'max'
+
+    def __str__(self) -> str:
+        return f'max({", ".join(repr(i) for i in self.items)})'
+
+    __repr__ = __str__
+
+
+class _Comparison(_Operator):
+    """Base class for comparison fields, which compare exactly two arguments."""
+
+    def __init__(self, a: Any, b: Any) -> None:
+        super().__init__(a, b)
+
+    def __bool__(self) -> bool:
+        msg = (
+            f'The truth value of the comparison field {self!r} is only known once it is resolved. '
+            'Use &, | and ~ instead of and, or and not, and blueprint.Min and blueprint.Max '
+            'instead of min() and max() on fields.'
+        )
+        raise TypeError(msg)
+
+
+class LessThan(_Comparison):
+    """When resolved, returns whether the first argument is less than the second."""
+
+    op: Callable[[Any, Any], Any] = operator.lt
+    sym: str = '<'
+
+
+class LessOrEqual(_Comparison):
+    """When resolved, returns whether the first argument is less than or equal to the second."""
+
+    op: Callable[[Any, Any], Any] = operator.le
+    sym: str = '<='
+
+
+class GreaterThan(_Comparison):
+    """When resolved, returns whether the first argument is greater than the second."""
+
+    op: Callable[[Any, Any], Any] = operator.gt
+    sym: str = '>'
+
+
+class GreaterOrEqual(_Comparison):
+    """When resolved, returns whether the first argument is greater than or equal to the second."""
+
+    op: Callable[[Any, Any], Any] = operator.ge
+    sym: str = '>='
+
+
+class Equal(_Comparison):
+    """When resolved, returns whether the two arguments are equal."""
+
+    op: Callable[[Any, Any], Any] = operator.eq
+    sym: str = '=='
+
+
+class NotEqual(_Comparison):
+    """When resolved, returns whether the two arguments are not equal."""
+
+    op: Callable[[Any, Any], Any] = operator.ne
+    sym: str = '!='
+
+
+def _logical_and(a: Any, b: Any) -> bool:
+    return bool(a) and bool(b)
+
+
+def _logical_or(a: Any, b: Any) -> bool:
+    return bool(a) or bool(b)
+
+
+class And(_Comparison):
+    """When resolved, returns whether both arguments are true. Both are always resolved."""
+
+    op: Callable[[Any, Any], Any] = staticmethod(_logical_and)
+    sym: str = '&'
+
+
+class Or(_Comparison):
+    """When resolved, returns whether either argument is true. Both are always resolved."""
+
+    op: Callable[[Any, Any], Any] = staticmethod(_logical_or)
+    sym: str = '|'
+
+
+class Not(_Comparison):
+    """When resolved, returns whether the single provided argument is false."""
+
+    sym: str = '~'
+
+    def __init__(self, item: Any) -> None:
+        _Operator.__init__(self, item)
+
+    def __str__(self) -> str:
+        return f'~{self.items[0]!r}'
+
+
+class Where(_Operator):
+    """When resolved, returns ``a`` if ``condition`` is true, and ``b`` otherwise.
+
+    All three arguments are resolved, whichever is returned, so that
+    random numbers are drawn in the same order either way::
+
+        damage = Where(Attr('level') >= 10, Dice('sum(2d6)'), Dice('sum(1d6)'))
+    """
+
+    def __init__(self, condition: Any, a: Any, b: Any) -> None:
+        super().__init__(condition, a, b)
+
+    def __str__(self) -> str:
+        return f'where({", ".join(repr(i) for i in self.items)})'
+
+    __repr__ = __str__
+
+
+class Attr(Field):
+    """When resolved, returns the named field of the parent blueprint.
+
+    Use ``Attr`` to refer to another field in an operator tree, e.g.
+    ``Attr('strength') >= 10``. In operator trees, the value is read
+    directly; in batches, a whole column is read at once (see
+    ``_Operator.evaluate_batch``).
+    """
+
+    name: str
+    depends_on: set[str]
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.depends_on = {name}
+
+    def __str__(self) -> str:
+        return self.name
+
+    def __call__(self, parent: Any, seed: Any = None) -> Any:  # noqa: ARG002, D102
+        return getattr(parent, self.name)
+
+
+# Operators emitted inline by the compiler. Any other ``op`` is called as a function.
+_INFIX_OPS: dict[Any, str] = {
+    operator.add: '+',
+    operator.sub: '-',
+    operator.mul: '*',
+    operator.truediv: '/',
+    operator.floordiv: '//',
+    operator.mod: '%',
+    operator.pow: '**',
+    operator.lt: '<',
+    operator.le: '<=',
+    operator.gt: '>',
+    operator.ge: '>=',
+    operator.eq: '==',
+    operator.ne: '!=',
+}
+
+
+class _OperatorCompiler:
+    """Generates the source of a flat function evaluating an operator tree."""
+
+    namespace: dict[str, Any]
+    lines: list[str]
+    draws: bool
+
+    def __init__(self) -> None:
+        self.namespace = {'_resolve': resolve}
+        self.lines = []
+        self.draws = False
+
+    def build(self, node: _Operator) -> Callable[[Any], Any]:
+        is_constant, value = self.node(node)
+        if is_constant:
+            return lambda parent: value  # noqa: ARG005
+        prologue = ['    _draw = parent.meta.random.random'] if self.draws else []
+        source = '\n'.join(['def _compiled(parent):', *prologue, *self.lines, f'    return {value}'])
+        exec(compile(source, f'<compiled {node!r}>', 'exec'), self.namespace)  # noqa: S102
+        return cast('Callable[[Any], Any]', self.namespace['_compiled'])
+
+    def bind(self, value: Any, prefix: str) -> str:
+        name = f'{prefix}{len(self.namespace)}'
+        self.namespace[name] = value
+        return name
+
+    def leaf(self, item: Any) -> tuple[bool, Any]:
+        """Compile a leaf, returning ``(True, value)`` for constants or ``(False, expression)``."""
+        if isinstance(item, _Operator):
+            if type(item).__call__ is _Operator.__call__:
+                return self.node(item)
+            expr = f'{self.bind(item, "_op")}(parent)'
+        elif isinstance(item, Attr):
+            expr = f'getattr(parent, {item.name!r})'
+        elif not callable(item):
+            if item.__class__.__name__ != 'generator':
+                return True, item
+            expr = f'_resolve(parent, {self.bind(item, "_gen")})'
+        elif type(item) in _DIRECT_FIELDS:
+            # Match the seed that ``resolve`` draws before falling back to ``item(parent)``.
+            self.draws = True
+            self.lines.append('    _draw()')
+            expr = f'{self.bind(item, "_field")}(parent)'
+        else:
+            expr = f'_resolve(parent, {self.bind(item, "_field")})'
+        local = f'_v{len(self.lines)}'
+        self.lines.append(f'    {local} = {expr}')
+        return False, local
+
+    def node(self, node: _Operator) -> tuple[bool, Any]:
+        leaves = [self.leaf(item) for item in node.items]
+        if isinstance(node, (Negative, Not, Where)):
+            return self.special(node, leaves)
+
+        op = node.op
+        assert op is not None, 'op must be set in subclass'  # noqa: S101
+        # Fold leading constants; later ones cannot be folded without reordering.
+        while len(leaves) > 1 and leaves[0][0] and leaves[1][0]:
+            try:
+                folded = op(leaves[0][1], leaves[1][1])
+            except Exception:  # noqa: BLE001
+                break  # Leave the error to be raised on resolution.
+            leaves[:2] = [(True, folded)]
+        if len(leaves) == 1 and leaves[0][0]:
+            return leaves[0]
+
+        operands = [value if not is_constant else self.bind(value, '_c') for is_constant, value in leaves]
+        if op in {min, max}:
+            return False, f'{self.bind(op, "_fn")}({", ".join(operands)})'
+        expr = operands[0]
+        for operand in operands[1:]:
+            expr = (
+                f'({expr} {_INFIX_OPS[op]} {operand})'
+                if op in _INFIX_OPS
+                else f'{self.bind(op, "_fn")}({expr}, {operand})'
+            )
+        return False, expr
+
+    def special(self, node: _Operator, leaves: list[tuple[bool, Any]]) -> tuple[bool, Any]:
+        """Compile the operators without a binary ``op``: negation, logical not and ``Where``."""
+        if all(is_constant for is_constant, _ in leaves):
+            try:
+                return True, _apply_scalar(node, [value for _, value in leaves])
+            except Exception:  # noqa: BLE001, S110
+                pass  # Leave the error to be raised on resolution.
+        operands = [value if not is_constant else self.bind(value, '_c') for is_constant, value in leaves]
+        if isinstance(node, Negative):
+            return False, f'(-{operands[0]})'
+        if isinstance(node, Not):
+            return False, f'(not {operands[0]})'
+        condition, a, b = operands
+        return False, f'({a} if {condition} else {b})'
+
+
+def _where(condition: Any, a: Any, b: Any) -> Any:
+    return a if condition else b
+
+
+def _apply_scalar(node: _Operator, values: list[Any]) -> Any:
+    """Apply an operator node to the values of its items for a single instance."""
+    if isinstance(node, Negative):
+        return -values[0]
+    if isinstance(node, Not):
+        return not values[0]
+    if isinstance(node, Where):
+        return _where(*values)
+    return functools.reduce(node.op, values)  # type: ignore[arg-type]
+
+
+def _apply_vector(np: Any, node: _Operator, values: list[Any]) -> Any:
+    """Apply an operator node element-wise to NumPy columns and scalars."""
+    if isinstance(node, Negative):
+        return -values[0]
+    if isinstance(node, Not):
+        return np.logical_not(values[0])
+    if isinstance(node, Where):
+        return np.where(*values)
+    vector_ops = {min: np.minimum, max: np.maximum, _logical_and: np.logical_and, _logical_or: np.logical_or}
+    op = cast('Callable[[Any, Any], Any]', vector_ops.get(node.op, node.op))  # type: ignore[arg-type]
+    return functools.reduce(op, values)
+
+
+class _BatchEvaluator:
+    """Evaluates operator trees column-wise over a batch of mastered blueprints."""
+
+    instances: Sequence[Any]
+    np: Any
+
+    def __init__(self, instances: Sequence[Any]) -> None:
+        self.instances = instances
+        self.np = load_numpy()
+
+    def column(self, values: list[Any]) -> Any:
+        return self.np.asarray(values) if self.np is not None else values
+
+    def leaf(self, item: Any) -> tuple[bool, Any]:
+        """Evaluate a leaf, returning ``(False, value)`` for constants or ``(True, column)``."""
+        if isinstance(item, _Operator) and type(item).__call__ is _Operator.__call__:
+            return self.node(item)
+        if isinstance(item, Attr):
+            return True, self.column([getattr(instance, item.name) for instance in self.instances])
+        if not callable(item) and item.__class__.__name__ != 'generator':
+            return False, item
+        return True, self.column([resolve(instance, item) for instance in self.instances])
+
+    def node(self, node: _Operator) -> tuple[bool, Any]:
+        leaves = [self.leaf(item) for item in node.items]
+        if not any(is_column for is_column, _ in leaves):
+            return False, _apply_scalar(node, [value for _, value in leaves])
+        if self.np is not None:
+            return True, _apply_vector(self.np, node, [value for _, value in leaves])
+        columns = [value if is_column else itertools.repeat(value) for is_column, value in leaves]
+        return True, [_apply_scalar(node, list(row)) for row in zip(*columns, strict=False)]
+
+
 class RandomInt(Field):
     """When resolved, returns a random integer between ``start`` and ``end``."""
 
@@ -176,29 +646,26 @@ class RandomInt(Field):
 class Dice(Field):
     """When resolved, returns a random roll of the dice defined in ``dice_expr``.
 
-    A dice expression is simply an extended-format python expression,
-    where a throw of the dice is represented as a string of the form
-    ``NdS``, where ``N`` is the number of dice, and ``S`` is the
-    number of sides on the dice. These dice expressions are expanded
-    to a call to ``[random.randint(1, sides) for x in range(num)]``,
-    which evaluates to a list of integer results.
-
-    Within the expression, you have access to all python builtins, as
-    well as ``parent``, ``random`` (taken from
-    ``parent.meta.random``), and any keyword arguments passed in to
-    the constructor.
+    A throw of the dice is written ``NdS``, where ``N`` is the number of
+    dice, and ``S`` is the number of sides on the dice, or ``NdF`` for
+    Fudge dice. On its own, a throw evaluates to a list of integer
+    results. Throws may be combined with numbers, arithmetic and the
+    functions ``sum``, ``sorted``, ``max``, ``min``, ``abs`` and
+    ``random.choice``, where ``random`` is taken from
+    ``parent.meta.random``. See ``blueprint.dice.dcompile``.
 
     Example dice expressions::
 
-        '3d6'                 # -> a list of 3 integer results from a six-sided die
-        'sorted(3d6)          # -> a sorted list of 3 integer results
-        '3d6 + [10]'          # -> a list of 4 integers, the last one being 10.
-        'sum(3d6) + max(3d10) # -> an integer result from the given expression
+        "3d6"  # -> a list of 3 integer results from a six-sided die
+
+        'sorted(3d6)'  # -> a sorted list of 3 integer results
+        '3d6 + 2'  # -> an integer: the sum of the dice, plus 2
+        'sum(3d6) + max(3d10)'  # -> an integer result from the given expression
         'random.choice(3d6)'  # -> a random integer result chosen from 3 rolls.
     """
 
     expr: str
-    compiled_expr: Any
+    compiled_expr: dice.DiceExpression
     local_kwargs: dict[str, Any]
 
     def __init__(self, dice_expr: str, **local_kwargs: Any) -> None:
@@ -207,7 +674,7 @@ class Dice(Field):
         self.local_kwargs = local_kwargs
 
     def __call__(self, parent: Any) -> Any:  # noqa: D102
-        return dice.roll(self.compiled_expr, random_obj=parent.meta.random, parent=parent, **self.local_kwargs)
+        return self.compiled_expr(parent.meta.random)
 
     def __str__(self) -> str:
         return str(self.expr)
@@ -216,35 +683,124 @@ class Dice(Field):
 class DiceTable(Dice):
     """Same as a Dice field, but the result of evaluating the dice expression is used to select a value from a table.
 
-    The table maps dice results to values.
+    The table maps dice results to values. Keys may be integers, strings of
+    comma-separated integers, or inclusive ranges written ``'start..end'`` or
+    ``'start:end'``. Ranges are stored as sorted interval boundaries, so a
+    table keyed ``'1..1000000'`` costs no more than one keyed ``'1..2'``.
+    Later keys take precedence over earlier keys they overlap.
+
+    When the dice expression is a simple sum of dice and constants (e.g.
+    ``'3d6'`` or ``'2d10 + 1d4 - 2'``), the probability of each row, including
+    the default, is computed up front, and each resolution selects a row with a
+    single random draw from an alias table instead of rolling every die. Pass
+    ``direct=False`` to roll the dice as written, e.g. to reproduce results
+    that depend on the exact sequence of random numbers drawn.
     """
 
-    range_sep_cp: re.Pattern[str] = re.compile(r'(?:\.\.)|[:]')
-    table: defaultdict[str | int, Any]
+    # Static expressions with more possible totals than this are rolled as written.
+    max_direct_totals: int = 100_000
 
-    def __init__(self, dice_expr: str, table: dict[str | int, Any], default: Any = None, **local_kwargs: Any) -> None:
+    range_sep_cp: re.Pattern[str] = re.compile(r'(?:\.\.)|[:]')
+    table: dict[Any, Any]
+    intervals: list[tuple[int, int, Any]]
+    default: Any
+    rows: tuple[Any, ...] | None
+    row_table: AliasTable | None
+    _starts: list[int]
+
+    def __init__(
+        self,
+        dice_expr: str,
+        table: dict[str | int, Any],
+        default: Any = None,
+        *,
+        direct: bool = True,
+        **local_kwargs: Any,
+    ) -> None:
         super().__init__(dice_expr, **local_kwargs)
-        self.table = defaultdict(lambda: default)
+        self.table = {}
+        self.intervals = []
+        self.default = default
         for key, value in table.items():
-            if isinstance(key, str):
-                if self.range_sep_cp.search(key):
-                    start_end = self.range_sep_cp.split(key)
-                    start, end = int(start_end[0]), int(start_end[-1])
-                    for n in range(start, end + 1):
-                        self.table[str(n)] = value
-                else:
-                    for i in key.split(','):
-                        self.table[i.strip()] = value
-            else:
+            if not isinstance(key, str):
                 self.table[key] = value
+            elif self.range_sep_cp.search(key):
+                start_end = self.range_sep_cp.split(key)
+                self._add_interval(int(start_end[0]), int(start_end[-1]), value)
+            else:
+                for i in key.split(','):
+                    self.table[_table_key(i.strip())] = value
+        self._starts = [start for start, _, _ in self.intervals]
+        self.rows = self.row_table = None
+        if direct:
+            self._build_row_table()
+
+    def _build_row_table(self) -> None:
+        """Precompute the probability of each row, if the dice expression allows it."""
+        counts = dice.distribution(self.expr, limit=self.max_direct_totals)
+        if counts is None:
+            return
+        total = sum(counts.values())
+        # Rows are told apart by identity, as their values need not be hashable.
+        rows: dict[int, Any] = {}
+        weights: dict[int, float] = {}
+        for result, ways in counts.items():
+            row = self.lookup(result)
+            rows[id(row)] = row
+            weights[id(row)] = weights.get(id(row), 0.0) + ways / total
+        self.rows = tuple(rows.values())
+        self.row_table = AliasTable(weights.values())
+
+    def _add_interval(self, start: int, end: int, value: Any) -> None:
+        """Add an inclusive interval, clipping any earlier keys it overlaps."""
+        for key in [key for key in self.table if isinstance(key, int) and start <= key <= end]:
+            del self.table[key]
+        kept = []
+        for lo, hi, old in self.intervals:
+            if lo < start:
+                kept.append((lo, min(hi, start - 1), old))
+            if hi > end:
+                kept.append((max(lo, end + 1), hi, old))
+        kept.append((start, end, value))
+        self.intervals = sorted((entry for entry in kept if entry[0] <= entry[1]), key=operator.itemgetter(0))
+
+    def lookup(self, result: Any) -> Any:
+        """Return the table entry selected by the given dice result, before resolution.
+
+        Integral float results, such as those of ``'1d20 / 2'``, select integer
+        keys and ranges. Any other result falls back to the key spelled like it,
+        so ``3.5`` selects ``'3.5'``.
+        """
+        key = result
+        if isinstance(result, dice.results) or (isinstance(result, float) and result.is_integer()):
+            key = int(result)
+        try:
+            return self.table[key]
+        except (KeyError, TypeError):
+            pass
+        if isinstance(key, int):
+            index = bisect.bisect_right(self._starts, key) - 1
+            if index >= 0 and key <= self.intervals[index][1]:
+                return self.intervals[index][2]
+        return self.table.get(str(result), self.default)
 
     def __call__(self, parent: Any) -> Any:  # noqa: D102
-        result = str(super().__call__(parent))
-        result = self.table[result]
-        return resolve(parent, result)
+        if self.row_table is not None:
+            return resolve(parent, self.rows[self.row_table.sample(parent.meta.random)])  # type: ignore[index]
+        return resolve(parent, self.lookup(super().__call__(parent)))
 
     def __str__(self) -> str:
-        return f'{self.expr!s} for {pprint.pformat(self.table)}'
+        entries = {f'{start}..{end}': value for start, end, value in self.intervals}
+        entries.update(self.table)
+        return f'{self.expr!s} for {pprint.pformat(entries)}'
+
+
+def _table_key(key: str) -> int | str:
+    """Return a DiceTable key as an integer, if it is one."""
+    try:
+        return int(key)
+    except ValueError:
+        return key
 
 
 class PickOne(Field):
@@ -263,8 +819,59 @@ class PickOne(Field):
         return resolve(parent, result)
 
 
+class WeightedPickOne(Field):
+    """When resolved, returns a random choice, picked with probability proportional to its weight.
+
+    Choices may be given as a mapping of choice to weight, or as an iterable
+    of ``(choice, weight)`` pairs for choices that are not hashable. Choices
+    may be static values, fields or blueprints, and are resolved once picked.
+    Weights may be any non-negative numbers.
+
+    Each pick costs a single random draw, however many choices there are::
+
+        loot = WeightedPickOne({'copper': 70, 'silver': 25, Gem: 4.5, Artifact: 0.5})
+    """
+
+    choices: tuple[Any, ...]
+    weights: tuple[float, ...]
+    table: AliasTable
+
+    def __init__(self, choices: Mapping[Any, float] | Iterable[tuple[Any, float]]) -> None:
+        pairs = tuple(choices.items() if isinstance(choices, Mapping) else choices)
+        self.choices = tuple(choice for choice, _ in pairs)
+        self.weights = tuple(weight for _, weight in pairs)
+        self.table = AliasTable(self.weights)
+
+    def __str__(self) -> str:
+        return ', '.join(f'{choice!r}: {weight!r}' for choice, weight in zip(self.choices, self.weights, strict=True))
+
+    def __call__(self, parent: Any) -> Any:  # noqa: D102
+        return resolve(parent, self.choices[self.table.sample(parent.meta.random)])
+
+    def sample(self, parent: Any, n: int) -> list[Any]:
+        """Pick ``n`` choices at once, as if by resolving the field ``n`` times.
+
+        Args:
+            parent: The parent blueprint, whose random number generator is used.
+            n: The number of choices to pick.
+
+        Returns:
+            A list of ``n`` resolved choices.
+
+        """
+        choices = self.choices
+        picks = [choices[i] for i in self.table.sample_many(parent.meta.random, n)]
+        if not any(callable(choice) for choice in choices):
+            return picks
+        return [resolve(parent, pick) for pick in picks]
+
+
 class PickFrom(Field):
-    """When resolved, returns a random item from the collection provided."""
+    """When resolved, returns a random item from the collection provided.
+
+    When the collection is a ``WithTags`` query, its cached results are used
+    directly, so that most picks cost a single random draw.
+    """
 
     collection: Any
 
@@ -275,8 +882,132 @@ class PickFrom(Field):
         return str(self.collection)
 
     def __call__(self, parent: Any) -> Any:  # noqa: D102
-        collection = resolve(parent, self.collection)
-        return resolve(parent, parent.meta.random.choice(list(collection)))
+        if isinstance(self.collection, WithTags):
+            candidates = self.collection.results(parent)
+        else:
+            candidates = tuple(resolve(parent, self.collection))
+        return resolve(parent, parent.meta.random.choice(candidates))
+
+
+class _Bag:
+    """The state of one shuffle bag: which permutation slot is drawn next."""
+
+    seed: str
+    size: int
+    drawn: int
+    _shuffle: tuple[int, list[int]]
+
+    def __init__(self, seed: str, size: int) -> None:
+        self.seed = seed
+        self.size = size
+        self.drawn = 0
+        self._shuffle = (-1, [])
+
+    def slot(self, slot: int) -> int:
+        """Return the choice index in the given slot of the endless sequence of permutations."""
+        epoch, position = divmod(slot, self.size)
+        shuffle = self._shuffle
+        if shuffle[0] != epoch:
+            # Shuffle a fresh list and publish it with its epoch in one assignment,
+            # so that other threads never see a half-shuffled or mismatched permutation.
+            permutation = list(range(self.size))
+            random.Random(f'{self.seed}:{epoch}').shuffle(permutation)  # noqa: S311
+            shuffle = self._shuffle = (epoch, permutation)
+        return shuffle[1][position]
+
+    def draw(self) -> int:
+        """Return the choice index in the next slot."""
+        index = self.slot(self.drawn)
+        self.drawn += 1
+        return index
+
+
+class ShuffleBag(Field):
+    """When resolved, returns a random choice, drawing without replacement until every choice has been drawn.
+
+    The choices are drawn in a shuffled order, and reshuffled each time the
+    bag is exhausted, so every choice comes up once before any repeats. Each
+    draw costs O(1). Draws share a bag according to ``scope``:
+
+    - ``'parent'``: draws for blueprints nested in the same parent blueprint
+      (or, for a top-level blueprint, draws for the blueprint itself).
+      The shuffles are seeded by the parent's seed.
+    - ``'collection'``: draws for the items of a ``BlueprintCollection``.
+      ``collection[i]`` always gets slot ``i`` of the collection's sequence
+      of shuffles, however the items are accessed. Blueprints nested in a
+      collection item, and blueprints mastered outside of collection
+      indexing, behave like ``'parent'``.
+    - ``'global'``: all draws in the process. Reproducible for a given order
+      of draws; ``reset()`` starts over.
+
+    For example, to give each of 200 rooms a different theme::
+
+        class Room(Blueprint):
+            theme = ShuffleBag(*THEMES, scope='collection')
+
+
+        rooms = BlueprintCollection(Room, seed='dungeon')[0:200]
+    """
+
+    scopes = frozenset({'parent', 'collection', 'global'})
+
+    choices: tuple[Any, ...]
+    scope: str
+    key: str
+    _global: _Bag | None
+    _lock: threading.Lock
+
+    def __init__(self, *choices: Any, scope: str = 'parent') -> None:
+        if not choices:
+            msg = 'ShuffleBag needs at least one choice'
+            raise ValueError(msg)
+        if scope not in self.scopes:
+            msg = f'ShuffleBag scope must be one of {sorted(self.scopes)}, not {scope!r}'
+            raise ValueError(msg)
+        self.choices = choices
+        self.scope = scope
+        self.key = ''
+        self._global = None
+        self._lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return f'{self.choices} ({self.scope})'
+
+    def contribute_to_class(self, cls: type[Any], name: str) -> None:
+        """Key the shuffles by the field name, so that bags of different fields are shuffled differently."""
+        self.key = name
+        setattr(cls, name, self)
+
+    def reset(self) -> None:
+        """Start the global bag over from its first shuffle."""
+        with self._lock:
+            self._global = None
+
+    def __call__(self, parent: Any) -> Any:  # noqa: D102
+        return resolve(parent, self.choices[self._draw(parent)])
+
+    def _draw(self, parent: Any) -> int:
+        if self.scope == 'global':
+            with self._lock:
+                if self._global is None:
+                    self._global = _Bag(self.key, len(self.choices))
+                return self._global.draw()
+        if self.scope == 'collection':
+            from .collection import current_item
+
+            item = current_item.get()
+            # Only the collection item itself gets its slot; blueprints nested in it have a parent.
+            if item is not None and parent.meta.parent is None:
+                collection, index = item
+                bag = collection.cache.get(self)
+                if bag is None:
+                    bag = collection.cache[self] = _Bag(f'{collection.seed}:{self.key}', len(self.choices))
+                return bag.slot(index)
+        owner = parent.meta.parent or parent
+        bag = owner.meta.cache.get(self)
+        if bag is None:
+            bag = owner.meta.cache[self] = _Bag(f'{owner.meta.seed}:{self.key}', len(self.choices))
+        return bag.draw()
 
 
 class All(Field):
@@ -294,6 +1025,121 @@ class All(Field):
         return [resolve(parent, i) if callable(i) else i for i in self.items]
 
 
+class ListOf(Field):
+    """When resolved, returns a list of ``count`` resolved items.
+
+    ``count`` may be a number or a field, such as ``Dice('2d4')``. When the
+    item is a blueprint class, each child is mastered with the parent blueprint
+    as its parent, and with seeds derived from a single draw of the parent's
+    random number generator. Choices from a ``WeightedPickOne`` are picked in
+    one batch. Any other item is resolved once per entry::
+
+        class Chest(Blueprint):
+            items = ListOf(Item, Dice('2d4'))
+            coins = ListOf(WeightedPickOne({'copper': 9, 'silver': 1}), 100)
+    """
+
+    item: Any
+    count: Any
+
+    def __init__(self, item: Any, count: Any) -> None:
+        self.item = item
+        self.count = count
+
+    def __str__(self) -> str:
+        return f'{self.count!s} x {self.item!r}'
+
+    def __call__(self, parent: Any) -> list[Any]:  # noqa: D102
+        count = int(resolve(parent, self.count))
+        item = self.item
+        if isinstance(item, type):
+            base = parent.meta.random.random()
+            return [item(parent=parent, seed=base + i) for i in range(count)]
+        if isinstance(item, WeightedPickOne):
+            return item.sample(parent, count)
+        return [resolve(parent, item) for _ in range(count)]
+
+
+class Stream(Field):
+    """When resolved, returns a lazy ``ResolvedStream`` over the items yielded by ``source``.
+
+    Fields that return generators are normally listed, and every item
+    resolved, during mastering. Wrap the generator function in a ``Stream`` to
+    keep it lazy instead, e.g. for long or unbounded sequences::
+
+        class Dungeon(Blueprint):
+            wanderers = Stream(lambda dungeon: itertools.repeat(PickOne(Orc, Goblin)))
+
+    ``source`` is called with the parent blueprint each time the stream is
+    iterated. Items are resolved as they are reached, each with its own
+    seed, so item ``i`` is the same however the stream is iterated or sliced.
+    For that to hold, ``source`` should yield fields rather than drawing
+    random numbers itself.
+    """
+
+    source: Callable[[Any], Iterable[Any]]
+
+    def __init__(self, source: Callable[[Any], Iterable[Any]]) -> None:
+        self.source = source
+
+    def __str__(self) -> str:
+        return repr(self.source)
+
+    def __call__(self, parent: Any) -> ResolvedStream:  # noqa: D102
+        return ResolvedStream(parent, self.source, parent.meta.random.random())
+
+
+class ResolvedStream:
+    """A lazy, re-iterable sequence of resolved items, as produced by a ``Stream`` field.
+
+    Supports iteration, and indexing or slicing with non-negative indices,
+    which resolves only the items selected::
+
+        first_ten = list(dungeon.wanderers[:10])
+    """
+
+    parent: Any
+    source: Callable[[Any], Iterable[Any]]
+    seed: float
+
+    def __init__(self, parent: Any, source: Callable[[Any], Iterable[Any]], seed: float) -> None:
+        self.parent = parent
+        self.source = source
+        self.seed = seed
+
+    def __repr__(self) -> str:
+        return f'<ResolvedStream: {self.source!r}>'
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._resolved(enumerate(self.source(self.parent)))
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            window = itertools.islice(enumerate(self.source(self.parent)), index.start, index.stop, index.step)
+            return self._resolved(window)
+        try:
+            return next(self._resolved(itertools.islice(enumerate(self.source(self.parent)), index, None)))
+        except StopIteration:
+            msg = f'Stream index {index} out of range'
+            raise IndexError(msg) from None
+
+    def _resolved(self, items: Iterable[tuple[int, Any]]) -> Iterator[Any]:
+        for i, item in items:
+            yield self.resolve_item(i, item)
+
+    def resolve_item(self, index: int, item: Any) -> Any:
+        """Resolve an item with the parent, using a random number generator seeded for its index."""
+        if not callable(item):
+            return item
+        meta = self.parent.meta
+        saved = meta.random
+        meta.random = random.Random(f'{self.seed}:{index}')  # noqa: S311
+        try:
+            return resolve(self.parent, item)
+        finally:
+            meta.random = saved
+
+
 class FormatTemplate(Field):
     """When resolved, returns a rendered string from the provided template.
 
@@ -301,6 +1147,11 @@ class FormatTemplate(Field):
     available to the template, as well as the parent ``meta`` options
     object.
 
+    The template is parsed once, and only the fields it refers to are
+    fetched when rendering; they are listed in ``depends_on``. Renderings
+    are cached on the mastered blueprint until one of those fields is
+    reassigned.
+
     .. format string syntax: http://docs.python.org/library/string.html#formatstrings
 
     An example::
@@ -320,10 +1171,18 @@ class FormatTemplate(Field):
     """
 
     _defer_to_end: bool = True
-    template: str
+    template: Any
+    names: tuple[str, ...] | None
+    depends_on: set[str]
 
-    def __init__(self, template: str) -> None:
+    def __init__(self, template: Any) -> None:
         self.template = template
+        if isinstance(template, str):
+            self.names = template_names(template)
+            self.depends_on = set(self.names) - {'meta', 'parent'}
+        else:
+            self.names = None
+            self.depends_on = set()
 
     def __str__(self) -> str:
         return str(self.template)
@@ -332,12 +1191,41 @@ class FormatTemplate(Field):
         if parent is None:
             return self
 
-        fields: dict[str, Any] = {'meta': parent.meta, 'parent': parent}
-        for name in parent.meta.fields:
-            if getattr(parent.__class__, name) is not self:
-                fields[name] = getattr(parent, name)
-        template_str = cast('str', resolve(parent, self.template))
-        return template_str.format(**fields)
+        names = self.names
+        if names is None:
+            template = cast('str', resolve(parent, self.template))
+            names = template_names(template)
+        else:
+            template = self.template
+
+        meta = parent.meta
+        fields = self._fetch(parent, names)
+        # Only renderings of a static template from immutable field values are
+        # cached, since anything else may change without being reassigned.
+        if self.names is None or 'meta' in fields or 'parent' in fields:
+            return template.format_map(fields)
+        values = tuple(fields.values())
+        cached = meta.cache.get(self)
+        if cached is not None and _same(cached[0], values):
+            return cast('str', cached[1])
+        rendered = template.format_map(fields)
+        if all(type(value) in _IMMUTABLE_TYPES for value in values):
+            meta.cache[self] = (values, rendered)
+        return rendered
+
+    def _fetch(self, parent: Any, names: tuple[str, ...]) -> dict[str, Any]:
+        meta = parent.meta
+        cls = parent.__class__
+        fields: dict[str, Any] = {}
+        for name in names:
+            if name in meta.fields:
+                if getattr(cls, name) is not self:
+                    fields[name] = getattr(parent, name)
+            elif name == 'meta':
+                fields[name] = meta
+            elif name == 'parent':
+                fields[name] = parent
+        return fields
 
 
 class Property(Field):
@@ -355,6 +1243,51 @@ class Property(Field):
         return self.func(parent)
 
 
+class CachedProperty(Property):
+    """A Property whose value is computed once per mastered blueprint, then cached.
+
+    The cached value is kept in the blueprint's ``meta.cache``, and is
+    recomputed once any field named in ``depends_on`` has been reassigned,
+    e.g. by a ``Mod`` or ``Factory``. Dependencies may also be declared by
+    decorating ``func`` with ``depends_on``. Changes made to a dependency in
+    place are not noticed; call ``invalidate()`` after making them.
+
+    Like ``FormatTemplate``, it is first evaluated after all other fields
+    have been resolved::
+
+        effective_damage = CachedProperty(lambda self: self.damage * self.multiplier, depends_on='damage multiplier')
+    """
+
+    _defer_to_end: bool = True
+    depends_on: set[str]
+    _names: tuple[str, ...]
+
+    def __init__(self, func: Callable[[Any], Any], depends_on: str | Iterable[str] = ()) -> None:
+        super().__init__(func)
+        names = set(getattr(func, 'depends_on', ()))
+        for name in [depends_on] if isinstance(depends_on, str) else depends_on:
+            names.update(name.split())
+        self.depends_on = names
+        self._names = tuple(sorted(names))
+
+    def __get__(self, parent: Any, type_: type[Any] | None = None) -> Any:
+        if parent is None:
+            return self
+
+        cache = parent.meta.cache
+        values = tuple(getattr(parent, name) for name in self._names)
+        cached = cache.get(self)
+        if cached is not None and _same(cached[0], values):
+            return cached[1]
+        value = self.func(parent)
+        cache[self] = (values, value)
+        return value
+
+    def invalidate(self, parent: Any) -> None:
+        """Drop the value cached for the given mastered blueprint."""
+        parent.meta.cache.pop(self, None)
+
+
 class WithTags(Field):
     r"""When resolved, returns the set of all blueprints selected by the given tags.
 
@@ -365,11 +1298,15 @@ class WithTags(Field):
     union), that is, \"all blueprints with this tag, but not required
     for others\". Tags without either prefix denote an AND (or
     interesction), that is, \"all blueprints must have this tag\".
+
+    Results are cached in the tag repository's ``query_cache`` until the
+    repository changes.
     """
 
     with_tags: set[str]
     or_tags: set[str]
     not_tags: set[str]
+    query_key: tuple[str, frozenset[str], frozenset[str], frozenset[str]]
 
     def __init__(self, *tags: str) -> None:
         all_tags: set[str] = set()
@@ -387,15 +1324,19 @@ class WithTags(Field):
                 self.or_tags.add(t)
             else:
                 self.with_tags.add(t)
+        self.query_key = ('WithTags', frozenset(self.with_tags), frozenset(self.or_tags), frozenset(self.not_tags))
 
     def __call__(self, parent: Any) -> list[Any]:  # noqa: D102
-        objects = parent.tag_repo.query_tags_intersection(*self.with_tags) if self.with_tags else parent.tag_repo
-        if self.or_tags:  # pragma: no cover
-            objects = objects.query_tags_union(*self.or_tags)
-        if self.not_tags:
-            objects = objects.query_tags_difference(*self.not_tags)
+        return list(self.results(parent))
 
-        return [o for o in objects if not o.meta.abstract]
+    def results(self, parent: Any) -> tuple[Any, ...]:
+        """Return the selected, non-abstract blueprints as a shared, cached tuple."""
+        repo = parent.tag_repo
+        return repo.query_cache.get(  # type: ignore[no-any-return]
+            repo.generation,
+            self.query_key,
+            lambda: tuple(o for o in repo.query(self.with_tags, self.or_tags, self.not_tags) if not o.meta.abstract),
+        )
 
 
 def generator(func: _F) -> _F:
@@ -421,6 +1362,56 @@ def depends_on(*names: str) -> Callable[[_F], _F]:
     return wrap
 
 
+#: Parses and renders format templates, for ``FormatTemplate`` and the other template fields.
+FORMATTER = string.Formatter()
+_top_level_name_cp: re.Pattern[str] = re.compile(r'[^.\[]*')
+
+# Field values that cannot change without being reassigned.
+_IMMUTABLE_TYPES = frozenset({str, int, float, complex, bool, bytes, type(None)})
+
+
+@functools.lru_cache(maxsize=1024)
+def template_names(template: str) -> tuple[str, ...]:
+    """Return the top-level names a format template refers to, in order of first use.
+
+    Example:
+        >>> template_names('{name} +{bonus:{width}} ({meta.source.name}, {stats[str]})')
+        ('name', 'bonus', 'width', 'meta', 'stats')
+
+    """
+    names: list[str] = []
+    for _, field_name, format_spec, _ in FORMATTER.parse(template):
+        if field_name is None:
+            continue
+        names.append(_top_level_name_cp.match(field_name).group())  # type: ignore[union-attr]
+        if format_spec and '{' in format_spec:
+            names.extend(template_names(format_spec))
+    return tuple(dict.fromkeys(names))
+
+
+@functools.cache
+def load_numpy() -> Any:
+    """Return the NumPy module, imported on first use, or None if it is not installed.
+
+    NumPy is imported lazily so that it only costs import time for code
+    that actually evaluates in batches.
+    """
+    try:
+        import numpy as np
+    except ImportError:  # pragma: no cover
+        return None
+    return np
+
+
+def _same(a: tuple[Any, ...], b: tuple[Any, ...]) -> bool:
+    return len(a) == len(b) and all(map(operator.is_, a, b))
+
+
+# Fields whose ``__call__`` takes only the parent and returns a fully resolved value,
+# so compiled operator trees can call them directly.
+_DIRECT_FIELDS = frozenset({RandomInt, Dice, DiceTable, PickOne, WeightedPickOne})
+
+
 def resolve(parent: Any, field: Any) -> Any:
     """Resolve a field with the given parent instance."""
     while callable(field):
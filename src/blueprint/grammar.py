@@ -0,0 +1,284 @@
+"""blueprint.grammar -- Tracery-style grammars for flavour text.
+
+A ``Grammar`` maps symbols to alternative templates, written in the same
+format string syntax as ``FormatTemplate``. A template may refer to other
+symbols, optionally followed by modifiers, and to the blueprint's other
+fields::
+
+    >>> import blueprint as bp
+    >>> class Sword(bp.Blueprint):
+    ...     metal = 'iron'
+    ...     description = Grammar({
+    ...         'origin': '{quality.a.capitalize} {metal} sword, {history}.',
+    ...         'quality': {'fine': 3, 'rusty': 1},
+    ...         'history': ['forged in {place}', 'found in {place}'],
+    ...         'place': ['the north', 'a barrow'],
+    ...     })
+    >>> Sword(seed='x').description.split()[2:4]
+    ['iron', 'sword,']
+
+The rules are compiled once into integer-indexed tables of pre-parsed
+templates, and expanded iteratively, so deep grammars cost no Python
+recursion.
+
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Protocol
+
+from blueprint import fields
+from blueprint.alias import AliasTable
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+__all__ = ['MODIFIERS', 'Grammar']
+
+
+class _Random(Protocol):
+    def random(self) -> float: ...
+
+
+def _a(text: str) -> str:
+    return f'{"an" if text[:1].lower() in "aeiou" else "a"} {text}'
+
+
+def _format(format_spec: str, text: str) -> str:
+    return format(text, format_spec)
+
+
+#: Modifiers that may follow a symbol, e.g. ``{animal.a.capitalize}``.
+MODIFIERS: dict[str, Callable[[str], str]] = {
+    'a': _a,
+    'capitalize': lambda text: text[:1].upper() + text[1:],
+    'lower': str.lower,
+    'title': str.title,
+    'upper': str.upper,
+}
+
+# Template operations: literal text, a blueprint field, a symbol to expand,
+# and the start and end of a symbol's text to apply modifiers to.
+_LITERAL, _FIELD, _SYMBOL, _OPEN, _CLOSE = range(5)
+
+_Op = tuple[int, Any]
+
+
+class _Names(dict[str, Any]):
+    """The names a template may refer to: the blueprint's fields, ``meta`` and ``parent``."""
+
+    def __init__(self, parent: Any) -> None:  # noqa: ANN401
+        super().__init__(meta=parent.meta, parent=parent)
+        self.parent = parent
+
+    def __missing__(self, name: str) -> Any:  # noqa: ANN401
+        return getattr(self.parent, name)
+
+
+class Grammar(fields.Field):
+    """When resolved, returns the expansion of the grammar's start symbol.
+
+    Each rule's alternatives may be a single template, a list of equally
+    likely templates, a mapping of template to weight, or a list of
+    ``(template, weight)`` pairs. Templates refer to symbols as ``{symbol}``,
+    optionally followed by modifiers (see ``MODIFIERS``) and a format spec.
+    Any other name is looked up on the blueprint, as in ``FormatTemplate``.
+    Each symbol costs a single draw from ``meta.random``.
+
+    Symbols nested more than ``max_depth`` deep, or beyond the first
+    ``max_expansions`` in one expansion, expand to nothing.
+
+    Attributes:
+        symbols: The rule names, in order of their index in the compiled tables.
+        start: The symbol expanded when the field is resolved.
+        depends_on: The blueprint fields the templates refer to.
+
+    """
+
+    symbols: tuple[str, ...]
+    start: str
+    max_depth: int
+    max_expansions: int
+    depends_on: set[str]
+    _index: dict[str, int]
+    _rules: list[tuple[tuple[tuple[_Op, ...], ...], AliasTable | None]]
+    _names: set[str]
+    _field_refs: list[tuple[str, str | None, str]]
+
+    def __init__(
+        self,
+        rules: Mapping[str, Any],
+        start: str = 'origin',
+        *,
+        max_depth: int = 32,
+        max_expansions: int = 10_000,
+    ) -> None:
+        """Compile the grammar.
+
+        Args:
+            rules: A mapping of symbol to alternatives.
+            start: The symbol expanded when the field is resolved.
+            max_depth: The deepest nesting of symbols that is expanded.
+            max_expansions: The most symbols expanded in one expansion.
+
+        Raises:
+            ValueError: If ``start`` is not a rule, a rule has no alternatives,
+                or a template uses an unknown modifier. Names that are
+                neither rules nor blueprint fields are rejected when the
+                grammar is added to a blueprint class.
+
+        """
+        if start not in rules:
+            msg = f'Grammar start symbol {start!r} is not a rule'
+            raise ValueError(msg)
+        self.symbols = tuple(rules)
+        self.start = start
+        self.max_depth = max_depth
+        self.max_expansions = max_expansions
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._names = set()
+        self._field_refs = []
+        self._rules = [self._compile_rule(symbol, rules[symbol]) for symbol in self.symbols]
+        self.depends_on = self._names - self._index.keys() - {'meta', 'parent'}
+
+    def __str__(self) -> str:
+        return f'{self.start} ({len(self.symbols)} rules)'
+
+    def contribute_to_class(self, cls: type[Any], name: str) -> None:
+        """Check that the names the templates refer to are rules or fields of the blueprint.
+
+        Raises:
+            ValueError: If a template refers to a name that is neither, e.g. a misspelled symbol.
+
+        """
+        unknown = self.depends_on - cls.meta.fields
+        if unknown:
+            msg = f'Grammar {name!r} refers to {sorted(unknown)}, which are neither rules nor fields of {cls.__name__}'
+            raise ValueError(msg)
+        setattr(cls, name, self)
+
+    def _compile_rule(self, symbol: str, alternatives: Any) -> tuple[tuple[tuple[_Op, ...], ...], AliasTable | None]:  # noqa: ANN401
+        if isinstance(alternatives, str):
+            pairs: list[tuple[str, float]] = [(alternatives, 1)]
+        elif isinstance(alternatives, Mapping):
+            pairs = list(alternatives.items())
+        else:
+            pairs = [(item, 1) if isinstance(item, str) else item for item in alternatives]
+        if not pairs:
+            msg = f'Grammar rule {symbol!r} has no alternatives'
+            raise ValueError(msg)
+        templates = tuple(self._compile_template(template) for template, _ in pairs)
+        weights = [weight for _, weight in pairs]
+        # Equal positive weights need no table; AliasTable rejects all-zero or negative weights.
+        table = None if len(set(weights)) == 1 and weights[0] > 0 else AliasTable(weights)
+        return templates, table
+
+    def _compile_template(self, template: str) -> tuple[_Op, ...]:
+        ops: list[_Op] = []
+        self._names.update(fields.template_names(template))
+        for literal, field_name, format_spec, conversion in fields.FORMATTER.parse(template):
+            if literal:
+                ops.append((_LITERAL, literal))
+            if field_name is None:
+                continue
+            symbol, *modifier_names = field_name.split('.')
+            if symbol not in self._index:
+                ops.append((_FIELD, len(self._field_refs)))
+                self._field_refs.append((field_name, conversion, format_spec or ''))
+                continue
+            modifiers = [self._modifier(name) for name in modifier_names]
+            if format_spec:
+                modifiers.append(functools.partial(_format, format_spec))
+            if modifiers:
+                ops.extend(((_OPEN, None), (_SYMBOL, self._index[symbol]), (_CLOSE, tuple(modifiers))))
+            else:
+                ops.append((_SYMBOL, self._index[symbol]))
+        return tuple(ops)
+
+    @staticmethod
+    def _modifier(name: str) -> Callable[[str], str]:
+        try:
+            return MODIFIERS[name]
+        except KeyError:
+            msg = f'Unknown grammar modifier {name!r}; expected one of {sorted(MODIFIERS)}'
+            raise ValueError(msg) from None
+
+    def _render_fields(self, parent: Any) -> list[str]:  # noqa: ANN401
+        formatter = fields.FORMATTER
+        names = _Names(parent)
+        rendered = []
+        for field_name, conversion, format_spec in self._field_refs:
+            value, _ = formatter.get_field(field_name, (), names)
+            rendered.append(format(formatter.convert_field(value, conversion), format_spec))
+        return rendered
+
+    def _pick(self, index: int, random: _Random) -> tuple[_Op, ...]:
+        templates, table = self._rules[index]
+        if table is None:
+            return templates[int(random.random() * len(templates))]
+        return templates[table.sample(random)]
+
+    def _expand(self, random: _Random, start: int, rendered: list[str]) -> str:
+        out: list[str] = []
+        marks: list[int] = []
+        frames: list[Iterator[_Op]] = [iter(((_SYMBOL, start),))]
+        expansions = 0
+        while frames:
+            op = next(frames[-1], None)
+            if op is None:
+                frames.pop()
+                continue
+            kind, arg = op
+            if kind == _LITERAL:
+                out.append(arg)
+            elif kind == _FIELD:
+                out.append(rendered[arg])
+            elif kind == _SYMBOL:
+                if len(frames) <= self.max_depth and expansions < self.max_expansions:
+                    expansions += 1
+                    frames.append(iter(self._pick(arg, random)))
+            elif kind == _OPEN:
+                marks.append(len(out))
+            else:
+                mark = marks.pop()
+                text = ''.join(out[mark:])
+                del out[mark:]
+                for modifier in arg:
+                    text = modifier(text)
+                out.append(text)
+        return ''.join(out)
+
+    def expand(self, parent: Any, symbol: str | None = None) -> str:  # noqa: ANN401
+        """Expand a symbol, drawing from the parent blueprint's random number generator.
+
+        Args:
+            parent: The blueprint whose fields and ``meta.random`` are used.
+            symbol: The symbol to expand. Defaults to the start symbol.
+
+        Returns:
+            The expanded text.
+
+        """
+        return self._expand(parent.meta.random, self._index[symbol or self.start], self._render_fields(parent))
+
+    def expand_many(self, parent: Any, n: int, symbol: str | None = None) -> list[str]:  # noqa: ANN401
+        """Expand a symbol ``n`` times, rendering the blueprint's fields only once.
+
+        Args:
+            parent: The blueprint whose fields and ``meta.random`` are used.
+            n: The number of expansions.
+            symbol: The symbol to expand. Defaults to the start symbol.
+
+        Returns:
+            A list of ``n`` expanded texts.
+
+        """
+        rendered = self._render_fields(parent)
+        start = self._index[symbol or self.start]
+        random = parent.meta.random
+        return [self._expand(random, start, rendered) for _ in range(n)]
+
+    def __call__(self, parent: Any) -> str:  # noqa: ANN401, D102
+        return self.expand(parent)
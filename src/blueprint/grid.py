@@ -0,0 +1,257 @@
+"""blueprint.grid -- tile maps generated a whole grid at a time.
+
+A ``Grid`` field fills a ``width`` by ``height`` tile map in one pass, rather
+than resolving a field for every cell. Each cell holds a small integer
+index into the map's palette of tiles. The cells are a NumPy array when
+NumPy is installed, and an ``array.array`` otherwise.
+
+Example:
+    >>> import blueprint as bp
+    >>> class Cave(bp.Blueprint):
+    ...     tiles = Grid(64, 32, bp.WeightedPickOne({'rock': 45, 'floor': 55}), smoothing=4)
+    >>> cave = Cave(seed='cave')
+    >>> cave.tiles.width, cave.tiles.height
+    (64, 32)
+    >>> cave.tiles[0, 0] in {'rock', 'floor'}
+    True
+
+"""
+
+from __future__ import annotations
+
+import bisect
+import collections
+import operator
+import random
+from array import array
+from typing import TYPE_CHECKING, Any, Protocol, cast
+
+from blueprint import fields
+from blueprint.alias import AliasTable
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+__all__ = ['Grid', 'Threshold', 'TileMap']
+
+
+class _Evaluable(Protocol):
+    def evaluate(self, xs: Any, ys: Any) -> Any: ...  # noqa: ANN401
+
+
+class Threshold:
+    """A grid cell chosen by comparing a continuous value, e.g. noise, against thresholds.
+
+    ``source`` is either a function of coordinate arrays ``f(xs, ys)``, or a
+    field that resolves to an object with an ``evaluate(xs, ys)`` method,
+    such as a ``Noise`` field. The arrays hold the column and row of every
+    cell, in row-major order, as flat NumPy arrays or, without NumPy, lists.
+    Each cell gets the value of the first step whose bound is above the
+    cell's value, or ``default`` if there is none::
+
+        Threshold(Noise('perlin', scale=32), [(0.3, 'water'), (0.7, 'grass')], default='rock')
+
+    Attributes:
+        source: The function or field producing values for each cell.
+        bounds: The ascending step bounds.
+        values: The tile for each step.
+        default: The tile for values above every bound.
+
+    """
+
+    source: Callable[[Any, Any], Any] | fields.Field
+    bounds: tuple[float, ...]
+    values: tuple[Any, ...]
+    default: Any
+
+    def __init__(
+        self,
+        source: Callable[[Any, Any], Any] | fields.Field,
+        steps: Sequence[tuple[float, Any]],
+        default: Any = None,  # noqa: ANN401
+    ) -> None:
+        self.source = source
+        ordered = sorted(steps, key=operator.itemgetter(0))
+        self.bounds = tuple(bound for bound, _ in ordered)
+        self.values = tuple(value for _, value in ordered)
+        self.default = default
+
+    def __repr__(self) -> str:
+        return f'<Threshold: {self.source!r} {list(zip(self.bounds, self.values, strict=True))}>'
+
+    def function(self, parent: Any) -> Callable[[Any, Any], Any]:  # noqa: ANN401
+        """Return the function of coordinate arrays to threshold, for the given parent blueprint."""
+        if isinstance(self.source, fields.Field):
+            evaluable: _Evaluable = fields.resolve(parent, self.source)
+            return evaluable.evaluate
+        return self.source
+
+
+class TileMap:
+    """A mastered tile map: a grid of indices into a palette of tiles.
+
+    Attributes:
+        width: The number of columns.
+        height: The number of rows.
+        palette: The tiles that cell indices refer to.
+        cells: The cell indices, as a ``(height, width)`` NumPy array, or a
+            row-major ``array.array`` without NumPy.
+
+    """
+
+    width: int
+    height: int
+    palette: tuple[Any, ...]
+    cells: Any
+
+    def __init__(self, width: int, height: int, palette: tuple[Any, ...], cells: Any) -> None:  # noqa: ANN401
+        self.width = width
+        self.height = height
+        self.palette = palette
+        self.cells = cells
+
+    def __repr__(self) -> str:
+        return f'<TileMap: {self.width}x{self.height}, {len(self.palette)} tiles>'
+
+    def index(self, x: int, y: int) -> int:
+        """Return the palette index of the cell at column ``x``, row ``y``."""
+        if isinstance(self.cells, array):
+            return int(self.cells[y * self.width + x])
+        return int(self.cells[y, x])
+
+    def __getitem__(self, xy: tuple[int, int]) -> Any:  # noqa: ANN401
+        return self.palette[self.index(*xy)]
+
+    def rows(self) -> list[list[Any]]:
+        """Return the tiles as a list of rows."""
+        palette = self.palette
+        flat = self.cells if isinstance(self.cells, array) else self.cells.ravel().tolist()
+        width = self.width
+        return [[palette[i] for i in flat[y * width : (y + 1) * width]] for y in range(self.height)]
+
+    def counts(self) -> collections.Counter[Any]:
+        """Count the cells holding each tile."""
+        flat = self.cells if isinstance(self.cells, array) else self.cells.ravel().tolist()
+        return collections.Counter({self.palette[i]: n for i, n in collections.Counter(flat).items()})
+
+
+class Grid(fields.Field):
+    """When resolved, returns a ``TileMap`` filled in a single pass.
+
+    ``cell`` may be a ``WeightedPickOne``, a ``PickOne``, a ``DiceTable`` over
+    a static dice expression, or a ``Threshold``. Its choices (or rows) form
+    the map's palette, and are used as tiles as they are, without being
+    resolved. The map is seeded from a single draw of the parent's random
+    number generator; maps generated with and without NumPy differ.
+
+    Each of the ``smoothing`` passes is a cellular automaton step that
+    replaces every cell with the most common tile in its 3x3 neighbourhood,
+    keeping the cell's own tile on ties. Cells beyond the edges repeat the
+    edge.
+
+    Attributes:
+        width: The number of columns, or a field resolving to it.
+        height: The number of rows, or a field resolving to it.
+        cell: The field choosing each cell's tile.
+        smoothing: The number of smoothing passes.
+
+    """
+
+    width: Any
+    height: Any
+    cell: Any
+    smoothing: int
+
+    def __init__(self, width: Any, height: Any, cell: Any, *, smoothing: int = 0) -> None:  # noqa: ANN401
+        if not isinstance(cell, (fields.WeightedPickOne, fields.PickOne, fields.DiceTable, Threshold)):
+            msg = f'Grid cells must be a WeightedPickOne, PickOne, DiceTable or Threshold, not {cell!r}'
+            raise TypeError(msg)
+        if isinstance(cell, fields.DiceTable) and cell.row_table is None:
+            msg = f'Grid cells need a DiceTable with a static dice expression, not {cell.expr!r}'
+            raise TypeError(msg)
+        self.width = width
+        self.height = height
+        self.cell = cell
+        self.smoothing = smoothing
+
+    def __str__(self) -> str:
+        return f'{self.width}x{self.height} of {self.cell!r}'
+
+    def __call__(self, parent: Any) -> TileMap:  # noqa: ANN401, D102
+        width = int(fields.resolve(parent, self.width))
+        height = int(fields.resolve(parent, self.height))
+        seed = parent.meta.random.getrandbits(64)
+        cell = self.cell
+        if isinstance(cell, Threshold):
+            palette = (*cell.values, cell.default)
+            cells = _threshold(cell.function(parent), cell.bounds, width, height)
+        else:
+            if isinstance(cell, fields.DiceTable):
+                palette, table = cast('tuple[Any, ...]', cell.rows), cast('AliasTable', cell.row_table)
+            elif isinstance(cell, fields.WeightedPickOne):
+                palette, table = cell.choices, cell.table
+            else:
+                palette = cell.choices
+                table = AliasTable([1] * len(palette))
+            cells = _sample(table, seed, width, height)
+        smooth = _smooth_numpy if fields.load_numpy() is not None else _smooth_array
+        for _ in range(self.smoothing):
+            cells = smooth(cells, len(palette), width, height)
+        return TileMap(width, height, tuple(palette), cells)
+
+
+def _typecode(size: int) -> str:
+    return 'B' if size <= 1 << 8 else 'H' if size <= 1 << 16 else 'L'
+
+
+def _sample(table: AliasTable, seed: int, width: int, height: int) -> Any:  # noqa: ANN401
+    np = fields.load_numpy()
+    if np is None:
+        return array(_typecode(len(table)), table.sample_many(random.Random(seed), width * height))  # noqa: S311
+    u = np.random.default_rng(seed).random((height, width)) * len(table)
+    index = u.astype(np.intp)
+    keep = u - index < np.asarray(table.probabilities)[index]
+    cells = np.where(keep, index, np.asarray(table.aliases)[index])
+    return cells.astype(np.dtype(_typecode(len(table))))
+
+
+def _threshold(function: Callable[[Any, Any], Any], bounds: tuple[float, ...], width: int, height: int) -> Any:  # noqa: ANN401
+    np = fields.load_numpy()
+    if np is None:
+        xs = [x for _ in range(height) for x in range(width)]
+        ys = [y for y in range(height) for _ in range(width)]
+        values = function(xs, ys)
+        return array(_typecode(len(bounds) + 1), (bisect.bisect_right(bounds, value) for value in values))
+    ys, xs = np.mgrid[0:height, 0:width]
+    values = np.asarray(function(xs.ravel(), ys.ravel())).reshape(height, width)
+    return np.searchsorted(np.asarray(bounds), values, side='right').astype(np.dtype(_typecode(len(bounds) + 1)))
+
+
+def _smooth_numpy(cells: Any, size: int, width: int, height: int) -> Any:  # noqa: ANN401
+    np = fields.load_numpy()
+    padded = np.pad(cells, 1, mode='edge')
+    windows = [padded[dy : dy + height, dx : dx + width] for dy in range(3) for dx in range(3)]
+    counts = np.zeros((size, height, width), dtype=np.uint8)
+    for tile in range(size):
+        for window in windows:
+            counts[tile] += window == tile
+    best = counts.argmax(axis=0)
+    own = np.take_along_axis(counts, cells[np.newaxis].astype(np.intp), axis=0)[0]
+    return np.where(own == counts.max(axis=0), cells, best).astype(cells.dtype)
+
+
+def _smooth_array(cells: array[int], size: int, width: int, height: int) -> array[int]:
+    smoothed = array(cells.typecode, cells)
+    for y in range(height):
+        rows = [max(y - 1, 0) * width, y * width, min(y + 1, height - 1) * width]
+        for x in range(width):
+            columns = (max(x - 1, 0), x, min(x + 1, width - 1))
+            counts = [0] * size
+            for row in rows:
+                for column in columns:
+                    counts[cells[row + column]] += 1
+            own = cells[y * width + x]
+            most = max(counts)
+            if counts[own] != most:
+                smoothed[y * width + x] = counts.index(most)
+    return smoothed
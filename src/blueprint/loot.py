@@ -0,0 +1,195 @@
+"""blueprint.loot -- loot tables flattened into a single weighted pick.
+
+A ``LootTable`` takes a tree of nested picks, e.g.::
+
+    LootTable(
+        PickOne(
+            WeightedPickOne({'copper': 7, 'silver': 3}),
+            PickFrom(WithTags('weapon')),
+            DiceTable('1d6', {'6': Gem}, default='nothing'),
+        )
+    )
+
+and computes the overall probability of each leaf of the tree up front.
+Resolving the table then picks a leaf with a single draw from an alias
+table, instead of walking the tree and drawing at every level. The leaf
+is resolved once picked, so leaves may be fields or blueprints.
+
+Example:
+    >>> import blueprint as bp
+    >>> drops = LootTable(bp.PickOne('sword', bp.WeightedPickOne({'potion': 3, 'scroll': 1})))
+    >>> print(drops.explain())
+     50.00%  'sword'
+     37.50%  'potion'
+     12.50%  'scroll'
+
+"""
+
+from __future__ import annotations
+
+import operator
+from typing import Any
+
+from blueprint import fields
+from blueprint.alias import AliasTable
+
+__all__ = ['LootTable']
+
+_Compiled = tuple[tuple[Any, ...], tuple[float, ...], AliasTable]
+
+
+class _NeedsParent(Exception):  # noqa: N818
+    """Raised when a tree queries tags, but there is no parent blueprint to query them from."""
+
+
+class LootTable(fields.Field):
+    """When resolved, returns a leaf of a tree of picks, drawn with a single random draw.
+
+    The tree's branches may be ``PickOne``, ``WeightedPickOne``, ``PickFrom``
+    over a ``WithTags`` query or a static list or tuple, and ``DiceTable``
+    over a static dice expression. Anything else is a leaf. Leaves reached
+    by more than one path have their probabilities summed.
+
+    Trees without tag queries are compiled once, when the table is created.
+    Trees with tag queries are compiled when first resolved, and again
+    whenever the tag repository changes.
+
+    Attributes:
+        tree: The tree of picks.
+
+    """
+
+    tree: Any
+    _static: _Compiled | None
+    _tagged: tuple[int, int, _Compiled] | None
+
+    def __init__(self, tree: Any) -> None:  # noqa: ANN401
+        """Compile the tree, unless it queries tags.
+
+        Args:
+            tree: The tree of picks.
+
+        Raises:
+            TypeError: If a branch cannot be compiled, e.g. a ``DiceTable``
+                over a dynamic dice expression.
+            IndexError: If a ``PickFrom`` branch has nothing to pick from.
+
+        """
+        self.tree = tree
+        self._tagged = None
+        try:
+            self._static = self._compile(None)
+        except _NeedsParent:
+            self._static = None
+
+    def __str__(self) -> str:
+        return str(self.tree)
+
+    def _compile(self, parent: Any) -> _Compiled:  # noqa: ANN401
+        found: dict[Any, list[Any]] = {}
+        _flatten(self.tree, 1.0, found, parent)
+        leaves = tuple(leaf for leaf, _ in found.values())
+        probabilities = tuple(probability for _, probability in found.values())
+        return leaves, probabilities, AliasTable(probabilities)
+
+    def compiled(self, parent: Any = None) -> _Compiled:  # noqa: ANN401
+        """Return the leaves, their probabilities and the alias table that picks between them.
+
+        Args:
+            parent: A blueprint to query tags from. Only needed for trees with tag queries.
+
+        Raises:
+            TypeError: If the tree queries tags and no parent is given.
+
+        """
+        if self._static is not None:
+            return self._static
+        if parent is None:
+            msg = 'LootTable needs a parent blueprint to compile tag queries'
+            raise TypeError(msg)
+        repo = parent.tag_repo
+        cached = self._tagged
+        if cached is not None and cached[:2] == (id(repo), repo.generation):
+            return cached[2]
+        compiled = self._compile(parent)
+        self._tagged = (id(repo), repo.generation, compiled)
+        return compiled
+
+    def probabilities(self, parent: Any = None) -> list[tuple[Any, float]]:  # noqa: ANN401
+        """Return each leaf with its probability, in order of first appearance in the tree."""
+        leaves, probabilities, _ = self.compiled(parent)
+        return list(zip(leaves, probabilities, strict=True))
+
+    def explain(self, parent: Any = None) -> str:  # noqa: ANN401
+        """Return a table of the leaf probabilities, most likely first."""
+        rows = sorted(self.probabilities(parent), key=operator.itemgetter(1), reverse=True)
+        return '\n'.join(f'{probability:7.2%}  {leaf!r}' for leaf, probability in rows)
+
+    def __call__(self, parent: Any) -> Any:  # noqa: ANN401, D102
+        leaves, _, table = self.compiled(parent)
+        return fields.resolve(parent, leaves[table.sample(parent.meta.random)])
+
+    def sample(self, parent: Any, n: int) -> list[Any]:  # noqa: ANN401
+        """Pick ``n`` leaves at once, as if by resolving the field ``n`` times.
+
+        Args:
+            parent: The parent blueprint, whose random number generator is used.
+            n: The number of leaves to pick.
+
+        Returns:
+            A list of ``n`` resolved leaves.
+
+        """
+        leaves, _, table = self.compiled(parent)
+        return [fields.resolve(parent, leaves[i]) for i in table.sample_many(parent.meta.random, n)]
+
+
+def _leaf_key(leaf: Any) -> Any:  # noqa: ANN401
+    """Return a key identifying equal hashable leaves, or the identity of an unhashable one."""
+    try:
+        hash(leaf)
+    except TypeError:
+        return ('id', id(leaf))
+    return (type(leaf), leaf)
+
+
+def _flatten(node: Any, probability: float, found: dict[Any, list[Any]], parent: Any) -> None:  # noqa: ANN401
+    """Add the probability of every leaf below ``node`` to ``found``, keyed by ``_leaf_key``."""
+    if isinstance(node, fields.WeightedPickOne):
+        total = sum(node.weights)
+        branches = [(choice, weight / total) for choice, weight in zip(node.choices, node.weights, strict=True)]
+    elif isinstance(node, fields.PickOne):
+        branches = [(choice, 1 / len(node.choices)) for choice in node.choices]
+    elif isinstance(node, fields.PickFrom):
+        candidates = _candidates(node, parent)
+        branches = [(choice, 1 / len(candidates)) for choice in candidates]
+    elif isinstance(node, fields.DiceTable):
+        if node.row_table is None:
+            msg = f'LootTable needs a DiceTable with a static dice expression, not {node.expr!r}'
+            raise TypeError(msg)
+        total = sum(node.row_table.weights)
+        branches = [(row, weight / total) for row, weight in zip(node.rows, node.row_table.weights, strict=True)]  # type: ignore[arg-type]
+    else:
+        entry = found.setdefault(_leaf_key(node), [node, 0.0])
+        entry[1] += probability
+        return
+    for child, share in branches:
+        if share:
+            _flatten(child, probability * share, found, parent)
+
+
+def _candidates(node: fields.PickFrom, parent: Any) -> tuple[Any, ...]:  # noqa: ANN401
+    collection = node.collection
+    if isinstance(collection, fields.WithTags):
+        if parent is None:
+            raise _NeedsParent
+        candidates = collection.results(parent)
+    elif isinstance(collection, (list, tuple)):
+        candidates = tuple(collection)
+    else:
+        msg = f'LootTable can only compile PickFrom over WithTags or a list or tuple, not {collection!r}'
+        raise TypeError(msg)
+    if not candidates:
+        msg = f'LootTable cannot pick from an empty collection: {collection!r}'
+        raise IndexError(msg)
+    return candidates
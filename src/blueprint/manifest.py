@@ -0,0 +1,279 @@
+"""blueprint.manifest -- persisted tag manifests for lazy blueprint libraries.
+
+Querying a tag repository normally requires every blueprint module to be
+imported, so that each class can register itself. For large libraries that
+import is the dominant startup cost. A manifest records, for every blueprint
+class, its qualified class path, its tags and its abstract flag. It is
+produced once by a build step that imports everything, and loaded later into
+a ``TagRepository`` as lightweight proxy entries. A proxy only imports its
+defining module when it is actually mastered.
+
+A build step might look like this::
+
+    from blueprint import manifest
+    from mygame.items import Item
+
+    manifest.write_manifest('blueprints.json', Item, 'mygame.weapons', 'mygame.armor')
+
+And a worker process would then do::
+
+    import blueprint
+    from blueprint import manifest
+
+    manifest.load_manifest('blueprints.json', blueprint.Blueprint.tag_repo)
+
+Tag queries (``WithTags``, ``TagRepository.query``) now see proxies, and
+mastering a proxy imports and masters the real blueprint class.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import operator
+import pathlib
+import types
+from typing import TYPE_CHECKING, Any
+
+from . import taggables
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping
+
+    from .base import Blueprint
+
+__all__ = ['BlueprintProxy', 'build_manifest', 'evict_proxies', 'load_manifest', 'write_manifest']
+
+MANIFEST_VERSION = 1
+
+
+class BlueprintProxy(taggables.Taggable):
+    """A stand-in for a blueprint class that has not been imported yet.
+
+    Proxies carry the tags and abstract flag recorded in the manifest, so
+    they can be queried exactly like the blueprint classes they represent.
+    Calling a proxy imports the defining module and masters the real class.
+
+    Attributes:
+        path: Qualified class path, in the form ``'package.module:QualName'``.
+        meta: Minimal metadata namespace exposing the ``abstract`` flag.
+
+    """
+
+    path: str
+    meta: types.SimpleNamespace
+    _blueprint: type[Blueprint] | None
+
+    def __init__(
+        self,
+        tag_repo: taggables.TagRepository | None,
+        path: str,
+        tags: set[str],
+        *,
+        abstract: bool = False,
+    ) -> None:
+        """Initialize a proxy for the blueprint class found at ``path``.
+
+        Args:
+            tag_repo: The tag repository to register this proxy with.
+            path: Qualified class path, in the form ``'package.module:QualName'``.
+            tags: The tags recorded for the blueprint class.
+            abstract: Whether the blueprint class is abstract.
+
+        """
+        self.path = path
+        self.meta = types.SimpleNamespace(abstract=abstract)
+        self._blueprint = None
+        super().__init__(tag_repo, *tags)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the proxy."""
+        return f'<BlueprintProxy: {self.path}>'
+
+    def __eq__(self, other: object) -> bool:
+        """Proxies are equal when they refer to the same class path."""
+        if not isinstance(other, BlueprintProxy):
+            return NotImplemented
+        return self.path == other.path
+
+    def __hash__(self) -> int:
+        """Return hash based on the class path."""
+        return hash(self.path)
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the real blueprint class has been imported yet."""
+        return self._blueprint is not None
+
+    def load(self) -> type[Blueprint]:
+        """Import and return the real blueprint class.
+
+        Once the defining module has been imported, the real class registers
+        itself with its own tag repository. If that is the repository this
+        proxy lives in, the proxy steps aside so that queries do not return
+        the same blueprint twice.
+
+        Returns:
+            The blueprint class found at ``path``.
+
+        """
+        if self._blueprint is None:
+            module_name, _, qualname = self.path.partition(':')
+            obj: Any = importlib.import_module(module_name)
+            for attr in qualname.split('.'):
+                obj = getattr(obj, attr)
+            cls: type[Blueprint] = obj
+            self.resolve_to(cls)
+            return cls
+        return self._blueprint
+
+    def resolve_to(self, cls: type[Blueprint]) -> None:
+        """Bind the proxy to its real blueprint class, stepping aside if they share a tag repository.
+
+        Args:
+            cls: The blueprint class found at ``path``.
+
+        """
+        self._blueprint = cls
+        if self.tag_repo is not None and cls.tag_repo is self.tag_repo:
+            self.tag_repo = None
+
+    def __call__(
+        self,
+        parent: Blueprint | None = None,
+        seed: str | float | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Blueprint:
+        """Master the real blueprint class, importing it first if necessary.
+
+        Args:
+            parent: Optional parent blueprint for nested blueprints.
+            seed: Optional seed for reproducible random generation.
+            **kwargs: Additional keyword arguments to override field values.
+
+        Returns:
+            A mastered instance of the real blueprint class.
+
+        """
+        return self.load()(parent=parent, seed=seed, **kwargs)
+
+
+def _class_path(cls: type[Any]) -> str:
+    return f'{cls.__module__}:{cls.__qualname__}'
+
+
+def evict_proxies(repo: taggables.TagRepository, cls: type[Blueprint]) -> None:
+    """Remove proxies for ``cls`` from ``repo``, now that the class itself is registered there.
+
+    This keeps a blueprint from being returned twice by tag queries when its
+    module is imported directly after a manifest was loaded.
+
+    Args:
+        repo: The repository the class has just been registered with.
+        cls: The blueprint class.
+
+    """
+    path = _class_path(cls)
+    # Every blueprint is tagged with its own class name, and so is its proxy.
+    for obj in list(repo.query_tag(cls.__name__)):
+        if isinstance(obj, BlueprintProxy) and obj.path == path:
+            obj.resolve_to(cls)
+
+
+def _walk_subclasses(cls: type[Blueprint]) -> Iterator[type[Blueprint]]:
+    seen: set[type[Blueprint]] = set()
+    stack = [cls]
+    while stack:
+        current = stack.pop()
+        for sub in current.__subclasses__():
+            if sub not in seen:
+                seen.add(sub)
+                stack.append(sub)
+                yield sub
+
+
+def build_manifest(root: type[Blueprint], *modules: str) -> dict[str, Any]:
+    """Import the given modules and describe every blueprint descending from ``root``.
+
+    Blueprint classes that cannot be imported by name (for instance, classes
+    defined inside functions) are left out of the manifest.
+
+    Args:
+        root: The blueprint class whose descendants should be recorded.
+        *modules: Names of modules to import before collecting blueprints.
+
+    Returns:
+        A JSON-serialisable manifest.
+
+    """
+    for name in modules:
+        importlib.import_module(name)
+
+    entries = [
+        {'path': _class_path(cls), 'tags': sorted(cls.tags), 'abstract': bool(cls.meta.abstract)}
+        for cls in _walk_subclasses(root)
+        if isinstance(cls.tags, set) and '<locals>' not in cls.__qualname__
+    ]
+    entries.sort(key=operator.itemgetter('path'))
+    return {'version': MANIFEST_VERSION, 'root': _class_path(root), 'blueprints': entries}
+
+
+def write_manifest(path: str | pathlib.Path, root: type[Blueprint], *modules: str) -> dict[str, Any]:
+    """Build a manifest and write it to ``path`` as JSON.
+
+    Args:
+        path: Destination file.
+        root: The blueprint class whose descendants should be recorded.
+        *modules: Names of modules to import before collecting blueprints.
+
+    Returns:
+        The manifest that was written.
+
+    """
+    manifest = build_manifest(root, *modules)
+    pathlib.Path(path).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    return manifest
+
+
+def load_manifest(
+    manifest: str | pathlib.Path | Mapping[str, Any],
+    repo: taggables.TagRepository | None = None,
+) -> taggables.TagRepository:
+    """Populate a tag repository with proxies for the blueprints in a manifest.
+
+    As with blueprint classes themselves, abstract entries are not registered.
+    Neither are entries whose class has already been imported and registered
+    with ``repo``, so that tag queries do not return it twice.
+
+    Args:
+        manifest: A manifest mapping, or the path to a JSON manifest file.
+        repo: The repository to populate. A new one is created if omitted.
+
+    Returns:
+        The populated tag repository.
+
+    Raises:
+        ValueError: If the manifest was written in an unsupported format.
+
+    """
+    data: Mapping[str, Any]
+    if isinstance(manifest, (str, pathlib.PurePath)):
+        data = json.loads(pathlib.Path(manifest).read_text(encoding='utf-8'))
+    else:
+        data = manifest
+    if data.get('version') != MANIFEST_VERSION:
+        msg = f'Unsupported blueprint manifest version: {data.get("version")!r}'
+        raise ValueError(msg)
+
+    if repo is None:
+        repo = taggables.TagRepository()
+    for entry in data['blueprints']:
+        if not entry['abstract'] and not _registered(repo, entry['path']):
+            BlueprintProxy(repo, entry['path'], set(entry['tags']))
+    return repo
+
+
+def _registered(repo: taggables.TagRepository, path: str) -> bool:
+    # Every blueprint is tagged with its own class name.
+    name = path.rpartition('.')[2].rpartition(':')[2]
+    return any(isinstance(obj, type) and _class_path(obj) == path for obj in repo.tag_objs.get(name, ()))
@@ -0,0 +1,255 @@
+"""blueprint.outcomes -- exact outcome distributions for blueprint fields.
+
+Balancing usually means mastering a blueprint many thousands of times and
+counting what comes out. For fields built from finite-domain pieces (static
+values, ``RandomInt``, ``PickOne``, ``WeightedPickOne``, static ``DiceTable``
+rolls and operator trees over them) the distribution can be computed exactly
+instead. Any field that cannot be analysed falls back to sampling.
+
+Example:
+    >>> import blueprint as bp
+    >>> class Chest(bp.Blueprint):
+    ...     lock = bp.PickOne('none', 'simple', 'simple', 'magic')
+    ...     gold = bp.RandomInt(1, 3) * 10
+    >>> outcomes = Chest.enumerate_outcomes()
+    >>> outcomes.marginals['lock']
+    {'none': Fraction(1, 4), 'simple': Fraction(1, 2), 'magic': Fraction(1, 4)}
+    >>> outcomes.marginals['gold']
+    {10: Fraction(1, 3), 20: Fraction(1, 3), 30: Fraction(1, 3)}
+    >>> sorted(outcomes.exact)
+    ['gold', 'lock']
+
+"""
+
+from __future__ import annotations
+
+import collections
+from fractions import Fraction
+from typing import TYPE_CHECKING, Any
+
+from . import dice, fields
+from .base import Blueprint
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+__all__ = ['Outcomes', 'analyse', 'enumerate_outcomes']
+
+Distribution = dict[Any, Fraction]
+
+
+class Outcomes:
+    """Outcome distributions computed for a blueprint's fields.
+
+    Attributes:
+        marginals: For each field, a mapping of value to probability. Exact
+            probabilities are ``Fraction`` instances; sampled frequencies are floats.
+        joint: If requested, a mapping of value tuples (ordered as ``joint_fields``)
+            to probabilities.
+        joint_fields: The field names, in the order used by ``joint``'s keys.
+        exact: Names of fields whose distributions were computed analytically.
+        sampled: Names of fields whose distributions were estimated by sampling.
+
+    """
+
+    marginals: dict[str, dict[Any, Fraction | float]]
+    joint: dict[tuple[Any, ...], Fraction | float] | None
+    joint_fields: tuple[str, ...]
+    exact: frozenset[str]
+    sampled: frozenset[str]
+
+    def __init__(
+        self,
+        marginals: dict[str, dict[Any, Fraction | float]],
+        joint: dict[tuple[Any, ...], Fraction | float] | None,
+        joint_fields: tuple[str, ...],
+        exact: frozenset[str],
+        sampled: frozenset[str],
+    ) -> None:
+        self.marginals = marginals
+        self.joint = joint
+        self.joint_fields = joint_fields
+        self.exact = exact
+        self.sampled = sampled
+
+    def __repr__(self) -> str:
+        return f'<Outcomes: exact={sorted(self.exact)} sampled={sorted(self.sampled)}>'
+
+
+def _mix(parts: Iterable[tuple[Fraction, Distribution | None]]) -> Distribution | None:
+    mixed: Distribution = {}
+    for weight, dist in parts:
+        if dist is None:
+            return None
+        for value, p in dist.items():
+            mixed[value] = mixed.get(value, Fraction(0)) + weight * p
+    return mixed
+
+
+def _combine(op: Any, a: Distribution, b: Distribution, max_states: int) -> Distribution | None:  # noqa: ANN401
+    if len(a) * len(b) > max_states:
+        return None
+    combined: Distribution = {}
+    for x, px in a.items():
+        for y, py in b.items():
+            value = op(x, y)
+            combined[value] = combined.get(value, Fraction(0)) + px * py
+    return combined
+
+
+def analyse(field: Any, max_states: int = 100_000) -> Distribution | None:  # noqa: ANN401
+    """Compute the exact distribution of values a field resolves to, if possible.
+
+    Args:
+        field: A static value or field definition.
+        max_states: Give up on any intermediate distribution larger than this.
+
+    Returns:
+        A mapping of value to exact probability, or None if the field cannot
+        be analysed (or its state space exceeds ``max_states``).
+
+    """
+    try:
+        return _analyse(field, max_states)
+    except (TypeError, ZeroDivisionError):
+        # Unhashable values, or operators that fail for some combination.
+        return None
+
+
+def _analyse(field: Any, max_states: int) -> Distribution | None:  # noqa: ANN401, PLR0911
+    if not callable(field) and not hasattr(type(field), '__get__'):
+        return {field: Fraction(1)}
+    if isinstance(field, fields.RandomInt):
+        count = field.end - field.start + 1
+        if count > max_states:
+            return None
+        return {n: Fraction(1, count) for n in range(field.start, field.end + 1)}
+    if isinstance(field, fields.PickOne):
+        weight = Fraction(1, len(field.choices))
+        return _mix((weight, _analyse(choice, max_states)) for choice in field.choices)
+    if isinstance(field, fields.WeightedPickOne):
+        weight_total = sum(Fraction(weight) for weight in field.weights)
+        parts = zip(field.weights, field.choices, strict=True)
+        return _mix((Fraction(weight) / weight_total, _analyse(choice, max_states)) for weight, choice in parts)
+    if isinstance(field, fields.DiceTable):
+        counts = dice.distribution(field.expr, limit=max_states)
+        if counts is None:
+            return None
+        total = sum(counts.values())
+        return _mix((Fraction(ways, total), _analyse(field.lookup(n), max_states)) for n, ways in counts.items())
+    if isinstance(field, fields.Negative):
+        dist = _analyse(field.items[0], max_states)
+        return None if dist is None else {-value: p for value, p in dist.items()}
+    if isinstance(field, fields._Operator) and field.op is not None:  # noqa: SLF001
+        return _fold(field.op, field.items, max_states)
+    return None
+
+
+def _fold(op: Any, items: tuple[Any, ...], max_states: int) -> Distribution | None:  # noqa: ANN401
+    result: Distribution | None = None
+    for item in items:
+        dist = _analyse(item, max_states)
+        if dist is None:
+            return None
+        result = dist if result is None else _combine(op, result, dist, max_states)
+        if result is None:
+            return None
+    return result
+
+
+def _product(dists: list[Distribution], max_states: int) -> dict[tuple[Any, ...], Fraction | float]:
+    size = 1
+    for dist in dists:
+        size *= len(dist)
+    if size > max_states:
+        msg = f'Joint distribution of {len(dists)} fields has {size} states, more than max_states={max_states}'
+        raise ValueError(msg)
+    product: dict[tuple[Any, ...], Fraction | float] = {(): Fraction(1)}
+    for dist in dists:
+        product = {(*key, value): p * q for key, p in product.items() for value, q in dist.items()}
+    return product
+
+
+def _outcome_key(value: Any) -> Any:  # noqa: ANN401
+    if isinstance(value, Blueprint):
+        return type(value)
+    if isinstance(value, dice.results):
+        return int(value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def enumerate_outcomes(
+    blueprint: type[Blueprint],
+    names: Iterable[str] | None = None,
+    *,
+    joint: bool = False,
+    max_states: int = 100_000,
+    samples: int = 10_000,
+    seed: str = 'outcomes',
+) -> Outcomes:
+    """Compute outcome distributions for a blueprint's fields.
+
+    Fields that can be analysed get exact distributions. The remaining fields
+    are estimated by mastering the blueprint ``samples`` times. Mastered
+    blueprint values are counted by class, and dice results by their total.
+
+    Exactly analysed fields draw their randomness independently, so their
+    joint distribution is the product of their marginals. If a joint
+    distribution is requested and any field has to be sampled, the whole
+    joint distribution is sampled instead.
+
+    Args:
+        blueprint: The Blueprint class to analyse.
+        names: Field names to include. Defaults to all fields.
+        joint: Whether to compute the joint distribution as well.
+        max_states: The maximum state-space size for any single exact
+            distribution, including the joint distribution.
+        samples: How many blueprints to master when sampling is needed.
+        seed: Base seed for sampling; sample ``i`` uses ``f'{seed}{i}'``.
+
+    Returns:
+        The computed ``Outcomes``.
+
+    Raises:
+        ValueError: If an exact joint distribution would exceed ``max_states``.
+
+    """
+    wanted = sorted(blueprint.meta.fields if names is None else names)
+    marginals: dict[str, dict[Any, Fraction | float]] = {}
+    exact: dict[str, Distribution] = {}
+    for name in wanted:
+        dist = analyse(getattr(blueprint, name), max_states)
+        if dist is not None:
+            exact[name] = dist
+    sampled = [name for name in wanted if name not in exact]
+
+    joint_dist: dict[tuple[Any, ...], Fraction | float] | None = None
+    if sampled:
+        columns = wanted if joint else sampled
+        rows = [
+            tuple(_outcome_key(getattr(instance, name)) for name in columns)
+            for instance in (blueprint(seed=f'{seed}{i}') for i in range(samples))
+        ]
+        for index, name in enumerate(columns):
+            if name not in exact:
+                counter = collections.Counter(row[index] for row in rows)
+                marginals[name] = {value: count / samples for value, count in counter.items()}
+        if joint:
+            joint_dist = {row: count / samples for row, count in collections.Counter(rows).items()}
+    elif joint:
+        joint_dist = _product([exact[name] for name in wanted], max_states)
+
+    for name in wanted:
+        if name in exact:
+            marginals[name] = dict(exact[name])
+    return Outcomes(
+        {name: marginals[name] for name in wanted},
+        joint_dist,
+        tuple(wanted) if joint else (),
+        frozenset(exact),
+        frozenset(sampled),
+    )
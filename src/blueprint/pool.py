@@ -0,0 +1,179 @@
+"""blueprint.pool -- recycling pools for short-lived mastered blueprints.
+
+Simulations that master and discard huge numbers of transient blueprints
+(per-tick encounter rolls, say) spend much of their time allocating
+instances, ``Meta`` objects and random number generators, only for the
+garbage collector to reclaim them moments later. A ``BlueprintPool`` keeps
+released instances and re-masters them in place instead.
+
+Example:
+    >>> import blueprint as bp
+    >>> class Encounter(bp.Blueprint):
+    ...     monsters = bp.RandomInt(1, 6)
+    >>> with Encounter.pool(4) as p:
+    ...     first = p.master(seed='tick-1')
+    ...     monsters = first.monsters
+    ...     p.release(first)
+    ...     second = p.master(seed='tick-1')
+    >>> second is first
+    True
+    >>> second.monsters == monsters
+    True
+
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from types import TracebackType
+    from typing import Self
+
+    from .base import Blueprint
+
+__all__ = ['BlueprintPool', 'ReleasedBlueprintError']
+
+
+class ReleasedBlueprintError(RuntimeError):
+    """Raised when a blueprint is used after being released to its pool."""
+
+
+class _ReleasedBlueprint:
+    """Stand-in class given to released instances while a pool is in debug mode."""
+
+    def __getattribute__(self, name: str) -> Any:  # noqa: ANN401
+        msg = f'Attempted to access {name!r} on a blueprint that has been released to its pool.'
+        raise ReleasedBlueprintError(msg)
+
+    def __setattr__(self, name: str, value: Any) -> None:  # noqa: ANN401
+        msg = f'Attempted to set {name!r} on a blueprint that has been released to its pool.'
+        raise ReleasedBlueprintError(msg)
+
+    def __repr__(self) -> str:
+        return '<released blueprint>'
+
+
+class BlueprintPool:
+    """A bounded pool of recyclable mastered blueprint instances.
+
+    ``master()`` takes an instance from the pool if one is available,
+    re-mastering it in place with a fresh seed, and otherwise masters a new
+    one. ``release()`` hands an instance back. Released instances must not be
+    used again; in debug mode, any attribute access on a released instance
+    raises ``ReleasedBlueprintError``.
+
+    Recycled instances keep their custom ``Meta`` options as they were, rather
+    than copying them again from the class.
+
+    Attributes:
+        blueprint: The Blueprint class being pooled.
+        size: The maximum number of released instances kept for reuse.
+        debug: Whether use-after-release detection is enabled.
+
+    """
+
+    blueprint: type[Blueprint]
+    size: int
+    debug: bool
+    _free: list[Blueprint]
+
+    def __init__(self, blueprint: type[Blueprint], size: int, *, debug: bool = False) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            blueprint: The Blueprint class to pool.
+            size: The maximum number of released instances kept for reuse.
+            debug: If True, released instances raise ``ReleasedBlueprintError`` when used.
+
+        Raises:
+            TypeError: If ``blueprint`` overrides ``__new__`` (as ``Mod`` and
+                ``Factory`` do), since such classes do not master themselves.
+
+        """
+        if blueprint.__new__ is not object.__new__:
+            msg = f'{blueprint.__name__} overrides __new__ and cannot be pooled.'
+            raise TypeError(msg)
+        self.blueprint = blueprint
+        self.size = size
+        self.debug = debug
+        self._free = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of released instances available for reuse."""
+        return len(self._free)
+
+    def master(
+        self,
+        seed: str | float | None = None,
+        parent: Blueprint | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Blueprint:
+        """Return a mastered blueprint, recycling a released instance if possible.
+
+        Args:
+            seed: Optional seed for reproducible random generation.
+            parent: Optional parent blueprint for nested blueprints.
+            **kwargs: Additional keyword arguments to override field values.
+
+        Returns:
+            A mastered blueprint, as if by ``blueprint(parent=parent, seed=seed, **kwargs)``.
+
+        """
+        if not self._free:
+            return self.blueprint(parent=parent, seed=seed, **kwargs)
+
+        instance = self._free.pop()
+        if self.debug:
+            object.__setattr__(instance, '__class__', self.blueprint)
+
+        state = instance.__dict__
+        meta = state['meta']
+        state.clear()
+        state['meta'] = meta
+        meta.parent = self.blueprint.meta.parent
+        meta.source = self.blueprint.meta.source
+        meta.cache.clear()
+        instance._master(parent, seed, kwargs)  # noqa: SLF001
+        return instance
+
+    def release(self, *instances: Blueprint) -> None:
+        """Return instances to the pool. They must not be used afterwards.
+
+        Instances beyond the pool's ``size`` are simply dropped.
+
+        Args:
+            *instances: Instances previously returned by ``master()``.
+
+        Raises:
+            ReleasedBlueprintError: In debug mode, if an instance has already been released.
+            TypeError: If an instance is not of the pooled blueprint class.
+
+        """
+        for instance in instances:
+            cls: type[Any] = type(instance)
+            if cls is _ReleasedBlueprint:
+                msg = 'Blueprint released to its pool more than once.'
+                raise ReleasedBlueprintError(msg)
+            if cls is not self.blueprint:
+                msg = f'Cannot release {cls.__name__} instances to a {self.blueprint.__name__} pool.'
+                raise TypeError(msg)
+            if self.debug:
+                object.__setattr__(instance, '__class__', _ReleasedBlueprint)
+            if len(self._free) < self.size:
+                self._free.append(instance)
+
+    def close(self) -> None:
+        """Drop all released instances held by the pool."""
+        self._free.clear()
@@ -0,0 +1,274 @@
+"""blueprint.prefetch -- pools of blueprints mastered ahead of time.
+
+Latency-critical code ("give me a random loot drop, now") should not pay for
+mastering on the request path. A ``ReadyPool`` keeps a bounded buffer of
+already-mastered blueprints, refilled by background threads, so that
+``get()`` usually just pops a finished instance.
+
+Example:
+    >>> import blueprint as bp
+    >>> class Loot(bp.Blueprint):
+    ...     gold = bp.RandomInt(1, 100)
+    >>> with ReadyPool(Loot, size=8) as pool:
+    ...     _ = pool.fill(timeout=5)
+    ...     loot = pool.get()
+    >>> 1 <= loot.gold <= 100
+    True
+
+"""
+
+from __future__ import annotations
+
+import collections
+import threading
+import time
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .collection import BlueprintCollection
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+    from typing import Self
+
+    from .base import Blueprint
+
+__all__ = ['ReadyPool']
+
+# Number of recent refills used to estimate the refill rate.
+RATE_WINDOW = 64
+
+
+class _Failure(NamedTuple):
+    """An exception raised by the source, buffered in place of the instance it failed to produce."""
+
+    error: Exception
+
+
+class ReadyPool:
+    """A bounded buffer of mastered blueprints, kept full by background threads.
+
+    The source may be a Blueprint class, a Factory class, a
+    ``BlueprintCollection`` or any callable that returns a mastered
+    blueprint. Instances are served in the order they were requested from
+    the source, however many workers master them, so a collection is
+    served as ``collection[0]``, ``collection[1]``, and so on.
+
+    ``get()`` returns a prefetched instance in O(1) when one is available.
+    When the buffer is empty, it waits for the next instance if a worker is
+    already mastering it, and otherwise masters one inline. Exceptions
+    raised by the source in a worker are re-raised by ``get()`` in place of
+    the instance that failed, or by ``fill()``.
+
+    Attributes:
+        size: The maximum number of prefetched instances.
+        workers: The number of background refill threads.
+        hits: Number of ``get()`` calls served from the buffer.
+        misses: Number of ``get()`` calls that mastered inline.
+        produced: Number of instances mastered by the background threads.
+
+    """
+
+    size: int
+    workers: int
+    hits: int
+    misses: int
+    produced: int
+    _produce: Callable[[int], Any]
+    _buffer: collections.deque[Any]
+    _done: dict[int, Any]
+    _claimed: int
+    _next: int
+    _failures: int
+    _refills: collections.deque[float]
+    _condition: threading.Condition
+    _stopped: bool
+    _threads: list[threading.Thread]
+
+    def __init__(
+        self,
+        source: type[Blueprint] | BlueprintCollection | Callable[[], Any],
+        size: int = 64,
+        workers: int = 1,
+        *,
+        start: bool = True,
+    ) -> None:
+        """Initialize the pool, and start refilling it unless ``start`` is False.
+
+        Args:
+            source: A Blueprint class, Factory class, BlueprintCollection or
+                zero-argument callable producing mastered blueprints.
+            size: The maximum number of prefetched instances.
+            workers: The number of background refill threads.
+            start: Whether to start the background threads immediately.
+
+        """
+        if isinstance(source, BlueprintCollection):
+            self._produce = source.__getitem__
+        else:
+            self._produce = lambda _: source()
+        self.size = size
+        self.workers = workers
+        self.hits = 0
+        self.misses = 0
+        self.produced = 0
+        # Instances are numbered in the order they are claimed. Workers may
+        # finish out of order, so finished instances wait in ``_done`` until
+        # every earlier one has reached the buffer.
+        self._buffer = collections.deque()
+        self._done = {}
+        self._claimed = 0
+        self._next = 0
+        self._failures = 0
+        self._refills = collections.deque(maxlen=RATE_WINDOW)
+        self._condition = threading.Condition()
+        self._stopped = True
+        self._threads = []
+        if start:
+            self.start()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of prefetched instances currently buffered."""
+        return len(self._buffer)
+
+    @property
+    def fill_level(self) -> float:
+        """The fraction of the buffer currently holding prefetched instances."""
+        return len(self._buffer) / self.size if self.size else 0.0
+
+    @property
+    def refill_rate(self) -> float:
+        """Instances mastered per second by the background threads, over recent refills."""
+        refills = tuple(self._refills)
+        if len(refills) < 2 or refills[-1] == refills[0]:  # noqa: PLR2004
+            return 0.0
+        return (len(refills) - 1) / (refills[-1] - refills[0])
+
+    def metrics(self) -> dict[str, float]:
+        """Return a snapshot of the pool's metrics.
+
+        Returns:
+            A mapping with ``fill_level``, ``refill_rate``, ``hits``, ``misses``
+            and ``produced``.
+
+        """
+        return {
+            'fill_level': self.fill_level,
+            'refill_rate': self.refill_rate,
+            'hits': self.hits,
+            'misses': self.misses,
+            'produced': self.produced,
+        }
+
+    def get(self) -> Any:  # noqa: ANN401
+        """Return a mastered blueprint, from the buffer if possible.
+
+        Returns:
+            A prefetched instance, or one mastered inline if the buffer is
+            empty and no worker is mastering the next one.
+
+        Raises:
+            Exception: Whatever the source raised while mastering this instance.
+
+        """
+        with self._condition:
+            while not self._buffer and self._claimed > self._next:
+                # A worker is mastering the next instance: wait for it rather than serve out of order.
+                self._condition.wait()
+            if not self._buffer:
+                index = self._claimed
+                self._claimed += 1
+                self._next += 1
+                self.misses += 1
+            else:
+                item = self._buffer.popleft()
+                self.hits += 1
+                self._condition.notify_all()
+                if isinstance(item, _Failure):
+                    self._failures -= 1
+                    raise item.error
+                return item
+        return self._produce(index)
+
+    def fill(self, timeout: float | None = None) -> bool:
+        """Block until the buffer is full.
+
+        Args:
+            timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            True if the buffer filled up, False if the timeout expired first.
+
+        Raises:
+            Exception: Whatever the source raised in a worker, which is
+                removed from the buffer so that it is only raised once.
+
+        """
+        with self._condition:
+            filled = self._condition.wait_for(lambda: self._failures or len(self._buffer) >= self.size, timeout)
+            if not self._failures:
+                return bool(filled)
+            failure = next(item for item in self._buffer if isinstance(item, _Failure))
+            self._buffer.remove(failure)
+            self._failures -= 1
+            self._condition.notify_all()
+        raise failure.error
+
+    def start(self) -> None:
+        """Start the background refill threads, if they are not already running."""
+        with self._condition:
+            if not self._stopped:
+                return
+            self._stopped = False
+        self._threads = [
+            threading.Thread(target=self._refill, name=f'ReadyPool-{i}', daemon=True) for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def close(self) -> None:
+        """Stop the background refill threads and wait for them to finish."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _refill(self) -> None:
+        condition = self._condition
+        buffer = self._buffer
+        done = self._done
+        while True:
+            with condition:
+                # Claimed instances still being mastered count towards the size.
+                condition.wait_for(lambda: self._stopped or len(buffer) + self._claimed - self._next < self.size)
+                if self._stopped:
+                    return
+                index = self._claimed
+                self._claimed += 1
+            try:
+                item = self._produce(index)
+            except Exception as exc:  # noqa: BLE001
+                item = _Failure(exc)
+            with condition:
+                done[index] = item
+                while self._next in done:
+                    ready = done.pop(self._next)
+                    self._failures += isinstance(ready, _Failure)
+                    buffer.append(ready)
+                    self._next += 1
+                self.produced += 1
+                self._refills.append(time.monotonic())
+                condition.notify_all()
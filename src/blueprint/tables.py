@@ -0,0 +1,277 @@
+"""blueprint.tables -- memory-mapped weighted word lists.
+
+Word lists with millions of entries are expensive to hold as Python lists
+in every worker process. A table file stores them compactly instead, and
+is memory-mapped, so all processes share one copy in the page cache and
+nothing is decoded until it is picked.
+
+A table file, in native byte order, holds:
+
+- a header: magic bytes, entry count, flags and total weight;
+- ``count + 1`` unsigned 64-bit offsets into the blob;
+- ``count`` cumulative 64-bit float weights, unless all weights are equal;
+- a blob of the UTF-8 encoded entries, back to back.
+
+Example:
+    >>> import blueprint as bp, tempfile, os
+    >>> path = os.path.join(tempfile.mkdtemp(), 'names.table')
+    >>> write_table([('Alaric', 3), ('Brunhild', 1)], path)
+    2
+    >>> class Hero(bp.Blueprint):
+    ...     name = TableField(path)
+    >>> Hero().name in {'Alaric', 'Brunhild'}
+    True
+
+"""
+
+from __future__ import annotations
+
+import bisect
+import csv
+import mmap
+import os
+import pathlib
+import struct
+from array import array
+from typing import TYPE_CHECKING, Any, Protocol
+
+from blueprint import fields
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from types import TracebackType
+    from typing import Self
+
+__all__ = ['Table', 'TableField', 'convert', 'read_entries', 'write_table']
+
+MAGIC = b'BPTABLE1'
+
+# Magic, entry count, flags and total weight.
+_HEADER = struct.Struct('=8sQQd')
+
+# Flag set when every entry has the same weight, and no cumulative weights are stored.
+_UNIFORM = 1
+
+
+class _Random(Protocol):
+    def random(self) -> float: ...
+
+
+def write_table(entries: Iterable[str | tuple[str, float]], path: str | os.PathLike[str]) -> int:
+    """Write entries to a table file.
+
+    Args:
+        entries: Strings, or ``(string, weight)`` pairs. Strings have weight 1.
+        path: The table file to write.
+
+    Returns:
+        The number of entries written.
+
+    Raises:
+        ValueError: If there are no entries, any weight is negative, or all
+            weights are zero.
+
+    """
+    offsets = array('Q', [0])
+    cumulative = array('d')
+    blob = bytearray()
+    total = 0.0
+    weights: set[float] = set()
+    for entry in entries:
+        text, weight = (entry, 1.0) if isinstance(entry, str) else entry
+        if weight < 0:
+            msg = f'Table weights must be non-negative, not {weight!r} for {text!r}'
+            raise ValueError(msg)
+        blob += text.encode('utf-8')
+        offsets.append(len(blob))
+        total += weight
+        cumulative.append(total)
+        if len(weights) < 2:  # noqa: PLR2004
+            weights.add(weight)
+    count = len(cumulative)
+    if not count or total <= 0:
+        msg = 'Tables need at least one entry with a positive weight'
+        raise ValueError(msg)
+
+    flags = _UNIFORM if len(weights) == 1 else 0
+    with pathlib.Path(path).open('wb') as f:
+        f.write(_HEADER.pack(MAGIC, count, flags, total))
+        offsets.tofile(f)
+        if not flags & _UNIFORM:
+            cumulative.tofile(f)
+        f.write(blob)
+    return count
+
+
+def read_entries(path: str | os.PathLike[str]) -> Iterator[tuple[str, float]]:
+    """Read weighted entries from a CSV or text file.
+
+    CSV files (``*.csv``) have the entry in the first column and an optional
+    weight in the second. Other files have one entry per line, optionally
+    followed by a tab and a weight. Blank lines are skipped.
+
+    Args:
+        path: The file to read.
+
+    Yields:
+        ``(entry, weight)`` pairs.
+
+    """
+    path = pathlib.Path(path)
+    with path.open(encoding='utf-8', newline='') as f:
+        if path.suffix.lower() == '.csv':
+            rows: Iterable[list[str]] = csv.reader(f)
+        else:
+            rows = (line.rstrip('\r\n').split('\t') for line in f)
+        for row in rows:
+            if row and row[0]:
+                yield row[0], float(row[1]) if len(row) > 1 and row[1] else 1.0
+
+
+def convert(source: str | os.PathLike[str], path: str | os.PathLike[str]) -> int:
+    """Convert a CSV or text word list into a table file.
+
+    Args:
+        source: The CSV or text file to read; see ``read_entries``.
+        path: The table file to write.
+
+    Returns:
+        The number of entries written.
+
+    """
+    return write_table(read_entries(source), path)
+
+
+class Table:
+    """A read-only, memory-mapped table file.
+
+    Entries are decoded only when accessed. Uniform tables are picked from in
+    O(1), and weighted tables in O(log n) by bisecting the cumulative weights.
+
+    Attributes:
+        path: The table file.
+        total: The sum of all weights.
+
+    """
+
+    path: str
+    total: float
+    _mmap: mmap.mmap
+    _offsets: memoryview[int]
+    _cumulative: memoryview[float] | None
+    _last: int
+    _blob: memoryview[int]
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Map a table file into memory.
+
+        Args:
+            path: The table file, as written by ``write_table``.
+
+        Raises:
+            ValueError: If the file is not a table file.
+
+        """
+        self.path = os.fspath(path)
+        with pathlib.Path(path).open('rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < _HEADER.size or self._mmap[: len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            msg = f'{self.path} is not a blueprint table file'
+            raise ValueError(msg)
+
+        _, count, flags, self.total = _HEADER.unpack_from(self._mmap)
+        view = memoryview(self._mmap)
+        start = _HEADER.size
+        end = start + 8 * (count + 1)
+        self._offsets = view[start:end].cast('Q')
+        if flags & _UNIFORM:
+            self._cumulative = None
+            self._last = count - 1
+        else:
+            start, end = end, end + 8 * count
+            self._cumulative = view[start:end].cast('d')
+            # The last entry with a positive weight, which picks are clamped to.
+            self._last = bisect.bisect_left(self._cumulative, self.total)
+        self._blob = view[end:]
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            msg = 'table index out of range'
+            raise IndexError(msg)
+        offsets = self._offsets
+        return str(self._blob[offsets[index] : offsets[index + 1]], 'utf-8')
+
+    def __repr__(self) -> str:
+        return f'<Table: {self.path} ({len(self)} entries)>'
+
+    def pick(self, random: _Random) -> str:
+        """Pick a weighted entry.
+
+        Args:
+            random: A random number generator, e.g. ``parent.meta.random``.
+
+        Returns:
+            The picked entry.
+
+        """
+        # Float rounding can land one past the end, so clamp to the last pickable entry.
+        if self._cumulative is None:
+            return self[min(int(random.random() * len(self)), self._last)]
+        return self[min(bisect.bisect_right(self._cumulative, random.random() * self.total), self._last)]
+
+    def close(self) -> None:
+        """Release the memory map."""
+        for view in (self._offsets, self._cumulative, self._blob):
+            if view is not None:
+                view.release()
+        self._mmap.close()
+
+
+class TableField(fields.Field):
+    """When resolved, returns a weighted pick from a memory-mapped table file.
+
+    The file is mapped the first time the field is resolved in each process.
+    Build table files with ``write_table`` or ``convert``.
+    """
+
+    path: str
+    _table: Table | None
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        self._table = None
+
+    def __str__(self) -> str:
+        return self.path
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Memory maps cannot be copied or pickled; the copy maps the file again.
+        return {**self.__dict__, '_table': None}
+
+    @property
+    def table(self) -> Table:
+        """The memory-mapped table."""
+        if self._table is None:
+            self._table = Table(self.path)
+        return self._table
+
+    def __call__(self, parent: Any) -> str:  # noqa: ANN401, D102
+        return self.table.pick(parent.meta.random)
@@ -6,14 +6,17 @@ import contextlib
 import functools
 import itertools
 import operator
+import threading
 import time
-from collections import defaultdict
-from typing import TYPE_CHECKING, Protocol
+from collections import OrderedDict, defaultdict
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator
+    from collections.abc import Callable, Hashable, Iterable, Iterator
 
-__all__ = ['AbstractTagSet', 'TagRepository', 'TagSet', 'Taggable', 'TaggableClass', 'resolve_tags']
+__all__ = ['AbstractTagSet', 'QueryCache', 'TagRepository', 'TagSet', 'Taggable', 'TaggableClass', 'resolve_tags']
+
+T = TypeVar('T')
 
 
 class TaggableProtocol(Protocol):
@@ -355,10 +358,101 @@ class TaggableClass:
         cls.tag_repo.untag_object(cls, *tags)  # type: ignore[arg-type]
 
 
+class QueryCache:
+    """A bounded LRU cache of query results for a single repository generation.
+
+    Results are only valid for the repository generation they were computed
+    at; looking up any other generation empties the cache.
+
+    Attributes:
+        maxsize: The maximum number of cached results.
+        generation: The repository generation the cached results belong to.
+        hits: Number of lookups answered from the cache.
+        misses: Number of lookups that had to compute their result.
+
+    """
+
+    maxsize: int
+    generation: int
+    hits: int
+    misses: int
+    _entries: OrderedDict[Hashable, Any]
+    _lock: threading.Lock
+
+    def __init__(self, maxsize: int = 256) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: The maximum number of cached results.
+
+        """
+        self.maxsize = maxsize
+        self.generation = -1
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, generation: int, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return the cached result for ``key``, computing and caching it on a miss.
+
+        Args:
+            generation: The repository's current generation.
+            key: A hashable description of the query.
+            compute: Called with no arguments to compute the result on a miss.
+
+        Returns:
+            The cached or newly computed result.
+
+        """
+        with self._lock:
+            if generation != self.generation:
+                self._entries.clear()
+                self.generation = generation
+            elif key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]  # type: ignore[no-any-return]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            if generation == self.generation:
+                self._entries[key] = value
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+
+    def info(self) -> dict[str, int]:
+        """Return the cache's statistics.
+
+        Returns:
+            A mapping with ``hits``, ``misses``, ``size`` and ``maxsize``.
+
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self.maxsize}
+
+
 class TagRepository(AbstractTagSet):
-    """An example implementation for storing and querying tags."""
+    """An example implementation for storing and querying tags.
+
+    ``generation`` counts mutations: it increases whenever objects are added,
+    removed, tagged or untagged, so that query results may be cached until
+    it changes. ``query()`` results are cached in ``query_cache``. Changing
+    an object's ``tags`` directly, rather than through the repository, is not
+    noticed.
+    """
 
     tag_objs: defaultdict[str, TagSet]
+    generation: int
+    query_cache: QueryCache
 
     def __init__(self, *objs: TaggableProtocol) -> None:
         """Initialize a TagRepository.
@@ -368,6 +462,8 @@ class TagRepository(AbstractTagSet):
 
         """
         self.tag_objs = defaultdict(TagSet)
+        self.generation = 0
+        self.query_cache = QueryCache()
         self.add_object(*objs)
 
     def add_object(self, *objs: TaggableProtocol, check_repo: bool = True) -> None:
@@ -384,6 +480,7 @@ class TagRepository(AbstractTagSet):
             else:
                 for tag in resolve_tags(*obj.tags):
                     self.tag_objs[tag].add(obj)
+                self.generation += 1
 
     def remove_object(self, *objs: TaggableProtocol) -> None:
         """Remove objects from the repository.
@@ -396,6 +493,7 @@ class TagRepository(AbstractTagSet):
             for tag in resolve_tags(*obj.tags):
                 with contextlib.suppress(KeyError):
                     self.tag_objs[tag].remove(obj)
+        self.generation += 1
 
     def add_tags(self, *tags: str) -> None:
         """Add tags to the database (creates empty tag entries).
@@ -418,6 +516,7 @@ class TagRepository(AbstractTagSet):
         for tag in resolve_tags(*tags):
             self.tag_objs[tag].add(obj)
         obj.tags.update(tags)
+        self.generation += 1
 
     def untag_object(self, obj: TaggableProtocol, *tags: str) -> None:
         """Remove tags from an object.
@@ -431,6 +530,7 @@ class TagRepository(AbstractTagSet):
             with contextlib.suppress(KeyError):
                 self.tag_objs[tag].remove(obj)
         obj.tags.difference_update(tags)
+        self.generation += 1
 
     def all(self) -> TagSet:
         """Return the set of all objects in the repository.
@@ -453,6 +553,38 @@ class TagRepository(AbstractTagSet):
         """
         return TagSet(self.tag_objs[tag])
 
+    def query(
+        self,
+        with_tags: Iterable[str] = (),
+        or_tags: Iterable[str] = (),
+        not_tags: Iterable[str] = (),
+    ) -> TagSet:
+        """Query for objects matching the tag criteria, reusing cached results.
+
+        Args:
+            with_tags: Objects must have ALL of these tags (intersection)
+            or_tags: Objects must have ANY of these tags (union)
+            not_tags: Objects must NOT have any of these tags (difference)
+
+        Returns:
+            A new TagSet containing objects matching the criteria
+
+        """
+        with_tags, or_tags, not_tags = tuple(with_tags), tuple(or_tags), tuple(not_tags)
+        key = (
+            'query',
+            frozenset(resolve_tags(*with_tags)),
+            frozenset(resolve_tags(*or_tags)),
+            frozenset(resolve_tags(*not_tags)),
+        )
+        return TagSet(
+            self.query_cache.get(
+                self.generation,
+                key,
+                lambda: frozenset(super(TagRepository, self).query(with_tags, or_tags, not_tags)),
+            )
+        )
+
 
 class TagSet(set[TaggableProtocol], AbstractTagSet):
     """An object for collecting taggables and running tag queries on them.
@@ -0,0 +1,50 @@
+"""Tests for alias-table sampling."""
+
+import collections
+import random
+
+import pytest
+
+from blueprint.alias import AliasTable
+
+
+class TestAliasTable:
+    """Test building and sampling alias tables."""
+
+    def test_distribution(self) -> None:
+        """Test that draws follow the weights."""
+        table = AliasTable([1, 0, 3, 0.5, 1.5])
+        rng = random.Random('alias')  # noqa: S311
+        counts = collections.Counter(table.sample(rng) for _ in range(60_000))
+        assert counts[1] == 0
+        for index, weight in enumerate(table.weights):
+            assert counts[index] / 60_000 == pytest.approx(weight / 6, abs=0.01)
+
+    def test_single_draw_per_sample(self) -> None:
+        """Test that each draw consumes exactly one random number."""
+        rng = random.Random(1)  # noqa: S311
+        AliasTable([2, 1]).sample(rng)
+        expected = random.Random(1)  # noqa: S311
+        expected.random()
+        assert rng.random() == expected.random()
+
+    def test_sample_many_matches_sample(self) -> None:
+        """Test that batch draws match repeated single draws."""
+        table = AliasTable(range(1, 50))
+        one_by_one = random.Random('x')  # noqa: S311
+        batch = random.Random('x')  # noqa: S311
+        assert table.sample_many(batch, 100) == [table.sample(one_by_one) for _ in range(100)]
+
+    def test_table_shape(self) -> None:
+        """Test the table's slots and representation."""
+        table = AliasTable([1, 1, 2])
+        assert len(table) == 3
+        assert table.probabilities == (0.75, 0.75, 1.0)
+        assert table.aliases == (2, 2, 2)
+        assert repr(table) == '<AliasTable: 3 entries>'
+
+    @pytest.mark.parametrize('weights', [[], [0, 0], [1, -1]], ids=['empty', 'zero', 'negative'])
+    def test_invalid_weights(self, weights: list[float]) -> None:
+        """Test that unusable weights are rejected."""
+        with pytest.raises(ValueError, match='non-negative with a positive total'):
+            AliasTable(weights)
@@ -2,6 +2,8 @@
 
 import copy
 
+import pytest
+
 import blueprint
 
 
@@ -236,6 +238,17 @@ class TestBlueprint:
         assert item.b == 20  # type: ignore[comparison-overlap]
         assert item.c == 25  # type: ignore[comparison-overlap]
 
+    def test_blueprint_unresolvable_dependencies(self) -> None:
+        """Test that fields depending on fields that never resolve fail instead of deferring forever."""
+
+        class Item(blueprint.Blueprint):
+            a = 10
+            b = blueprint.depends_on('a', 'missing')(lambda self: self.a)
+            c = blueprint.depends_on('b')(lambda self: self.b)
+
+        with pytest.raises(ValueError, match=r"never resolve: \{'b': \['missing'\], 'c': \['b'\]\}"):
+            Item()
+
     def test_blueprint_defer_to_end_fields(self) -> None:
         """Test that defer_to_end fields are resolved last."""
 
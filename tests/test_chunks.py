@@ -0,0 +1,166 @@
+"""Tests for chunked worlds of blueprints."""
+
+import threading
+from typing import Any
+
+import pytest
+
+import blueprint
+from blueprint.chunks import ChunkCollection, chunk_seed
+
+started = threading.Event()
+release = threading.Event()
+
+
+class Gate(blueprint.Field):
+    """Blocks mastering of the chunks at (1, 0) and (13, 14) until released, and fails at (13, 13) and (13, 14)."""
+
+    def __call__(self, parent: Any) -> None:  # noqa: ANN401
+        if parent.coords in {(1, 0), (13, 14)}:
+            started.set()
+            release.wait(10)
+        if parent.coords in {(13, 13), (13, 14)}:
+            msg = 'unlucky chunk'
+            raise RuntimeError(msg)
+
+
+class Chunk(blueprint.Blueprint):
+    trees = blueprint.RandomInt(0, 1000)
+
+
+class GatedChunk(blueprint.Blueprint):
+    gate = Gate()
+
+
+class TestChunkSeed:
+    """Test hashing coordinates to seeds."""
+
+    def test_seeds_are_distinct(self) -> None:
+        """Test that nearby and negative coordinates get distinct 64-bit seeds."""
+        seeds = {chunk_seed(7, (x, y)) for x in range(-20, 20) for y in range(-20, 20)}
+        assert len(seeds) == 1600
+        assert all(0 <= seed < 1 << 64 for seed in seeds)
+        assert chunk_seed(7, (1, 2)) != chunk_seed(8, (1, 2))
+
+
+class TestChunkCollection:
+    """Test ChunkCollection access, caching and prefetching."""
+
+    def test_chunks_are_deterministic(self) -> None:
+        """Test that a chunk depends only on the world seed and its coordinates."""
+        world = ChunkCollection(Chunk, seed='world', start=False)
+        chunk = world[3, -2]
+        assert chunk.meta.seed == world.seed_for((3, -2))
+        again = ChunkCollection(Chunk, seed='world', start=False)[3, -2]
+        assert again.trees == chunk.trees
+        assert world[3, -2] is chunk
+        assert (world.hits, world.misses) == (1, 1)
+        assert (3, -2) in world
+
+    def test_regions(self) -> None:
+        """Test that slices return nested lists of chunks in axis order."""
+        world = ChunkCollection(Chunk, seed='world', start=False)
+        region = world[0:2, 0:3]
+        assert [[chunk.meta.seed for chunk in column] for column in region] == [
+            [world.seed_for((x, y)) for y in range(3)] for x in range(2)
+        ]
+        assert world[0:4:2, 1] == [region[0][1], world[2, 1]]
+        assert len(world) == 7
+        line = ChunkCollection(Chunk, seed='line', dims=1, start=False)
+        assert line[0:3][2] is line[2]
+
+    def test_invalid_keys(self) -> None:
+        """Test that keys must match the dimensions, and slices need a stop."""
+        world = ChunkCollection(Chunk, start=False)
+        with pytest.raises(IndexError, match='2 dimensions, not 1'):
+            world[0]
+        with pytest.raises(IndexError, match='need a stop'):
+            world[0:, 0]
+
+    def test_lru_eviction(self) -> None:
+        """Test that the least recently used chunks are evicted, with callbacks."""
+        evicted: list[tuple[int, ...]] = []
+        world = ChunkCollection(Chunk, start=False, cache_size=2, on_evict=lambda coords, _: evicted.append(coords))
+        world[0, 0]
+        world[0, 1]
+        world[0, 0]
+        world[0, 2]
+        assert evicted == [(0, 1)]
+        world.clear()
+        assert sorted(evicted) == [(0, 0), (0, 1), (0, 2)]
+        assert (world.evictions, len(world)) == (3, 0)
+
+        quiet = ChunkCollection(Chunk, start=False, cache_size=1)
+        quiet[0:3, 0]
+        quiet.clear()
+        assert quiet.evictions == 3
+
+    def test_coords_and_kwargs(self) -> None:
+        """Test that chunks can be given their coordinates and shared keyword arguments."""
+        world = ChunkCollection(Chunk, dims=3, coords_name='coords', trees=5, start=False)
+        chunk = world[1, 2, 3]
+        assert chunk.coords == (1, 2, 3)
+        assert chunk.trees == 5
+
+    def test_prefetches_neighbours(self) -> None:
+        """Test that the chunks around an access are mastered in the background."""
+        with ChunkCollection(Chunk, seed='world', radius=1, workers=2) as world:
+            world[0, 0]
+            assert world.prefetched(timeout=10)
+            assert len(world) == 9
+            assert world[1, 1].meta.seed == world.seed_for((1, 1))
+            assert (world.hits, world.misses) == (1, 1)
+            world.start()
+            assert world.prefetched(timeout=10)
+            assert len(world) == 14
+
+    def test_waits_for_chunks_being_prefetched(self) -> None:
+        """Test that accessing a chunk being prefetched waits for it rather than mastering it again."""
+        started.clear()
+        release.clear()
+        with ChunkCollection(GatedChunk, coords_name='coords') as world:
+            world[0, 0]
+            assert started.wait(10)
+            timer = threading.Timer(0.05, release.set)
+            timer.start()
+            chunk = world[1, 0]
+            timer.join()
+        assert chunk.coords == (1, 0)
+        assert (world.hits, world.misses) == (1, 1)
+
+    def test_skips_queued_chunks_already_cached(self) -> None:
+        """Test that prefetching skips chunks mastered since they were queued."""
+        world = ChunkCollection(Chunk, start=False)
+        chunk = world[5, 5]
+        world._queue.append((5, 5))
+        world.start()
+        assert world.prefetched(timeout=10)
+        world.close()
+        assert world[5, 5] is chunk
+
+    def test_failed_chunks_are_not_cached(self) -> None:
+        """Test that errors while mastering propagate and leave nothing pending."""
+        world = ChunkCollection(GatedChunk, coords_name='coords', start=False)
+        with pytest.raises(RuntimeError, match='unlucky chunk'):
+            world[13, 13]
+        assert (13, 13) not in world
+        assert world._pending == {}
+
+    def test_prefetch_errors_are_raised_to_waiters(self) -> None:
+        """Test that a chunk failing in the background raises in its waiter, and the worker carries on."""
+        started.clear()
+        release.clear()
+        with ChunkCollection(GatedChunk, coords_name='coords', radius=1, workers=1) as world:
+            world[13, 15]
+            assert started.wait(10)
+            timer = threading.Timer(0.05, release.set)
+            timer.start()
+            with pytest.raises(RuntimeError, match='unlucky chunk'):
+                world[13, 14]
+            timer.join()
+            assert (world.hits, world.misses) == (0, 1)
+            assert world.prefetched(timeout=10)
+            world[20, 20]
+            assert world.prefetched(timeout=10)
+            assert (20, 21) in world
+            assert (13, 14) not in world
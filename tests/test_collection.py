@@ -1,5 +1,7 @@
 """Tests for BlueprintCollection functionality."""
 
+import concurrent.futures
+import random
 import sys
 
 import blueprint
@@ -223,3 +225,60 @@ class TestBlueprintCollection:
         assert hasattr(items, '__next__')
         first = next(items)
         assert isinstance(first, Item)
+
+
+class TestShuffleBagCollections:
+    """Test ShuffleBag fields in collections."""
+
+    class Room(blueprint.Blueprint):
+        theme = blueprint.ShuffleBag(*range(8), scope='collection')
+
+    def test_items_draw_each_choice_before_repeats(self) -> None:
+        """Test that consecutive items of a collection exhaust the bag before repeating."""
+        rooms = BlueprintCollection(self.Room, seed='dungeon')
+        themes = [room.theme for room in rooms[0:16]]  # type: ignore[attr-defined]
+        assert sorted(themes[:8]) == sorted(themes[8:]) == list(range(8))
+
+    def test_index_maps_to_slot(self) -> None:
+        """Test that an item gets the same choice however the collection is accessed."""
+        themes = [room.theme for room in BlueprintCollection(self.Room, seed='dungeon')[0:12]]  # type: ignore[attr-defined]
+        rooms = BlueprintCollection(self.Room, seed='dungeon')
+        assert [rooms[i].theme for i in (11, 3, 7)] == [themes[11], themes[3], themes[7]]  # type: ignore[attr-defined]
+        assert next(rooms[9:]).theme == themes[9]  # type: ignore[call-overload]
+
+    def test_outside_indexing(self) -> None:
+        """Test that calling the collection falls back to the parent scope."""
+        rooms = BlueprintCollection(self.Room, seed='dungeon')
+        assert rooms().theme in range(8)  # type: ignore[attr-defined]
+
+    def test_concurrent_items_keep_their_slots(self) -> None:
+        """Test that items mastered from many threads at once still get their own slots."""
+
+        class Cell(blueprint.Blueprint):
+            mark = blueprint.ShuffleBag(*range(3), scope='collection')
+
+        expected = [cell.mark for cell in BlueprintCollection(Cell, seed='maze')[0:600]]  # type: ignore[attr-defined]
+        cells = BlueprintCollection(Cell, seed='maze')
+        order = list(range(600))
+        random.Random(0).shuffle(order)  # noqa: S311
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # Switch threads often, to give races a chance to show.
+        try:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as pool:
+                marks = dict(zip(order, pool.map(lambda i: cells[i].mark, order), strict=True))  # type: ignore[attr-defined]
+        finally:
+            sys.setswitchinterval(interval)
+        assert [marks[i] for i in range(600)] == expected
+
+    def test_nested_children_draw_from_their_parent(self) -> None:
+        """Test that children of an item draw from the item's own bag, not the item's collection slot."""
+
+        class Monster(blueprint.Blueprint):
+            kind = blueprint.ShuffleBag(*'abcdefgh', scope='collection')
+
+        class Lair(blueprint.Blueprint):
+            monsters = blueprint.ListOf(Monster, 5)
+
+        lair = BlueprintCollection(Lair, seed='lair')[3]
+        kinds = [monster.kind for monster in lair.monsters]  # type: ignore[attr-defined]
+        assert len(set(kinds)) == 5
@@ -177,3 +177,188 @@ def test_roll_with_custom_random() -> None:
     result2 = roll('2d6', random_obj=custom_random)
 
     assert list(result1) == list(result2)
+
+
+@pytest.mark.parametrize(
+    ('dice_expr', 'expected'),
+    [
+        ('1d6', dict.fromkeys(range(1, 7), 1)),
+        ('1dF', {-1: 2, 0: 2, 1: 2}),
+        ('1d2 - 1d2 + 3', {2: 1, 3: 2, 4: 1}),
+        ('-1d2', {-2: 1, -1: 1}),
+        ('5', {5: 1}),
+    ],
+    ids=['1d6', '1dF', 'difference', 'negative', 'constant'],
+)
+def test_distribution(dice_expr: str, expected: dict[int, int]) -> None:
+    """Test counting the ways each dice total can be rolled."""
+    from blueprint.dice import distribution
+
+    assert distribution(dice_expr) == expected
+
+
+@pytest.mark.parametrize('dice_expr', ['', '3d6 * 2', '1d6 1d6', 'max(2d6)'])
+def test_distribution_unsupported(dice_expr: str) -> None:
+    """Test that expressions other than sums of dice cannot be analysed."""
+    from blueprint.dice import distribution
+
+    assert distribution(dice_expr) is None
+
+
+def test_distribution_limit() -> None:
+    """Test that the number of distinct totals can be capped."""
+    from blueprint.dice import distribution
+
+    assert distribution('3d6', limit=15) is None
+    assert distribution('3d6', limit=16) is not None
+
+
+class TestDiceExpression:
+    """Test parsing and compiling dice expressions."""
+
+    @pytest.mark.parametrize(
+        ('dice_expr', 'expected'),
+        [
+            ('3d6', 'dice'),
+            ('3d6 + 2', 'int'),
+            ('-1d6 % 4', 'int'),
+            ('sorted(4dF)', 'list'),
+            ('max(3d6)', 'int'),
+            ('max(1d6, 1.5)', 'number'),
+            ('min(1.5, 2 / 1d4)', 'float'),
+            ('abs(2 ** 1d4)', 'number'),
+            ('2d6 / 2', 'float'),
+            ('2.5 ** 2', 'float'),
+            ('-1.5 * 1d6', 'float'),
+            ('sum(sorted(2d6)) * (1d4 + 1)', 'int'),
+        ],
+    )
+    def test_static_types(self, dice_expr: str, expected: str) -> None:
+        """Test that the type of a roll is known when the expression is compiled."""
+        import random
+
+        from blueprint import dice
+
+        compiled = dice.dcompile(dice_expr)
+        assert compiled.type == expected
+        rolled = compiled(random.Random(1))  # noqa: S311
+        types: dict[str, type | tuple[type, ...]] = {
+            'dice': dice.results,
+            'list': list,
+            'int': int,
+            'float': float,
+            'number': (int, float),
+        }
+        assert isinstance(rolled, types[expected])
+
+    @pytest.mark.parametrize(
+        ('dice_expr', 'reason'),
+        [
+            ('', 'unexpected end'),
+            ('3d6 +', 'unexpected end'),
+            ('1d6)', "unexpected '\\)'"),
+            ('3d6x', "unexpected '3d6x'"),
+            ('* 2', "unexpected '\\*'"),
+            ('sum 3d6', "expected '\\(' after 'sum'"),
+            ('1d0', 'has no sides'),
+            ('sum(3)', 'needs dice or a list'),
+            ('abs(1d6, 2)', 'takes one argument'),
+            ('-sorted(2d6)', 'needs a number, not a list'),
+            ('max(sorted(2d6), 1)', 'needs a number, not a list'),
+            ('__import__("os")', 'unexpected'),
+        ],
+    )
+    def test_grammar_errors(self, dice_expr: str, reason: str) -> None:
+        """Test that expressions outside the grammar are rejected when compiled."""
+        from blueprint.dice import InvalidDiceExpression, dcompile
+
+        with pytest.raises(InvalidDiceExpression, match=reason):
+            dcompile(dice_expr)
+
+    @pytest.mark.parametrize(
+        'dice_expr',
+        ['3d6', '1dF', '4dF - 1', 'random.choice(sorted(3d6))', 'max(2d6, 1d8) // 2', '1d1', '0d6 + 1'],
+    )
+    def test_rolls_like_randint(self, dice_expr: str) -> None:
+        """Test that drawing with getrandbits matches rolling with randint and choice."""
+        import random
+
+        from blueprint import dice
+
+        class Generic:
+            """A random number generator without getrandbits."""
+
+            def __init__(self, seed: int) -> None:
+                self.random = random.Random(seed)  # noqa: S311
+
+            def randint(self, a: int, b: int) -> int:
+                return self.random.randint(a, b)
+
+            def choice(self, seq: list[int]) -> int:
+                return self.random.choice(seq)
+
+        compiled = dice.dcompile(dice_expr)
+        for seed in range(50):
+            fast = random.Random(seed)  # noqa: S311
+            generic = Generic(seed)
+            assert repr(compiled(fast)) == repr(compiled(generic))
+            assert fast.random() == generic.random.random()
+
+    def test_choice_from_nothing(self) -> None:
+        """Test that choosing from no dice fails as random.choice does."""
+        from blueprint.dice import roll
+
+        with pytest.raises(IndexError, match='empty sequence'):
+            roll('random.choice(0d6)')
+
+
+class TestDiceCache:
+    """Test caching compiled dice expressions."""
+
+    def test_spellings_are_interned(self) -> None:
+        """Test that spellings of an expression share one compiled expression, across fields too."""
+        from blueprint import dice, fields
+
+        compiled = dice.dcompile('sum( 3dF )+2')
+        assert dice.dcompile('sum(3df) + 2') is compiled
+        assert fields.Dice('sum(3dF) +2').compiled_expr is compiled
+        assert fields.DiceTable('sum(3dF)+2', {}).compiled_expr is compiled
+        dice.dcompile('12')
+        with pytest.raises(dice.InvalidDiceExpression):
+            dice.dcompile('1 2')
+
+    def test_lru_and_info(self) -> None:
+        """Test that the least recently used expressions are evicted, and counted."""
+        from blueprint.dice import DiceCache
+
+        cache = DiceCache(maxsize=2)
+        cache.warm(['1d6', '2d6'])
+        first = cache.get('1d6 ')
+        cache.get('3d6')
+        assert '1d6' in cache
+        assert '2d6' not in cache
+        assert cache.info() == {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2, 'maxsize': 2}
+        assert cache.get('1d6') is first
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_invalid_expressions(self) -> None:
+        """Test that invalid expressions raise on every lookup, and are never cached."""
+        from blueprint.dice import DiceCache, InvalidDiceExpression
+
+        cache = DiceCache()
+        for dice_expr in ['1d6 +', 'os.system']:
+            with pytest.raises(InvalidDiceExpression):
+                cache.get(dice_expr)
+            assert dice_expr not in cache
+        assert 6 not in cache
+        assert cache.info()['size'] == 0
+
+    def test_roll_compiles_once(self) -> None:
+        """Test that rolling a string expression repeatedly compiles it once."""
+        from blueprint import dice
+
+        misses = dice.cache.misses
+        for _ in range(3):
+            dice.roll('1d20 + 17 - 1d20')
+        assert dice.cache.misses == misses + 1
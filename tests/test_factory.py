@@ -153,7 +153,7 @@ class TestFactory:
         item = ItemFactory()
         assert isinstance(item, Item)
         assert item.meta.mastered
-        assert 1 <= item.value <= 10  # type: ignore[operator]
+        assert 1 <= item.value <= 10
 
     def test_factory_passes_parent_to_product(self) -> None:
         """Test that Factory passes parent parameter to unmastered product."""
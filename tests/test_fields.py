@@ -1,9 +1,17 @@
 """Tests for field types and operators."""
 
+import collections
+import copy
+import functools
+import itertools
+import random
 from collections.abc import Generator
+from types import SimpleNamespace
+
+import pytest
 
 import blueprint
-from blueprint import fields
+from blueprint import dice, fields
 
 
 class TestFieldOperators:
@@ -39,7 +47,7 @@ class TestFieldOperators:
             total = 10 + fields.RandomInt(1, 5)
 
         item = Item()
-        assert 11 <= item.total <= 15  # type: ignore[operator]
+        assert 11 <= item.total <= 15
 
     def test_field_sub(self) -> None:
         """Test subtracting fields."""
@@ -48,7 +56,7 @@ class TestFieldOperators:
             total = fields.RandomInt(1, 5) - 2
 
         item = Item()
-        assert -1 <= item.total <= 3  # type: ignore[operator]
+        assert -1 <= item.total <= 3
 
     def test_field_rsub(self) -> None:
         """Test reverse subtracting fields."""
@@ -57,7 +65,7 @@ class TestFieldOperators:
             total = 10 - fields.RandomInt(1, 5)
 
         item = Item()
-        assert 5 <= item.total <= 9  # type: ignore[operator]
+        assert 5 <= item.total <= 9
 
     def test_field_mul(self) -> None:
         """Test multiplying fields."""
@@ -66,7 +74,7 @@ class TestFieldOperators:
             total = fields.RandomInt(2, 4) * 3
 
         item = Item()
-        assert 6 <= item.total <= 12  # type: ignore[operator]
+        assert 6 <= item.total <= 12
 
     def test_field_rmul(self) -> None:
         """Test reverse multiplying fields."""
@@ -75,7 +83,7 @@ class TestFieldOperators:
             total = 3 * fields.RandomInt(2, 4)
 
         item = Item()
-        assert 6 <= item.total <= 12  # type: ignore[operator]
+        assert 6 <= item.total <= 12
 
     def test_field_div(self) -> None:
         """Test dividing fields."""
@@ -84,7 +92,7 @@ class TestFieldOperators:
             total = fields.RandomInt(10, 20) / 2
 
         item = Item()
-        assert 5.0 <= item.total <= 10.0  # type: ignore[operator]
+        assert 5.0 <= item.total <= 10.0
 
     def test_field_truediv(self) -> None:
         """Test true division of fields."""
@@ -93,7 +101,7 @@ class TestFieldOperators:
             total = fields.RandomInt(10, 20).__truediv__(2)
 
         item = Item()
-        assert 5.0 <= item.total <= 10.0  # type: ignore[operator]
+        assert 5.0 <= item.total <= 10.0
 
     def test_field_floordiv(self) -> None:
         """Test floor division of fields."""
@@ -102,7 +110,7 @@ class TestFieldOperators:
             total = fields.RandomInt(10, 20) // 3
 
         item = Item()
-        assert 3 <= item.total <= 6  # type: ignore[operator]
+        assert 3 <= item.total <= 6
 
     def test_field_rdiv(self) -> None:
         """Test reverse dividing fields."""
@@ -111,7 +119,7 @@ class TestFieldOperators:
             total = 100 / fields.RandomInt(2, 4)
 
         item = Item()
-        assert 25.0 <= item.total <= 50.0  # type: ignore[operator]
+        assert 25.0 <= item.total <= 50.0
 
     def test_field_rtruediv(self) -> None:
         """Test reverse true division of fields."""
@@ -121,7 +129,7 @@ class TestFieldOperators:
             total = a.__rtruediv__(100)
 
         item = Item()
-        assert 25.0 <= item.total <= 50.0  # type: ignore[operator]
+        assert 25.0 <= item.total <= 50.0
 
     def test_field_rfloordiv(self) -> None:
         """Test reverse floor division of fields."""
@@ -130,7 +138,7 @@ class TestFieldOperators:
             total = 100 // fields.RandomInt(2, 4)
 
         item = Item()
-        assert 25 <= item.total <= 50  # type: ignore[operator]
+        assert 25 <= item.total <= 50
 
 
 class TestOperatorFields:
@@ -201,6 +209,228 @@ class TestOperatorFields:
         assert item.total == 11.0  # type: ignore[comparison-overlap]
 
 
+def evaluate_node_by_node(parent: object, node: object) -> object:
+    """Evaluate an operator tree the way it was evaluated before compilation."""
+    if isinstance(node, fields._Operator):
+        values = [evaluate_node_by_node(parent, item) for item in node.items]
+        return functools.reduce(node.op, values)  # type: ignore[arg-type]
+    return fields.resolve(parent, node)
+
+
+class TestMoreOperators:
+    """Test the remaining operators on fields."""
+
+    def test_modulo_and_power(self) -> None:
+        """Test % and ** in both directions."""
+
+        class Item(blueprint.Blueprint):
+            mod = fields.RandomInt(7, 7) % 4
+            rmod = 9 % fields.RandomInt(5, 5)
+            pow = fields.RandomInt(2, 2) ** 3
+            rpow = 2 ** fields.RandomInt(3, 3) ** 2
+
+        item = Item()
+        assert (item.mod, item.rmod, item.pow, item.rpow) == (3, 4, 8, 512)  # type: ignore[comparison-overlap]
+
+    def test_negative(self) -> None:
+        """Test unary minus."""
+
+        class Item(blueprint.Blueprint):
+            value = -fields.RandomInt(3, 3)
+            constant = fields.Negative(fields.Add(1, 2))
+
+        item = Item()
+        assert (item.value, item.constant) == (-3, -3)  # type: ignore[comparison-overlap]
+        assert repr(-fields.RandomInt(1, 2)) == '(-<RandomInt: 1...2>)'
+
+    def test_comparisons(self) -> None:
+        """Test comparison operators, including reflected comparisons."""
+
+        class Item(blueprint.Blueprint):
+            lt = fields.RandomInt(3, 3) < 4
+            le = fields.RandomInt(3, 3) <= 2
+            gt = fields.RandomInt(3, 3) > 2
+            ge = fields.RandomInt(3, 3) >= 3
+            eq = fields.Equal(fields.RandomInt(3, 3), 3)
+            ne = fields.NotEqual(fields.RandomInt(3, 3), 3)
+
+        item = Item()
+        assert (item.lt, item.le, item.gt, item.ge, item.eq, item.ne) == (True, False, True, True, True, False)  # type: ignore[comparison-overlap]
+        assert isinstance(4 > fields.RandomInt(3, 3), fields.LessThan)  # noqa: SIM300
+
+    def test_comparison_fields_have_no_truth_value(self) -> None:
+        """Test that comparison fields cannot be used as booleans."""
+        with pytest.raises(TypeError, match='blueprint.Min'):
+            min(fields.RandomInt(1, 2), fields.RandomInt(3, 4))
+
+    def test_min_and_max(self) -> None:
+        """Test Min and Max fields."""
+
+        class Item(blueprint.Blueprint):
+            low = blueprint.Min(fields.RandomInt(5, 5), 3, 4)
+            high = blueprint.Max(1, fields.RandomInt(5, 5), 2)
+            constant = blueprint.Max(1, 2, 3)
+
+        item = Item()
+        assert (item.low, item.high, item.constant) == (3, 5, 3)  # type: ignore[comparison-overlap]
+        assert repr(blueprint.Min(1, 2)) == 'min(1, 2)'
+        assert str(blueprint.Max(1, 2)) == 'max(1, 2)'
+
+
+class TestOperatorCompilation:
+    """Test compilation of operator trees."""
+
+    @pytest.fixture
+    def parent(self) -> SimpleNamespace:
+        """Return a stand-in parent blueprint."""
+        return SimpleNamespace(meta=SimpleNamespace(random=random.Random(0)))  # noqa: S311
+
+    def test_compiled_when_class_is_created(self) -> None:
+        """Test that operator fields are compiled with their blueprint class."""
+        total = fields.RandomInt(1, 6) + 1
+
+        class Item(blueprint.Blueprint):
+            value = total
+
+        assert total._compiled is not None
+        assert Item.value is total
+
+    def test_compiled_on_first_call(self) -> None:
+        """Test that free-standing operators compile themselves when called."""
+        total = fields.Add(1, 2)
+        assert total._compiled is None
+        assert total(None) == 3
+        assert total._compiled is not None
+
+    def test_constants_are_folded(self, parent: SimpleNamespace) -> None:
+        """Test that constant sub-expressions are evaluated at compile time."""
+        total = fields.Add(fields.Multiply(2, 3), 4, fields.RandomInt(1, 1), 5)
+        compiled = total.compile()
+        constants = list(compiled.__globals__.values())
+        assert 10 in constants
+        assert 6 not in constants
+        assert compiled(parent) == 16
+        assert fields.Add(fields.Multiply(2, 3), 4).compile()(None) == 10
+
+    def test_failing_constants_are_not_folded(self, parent: SimpleNamespace) -> None:
+        """Test that errors in constant sub-expressions are raised on resolution."""
+        total = fields.Add(fields.Divide(1, 0), fields.RandomInt(1, 2))
+        compiled = total.compile()
+        with pytest.raises(ZeroDivisionError):
+            compiled(parent)
+
+        class Odd(blueprint.Blueprint):
+            negative = fields.Negative('abc')
+
+        with pytest.raises(TypeError, match='bad operand type'):
+            Odd()
+
+    def test_other_leaves(self) -> None:
+        """Test generators, callables, custom operators and custom ops."""
+
+        class Concat(fields._Operator):
+            op = staticmethod(lambda a, b: f'{a}{b}')
+
+        class First(fields._Operator):
+            def __call__(self, parent: object, seed: object = None) -> object:
+                return self.resolve(parent, self.items[0])
+
+        class Item(blueprint.Blueprint):
+            total = fields.Add(fields.RandomInt(1, 1), lambda _self: 2, First(fields.Add(3, 1), 5))
+            text = Concat('a', fields.PickOne('b'), 'c')
+            listing = fields.Add([0], (i for i in (1, 2)))
+            first = First(6) * 2
+
+        item = Item()
+        assert (item.total, item.text, item.listing, item.first) == (7, 'abc', [0, 1, 2], 12)  # type: ignore[comparison-overlap]
+
+    def test_random_sequence_is_unchanged(self) -> None:
+        """Test that compiled trees draw random numbers exactly as node-by-node evaluation does."""
+        tree = (fields.RandomInt(1, 6) + fields.Dice('2d6')) * fields.PickOne(1, 2, 3) - (
+            fields.RandomInt(1, 100) // (lambda self: self.meta.random.randint(1, 4))
+        )
+
+        class Compiled(blueprint.Blueprint):
+            value = tree
+
+        class Walked(blueprint.Blueprint):
+            value = lambda self: evaluate_node_by_node(self, tree)  # noqa: E731
+
+        for seed in range(20):
+            assert Compiled(seed=seed).value == Walked(seed=seed).value  # type: ignore[comparison-overlap]
+
+
+class TestPredicateFields:
+    """Test boolean operators, Where, Attr and batch evaluation."""
+
+    def test_boolean_operators(self) -> None:
+        """Test &, | and ~ in both directions, and that they have no truth value."""
+
+        class Item(blueprint.Blueprint):
+            both = (fields.RandomInt(3, 3) > 2) & fields.Equal(fields.RandomInt(1, 1), 1)
+            either = False | (fields.RandomInt(3, 3) < 2)
+            rand = True & (fields.RandomInt(3, 3) >= 3)
+            neither = ~((fields.RandomInt(3, 3) < 2) | fields.PickOne(False))  # noqa: FBT003
+            constant = ~fields.Or(False, False)  # noqa: FBT003
+
+        item = Item()
+        assert (item.both, item.either, item.rand, item.neither, item.constant) == (True, False, True, True, True)  # type: ignore[comparison-overlap]
+        parent = SimpleNamespace(meta=SimpleNamespace(random=random.Random(0)))  # noqa: S311
+        assert (fields.And(1, 2)(parent), fields.Or(2, 4)(parent), fields.Or(0, '')(parent)) == (True, True, False)
+        assert fields.And(fields.RandomInt(1, 1), 2)(parent) is True
+        assert fields.Or(fields.RandomInt(0, 0), 4)(parent) is True
+        assert repr(~fields.Attr('x')) == '(~<Attr: x>)'
+        with pytest.raises(TypeError, match='instead of and, or and not'):
+            bool(fields.Attr('a') & fields.Attr('b'))
+
+    def test_where_and_attr(self) -> None:
+        """Test that Where picks a branch, and Attr reads other fields."""
+
+        class Hero(blueprint.Blueprint):
+            level = fields.PickOne(5, 15)
+            veteran = fields.Attr('level') >= 10
+            damage = fields.Where(fields.Attr('veteran'), fields.Attr('level') * 2, 1)
+            title = fields.Where(True, 'hero', fields.RandomInt(1, 2))  # noqa: FBT003
+            folded = fields.Where(fields.Equal(1, 1), 'yes', 'no')
+
+        for seed in range(10):
+            hero = Hero(seed=seed)
+            level: int = hero.level  # type: ignore[assignment]
+            assert hero.damage == (level * 2 if level == 15 else 1)  # type: ignore[comparison-overlap]
+            assert (hero.title, hero.folded) == ('hero', 'yes')  # type: ignore[comparison-overlap]
+        assert Hero.damage.depends_on == {'veteran', 'level'}
+        assert repr(Hero.folded) == "where((1 == 1), 'yes', 'no')"
+        parent = SimpleNamespace(x=3, meta=SimpleNamespace(random=random.Random(0)))  # noqa: S311
+        assert fields.resolve(parent, fields.Attr('x')) == 3
+
+    @pytest.mark.parametrize('numpy', [True, False])
+    def test_evaluate_batch(self, monkeypatch: pytest.MonkeyPatch, numpy: bool) -> None:
+        """Test that trees evaluate column-wise, with and without NumPy, as they do per instance."""
+        if numpy:
+            pytest.importorskip('numpy')
+        else:
+            monkeypatch.setattr(fields, 'load_numpy', lambda: None)
+
+        class Hero(blueprint.Blueprint):
+            strength = fields.RandomInt(1, 20)
+            dexterity = fields.RandomInt(1, 20)
+
+        heroes = [Hero(seed=seed) for seed in range(50)]
+        tree = fields.Where(
+            ~(fields.Attr('strength') < 10) | (fields.Attr('dexterity') >= 15),
+            blueprint.Max(fields.Attr('strength'), fields.Attr('dexterity')),
+            -fields.Attr('dexterity') + 100,
+        )
+        expected = [tree(hero) for hero in heroes]
+        assert list(tree.evaluate_batch(heroes)) == expected
+        assert list(fields.Add(1, 2).evaluate_batch(heroes[:3])) == [3, 3, 3]
+        counts = fields.And(fields.Attr('strength') % 4, fields.Attr('dexterity') % 4) | fields.Or(0, 0)
+        assert list(counts.evaluate_batch(heroes)) == [counts(hero) for hero in heroes]
+        assert {counts(hero) for hero in heroes} == {True, False}
+        rolls = fields.Add(fields.RandomInt(4, 4), fields.Attr('strength'))
+        assert list(rolls.evaluate_batch(heroes[:2])) == [4 + heroes[0].strength, 4 + heroes[1].strength]
+
+
 class TestRandomInt:
     """Test RandomInt field."""
 
@@ -217,7 +447,7 @@ class TestRandomInt:
 
         for _ in range(20):
             item = Item()
-            assert 5 <= item.value <= 15  # type: ignore[operator]
+            assert 5 <= item.value <= 15
 
 
 class TestDiceField:
@@ -238,6 +468,13 @@ class TestDiceField:
         assert 2 <= sum(item.roll) <= 12  # type: ignore[call-overload]
 
 
+def _draw_n(rng: random.Random, n: int) -> random.Random:
+    """Advance ``rng`` by ``n`` calls to ``random()``."""
+    for _ in range(n):
+        rng.random()
+    return rng
+
+
 class TestDiceTable:
     """Test DiceTable field."""
 
@@ -269,15 +506,13 @@ class TestDiceTable:
 
     def test_dice_table_with_int_keys(self) -> None:
         """Test DiceTable with integer keys."""
-        # DiceTable converts results to string before lookup, so keys need to be strings
         table: dict[str | int, str] = {1: 'one', 2: 'two', 3: 'three'}
 
         class Item(blueprint.Blueprint):
             name = fields.DiceTable('1d3', table)
 
         item = Item()
-        # DiceTable may return None if key not found
-        assert item.name in {'one', 'two', 'three', None}  # type: ignore[comparison-overlap]
+        assert item.name in {'one', 'two', 'three'}  # type: ignore[comparison-overlap]
 
     def test_dice_table_with_default(self) -> None:
         """Test DiceTable with default value."""
@@ -289,6 +524,72 @@ class TestDiceTable:
         item = Item()
         assert item.value in {'defined', 'default'}  # type: ignore[comparison-overlap]
 
+    def test_dice_table_wide_ranges_are_not_expanded(self) -> None:
+        """Test that range keys are stored as intervals, not one entry per value."""
+        field = fields.DiceTable('1d6', {'1..1000000': 'common'}, default='none')
+        assert field.table == {}
+        assert field.intervals == [(1, 1000000, 'common')]
+        assert field.lookup(dice.results([500000])) == 'common'
+        assert field.lookup(0) == 'none'
+        assert field.lookup(1000001) == 'none'
+
+    def test_dice_table_later_keys_take_precedence(self) -> None:
+        """Test that later keys override the parts of earlier keys they overlap."""
+        table = {'1..10': 'a', '5': 'b', '4..6': 'c', '7': 'd', '2..3': 'e', 'x': 'f'}
+        field = fields.DiceTable('1d10', table)  # type: ignore[arg-type]
+        assert [field.lookup(n) for n in range(1, 12)] == ['a', 'e', 'e', 'c', 'c', 'c', 'd', 'a', 'a', 'a', None]
+        assert field.lookup('x') == 'f'
+        assert "'2..3': 'e'" in str(field)
+
+    def test_dice_table_float_results(self) -> None:
+        """Test that float results select integer keys and ranges, or keys spelled like them."""
+        field = fields.DiceTable('1d20 / 2', {'1..5': 'low', '8': 'eight', '3.5': 'odd', '9.0': 'nine'}, default='none')
+        assert field.row_table is None
+        assert [field.lookup(n) for n in (4.0, 8.0, 3.5, 9.0, 6.5)] == ['low', 'eight', 'odd', 'nine', 'none']
+
+        class Roll(blueprint.Blueprint):
+            row = field
+
+        assert {Roll(seed=n).row for n in range(100)} == {'low', 'eight', 'odd', 'nine', 'none'}  # type: ignore[comparison-overlap]
+
+    def test_dice_table_unhashable_results(self) -> None:
+        """Test that results that cannot be table keys select the default."""
+        field = fields.DiceTable('sorted(2d6)', {'1..12': 'hit'}, default='miss')
+        assert field.lookup([1, 2]) == 'miss'
+
+    def test_dice_table_precomputes_row_probabilities(self) -> None:
+        """Test that static dice expressions select rows with a single draw."""
+        field = fields.DiceTable('2d6', {'2..6': 'low', '7': 'seven'}, default='high')
+        assert field.rows == ('low', 'seven', 'high')
+        assert field.row_table is not None
+        assert field.row_table.weights == pytest.approx((15 / 36, 6 / 36, 15 / 36))
+
+        parent = SimpleNamespace(meta=SimpleNamespace(random=random.Random(0)))  # noqa: S311
+        rolls = collections.Counter(field(parent) for _ in range(3600))
+        assert set(rolls) == {'low', 'seven', 'high'}
+        assert parent.meta.random.getstate() == _draw_n(random.Random(0), 3600).getstate()  # noqa: S311
+
+    def test_dice_table_direct_opt_out(self) -> None:
+        """Test that direct=False rolls the dice as written."""
+        field = fields.DiceTable('1d6', {'1..3': 'low'}, default='high', direct=False)
+        assert field.rows is None
+        assert field.row_table is None
+
+        parent = SimpleNamespace(meta=SimpleNamespace(random=random.Random(0)))  # noqa: S311
+        rolls = [field(parent) for _ in range(20)]
+        expected = random.Random(0)  # noqa: S311
+        assert rolls == ['low' if expected.randint(1, 6) <= 3 else 'high' for _ in range(20)]
+
+    def test_dice_table_dynamic_expressions_are_rolled(self) -> None:
+        """Test that expressions that cannot be analysed are rolled as written."""
+        assert fields.DiceTable('max(2d6)', {'6': 'six'}).row_table is None
+        assert fields.DiceTable('10d100', {'10': 'ten'}).row_table is not None
+
+        class Huge(fields.DiceTable):
+            max_direct_totals = 10
+
+        assert Huge('2d6', {'7': 'seven'}).row_table is None
+
 
 class TestPickOne:
     """Test PickOne field."""
@@ -308,6 +609,58 @@ class TestPickOne:
         assert item.choice in {'red', 'green', 'blue'}  # type: ignore[comparison-overlap]
 
 
+class TestWeightedPickOne:
+    """Test WeightedPickOne field."""
+
+    def test_weighted_pick_one_str(self) -> None:
+        """Test WeightedPickOne __str__ method."""
+        field = fields.WeightedPickOne({'a': 1, 'b': 2.5})
+        assert str(field) == "'a': 1, 'b': 2.5"
+
+    def test_weighted_pick_one_call(self) -> None:
+        """Test that picks follow the weights and resolve nested fields and blueprints."""
+
+        class Gem(blueprint.Blueprint):
+            value = 100
+
+        class Item(blueprint.Blueprint):
+            loot = fields.WeightedPickOne({'copper': 3, fields.PickOne('silver'): 1, Gem: 0})
+
+        picks = collections.Counter(str(Item(seed=i).loot) for i in range(400))
+        assert set(picks) == {'copper', 'silver'}
+        assert picks['copper'] > picks['silver']
+
+    def test_weighted_pick_one_pairs(self) -> None:
+        """Test that unhashable choices can be given as pairs."""
+
+        class Item(blueprint.Blueprint):
+            loot = fields.WeightedPickOne([(['rope'], 1), (['torch'], 0)])
+
+        assert Item().loot == ['rope']  # type: ignore[comparison-overlap]
+
+    def test_weighted_pick_one_is_deterministic(self) -> None:
+        """Test that a seed determines the pick."""
+
+        class Item(blueprint.Blueprint):
+            loot = fields.WeightedPickOne(dict.fromkeys(range(1000), 1.0))
+
+        assert [Item(seed=i).loot for i in range(10)] == [Item(seed=i).loot for i in range(10)]
+
+    def test_weighted_pick_one_sample(self) -> None:
+        """Test batch sampling."""
+
+        class Item(blueprint.Blueprint):
+            name = 'item'
+
+        field = fields.WeightedPickOne({'a': 1, 'b': 1})
+        nested = fields.WeightedPickOne({fields.PickOne('c'): 1})
+        parent = Item(seed='batch')
+        picks = field.sample(parent, 50)
+        assert len(picks) == 50
+        assert set(picks) == {'a', 'b'}
+        assert nested.sample(parent, 3) == ['c', 'c', 'c']
+
+
 class TestPickFrom:
     """Test PickFrom field."""
 
@@ -325,6 +678,100 @@ class TestPickFrom:
         item = Item()
         assert item.choice in {'alpha', 'beta', 'gamma'}  # type: ignore[comparison-overlap]
 
+    def test_pick_from_caches_tag_queries(self) -> None:
+        """Test that WithTags results are reused until the tag repository changes."""
+
+        class Pickable(blueprint.Blueprint):
+            tags = 'pick-from-cache'  # type: ignore[assignment]
+
+        class Picker(blueprint.Blueprint):
+            choice = fields.PickFrom(fields.WithTags('pick-from-cache'))
+
+        cache = Picker.tag_repo.query_cache  # type: ignore[union-attr]
+        assert isinstance(Picker().choice, Pickable)
+        misses = cache.misses
+        assert isinstance(Picker().choice, Pickable)
+        assert cache.misses == misses
+
+        Pickable.remove_tag('pick-from-cache')
+        with pytest.raises(IndexError):
+            Picker()
+        Pickable.add_tag('pick-from-cache')
+        assert isinstance(Picker().choice, Pickable)
+        assert cache.misses > misses
+
+
+class TestShuffleBag:
+    """Test ShuffleBag field."""
+
+    def test_every_choice_before_repeats(self) -> None:
+        """Test that children of one parent draw each choice once before any repeats."""
+
+        class Room(blueprint.Blueprint):
+            theme = fields.ShuffleBag(*range(10))
+
+        class Dungeon(blueprint.Blueprint):
+            depth = 1
+
+        dungeon = Dungeon(seed='dungeon')
+        themes = [Room(parent=dungeon).theme for _ in range(25)]
+        assert sorted(themes[:10]) == list(range(10))  # type: ignore[comparison-overlap]
+        assert sorted(themes[10:20]) == list(range(10))  # type: ignore[comparison-overlap]
+        assert themes[:10] != themes[10:20]
+
+        again = Dungeon(seed='dungeon')
+        assert [Room(parent=again).theme for _ in range(25)] == themes
+
+    def test_parent_scope_without_parent(self) -> None:
+        """Test that repeated draws for a top-level blueprint share its own bag."""
+        bag = fields.ShuffleBag('a', 'b', 'c')
+
+        class Chest(blueprint.Blueprint):
+            items = blueprint.Property(lambda chest: [fields.resolve(chest, bag) for _ in range(3)])
+
+        assert sorted(Chest().items) == ['a', 'b', 'c']
+
+    def test_fields_are_shuffled_independently(self) -> None:
+        """Test that bags are keyed by field name."""
+
+        class Room(blueprint.Blueprint):
+            theme = fields.ShuffleBag(*range(20))
+            style = fields.ShuffleBag(*range(20))
+
+        parent = Room(seed='x')
+        rooms = [Room(parent=parent) for _ in range(20)]
+        assert [room.theme for room in rooms] != [room.style for room in rooms]
+
+    def test_choices_are_resolved(self) -> None:
+        """Test that the drawn choice is resolved."""
+
+        class Item(blueprint.Blueprint):
+            value = fields.ShuffleBag(fields.RandomInt(1, 1))
+
+        assert Item().value == 1  # type: ignore[comparison-overlap]
+
+    def test_global_scope(self) -> None:
+        """Test that the global bag is shared by all draws until reset."""
+
+        class Coin(blueprint.Blueprint):
+            face = fields.ShuffleBag('heads', 'tails', scope='global')
+
+        faces = [Coin().face for _ in range(4)]
+        assert sorted(faces[:2]) == sorted(faces[2:]) == ['heads', 'tails']  # type: ignore[comparison-overlap]
+        Coin.face.reset()
+        assert [Coin().face for _ in range(4)] == faces
+
+    def test_invalid_arguments(self) -> None:
+        """Test that empty bags and unknown scopes are rejected."""
+        with pytest.raises(ValueError, match='at least one choice'):
+            fields.ShuffleBag()
+        with pytest.raises(ValueError, match="not 'world'"):
+            fields.ShuffleBag('a', scope='world')
+
+    def test_str(self) -> None:
+        """Test ShuffleBag __str__ method."""
+        assert str(fields.ShuffleBag('a', scope='global')) == "('a',) (global)"
+
 
 class TestAll:
     """Test All field."""
@@ -344,6 +791,98 @@ class TestAll:
         assert item.items == [1, 2, 3]  # type: ignore[comparison-overlap]
 
 
+class TestListOf:
+    """Test ListOf field."""
+
+    def test_children_are_mastered_with_derived_seeds(self) -> None:
+        """Test that blueprint children share the parent and get reproducible seeds."""
+
+        class Item(blueprint.Blueprint):
+            value = fields.RandomInt(1, 1000)
+
+        class Chest(blueprint.Blueprint):
+            items = fields.ListOf(Item, fields.Dice('2d4'))
+
+        chest = Chest(seed='chest')
+        assert 2 <= len(chest.items) <= 8  # type: ignore[arg-type]
+        assert all(isinstance(item, Item) and item.meta.parent is chest for item in chest.items)  # type: ignore[attr-defined]
+        assert len({item.meta.seed for item in chest.items}) == len(chest.items)  # type: ignore[attr-defined, arg-type]
+        again = Chest(seed='chest')
+        assert [item.value for item in again.items] == [item.value for item in chest.items]  # type: ignore[attr-defined]
+
+    def test_weighted_choices_are_sampled_in_one_batch(self) -> None:
+        """Test that WeightedPickOne items use the batch sampling path."""
+        pick = fields.WeightedPickOne({'copper': 9, 'silver': 1})
+        field = fields.ListOf(pick, 50)
+        parent = SimpleNamespace(meta=SimpleNamespace(random=random.Random(0)))  # noqa: S311
+        expected = pick.sample(SimpleNamespace(meta=SimpleNamespace(random=random.Random(0))), 50)  # noqa: S311
+        assert field(parent) == expected
+
+    def test_other_items_are_resolved_per_entry(self) -> None:
+        """Test that other fields and static values are resolved once per entry."""
+
+        class Hoard(blueprint.Blueprint):
+            rolls = fields.ListOf(fields.RandomInt(1, 6), 3)
+            names = fields.ListOf('coin', 2)
+
+        hoard = Hoard()
+        assert len(hoard.rolls) == 3  # type: ignore[arg-type]
+        assert all(1 <= roll <= 6 for roll in hoard.rolls)  # type: ignore[attr-defined]
+        assert hoard.names == ['coin', 'coin']  # type: ignore[comparison-overlap]
+
+    def test_str(self) -> None:
+        """Test ListOf __str__ method."""
+        assert str(fields.ListOf('coin', fields.Dice('2d4'))) == "2d4 x 'coin'"
+
+
+class TestStream:
+    """Test Stream field."""
+
+    class Dungeon(blueprint.Blueprint):
+        wanderers = fields.Stream(lambda _: itertools.repeat(fields.RandomInt(1, 1000)))
+        events = fields.Stream(lambda _: ['dawn', fields.PickOne('rain', 'sun'), 'dusk'])
+
+    def test_stream_is_lazy(self) -> None:
+        """Test that unbounded streams are not materialised during mastering."""
+        wanderers = self.Dungeon(seed='deep').wanderers
+        assert isinstance(wanderers, fields.ResolvedStream)
+        first = list(itertools.islice(wanderers, 5))
+        assert all(1 <= n <= 1000 for n in first)
+        assert 'ResolvedStream' in repr(wanderers)
+
+    def test_items_are_seeded_by_index(self) -> None:
+        """Test that item i is the same however the stream is reached."""
+        wanderers: fields.ResolvedStream = self.Dungeon(seed='deep').wanderers  # type: ignore[assignment]
+        first = list(wanderers[:10])
+        assert list(wanderers[:10]) == first
+        assert list(wanderers[4:10:3]) == [first[4], first[7]]
+        assert wanderers[6] == first[6]
+        again: fields.ResolvedStream = self.Dungeon(seed='deep').wanderers  # type: ignore[assignment]
+        assert list(again[:10]) == first
+
+    def test_finite_streams(self) -> None:
+        """Test iteration and indexing of finite streams."""
+        events: fields.ResolvedStream = self.Dungeon().events  # type: ignore[assignment]
+        resolved = list(events)
+        assert resolved[0] == 'dawn'
+        assert resolved[1] in {'rain', 'sun'}
+        assert events[2] == 'dusk'
+        with pytest.raises(IndexError, match='out of range'):
+            events[3]
+
+    def test_parent_random_is_restored(self) -> None:
+        """Test that resolving items leaves the parent's random number generator in place."""
+        dungeon = self.Dungeon()
+        rng = dungeon.meta.random
+        wanderers: fields.ResolvedStream = dungeon.wanderers  # type: ignore[assignment]
+        wanderers[0]
+        assert dungeon.meta.random is rng
+
+    def test_str(self) -> None:
+        """Test Stream __str__ method."""
+        assert str(fields.Stream(list)) == "<class 'list'>"
+
+
 class TestFormatTemplate:
     """Test FormatTemplate field."""
 
@@ -379,6 +918,94 @@ class TestFormatTemplate:
         item = Item(seed=12345)
         assert 'Seed: ' in item.name  # type: ignore[operator]
 
+    def test_format_template_parses_names_once(self) -> None:
+        """Test that referenced names, including nested format specs, become dependencies."""
+        field = fields.FormatTemplate('{name:>{width}} {meta.seed} {stats[str]} {parent.name}')
+        assert field.names == ('name', 'width', 'meta', 'stats', 'parent')
+        assert field.depends_on == {'name', 'width', 'stats'}
+
+    def test_format_template_fetches_only_referenced_fields(self) -> None:
+        """Test that fields the template does not mention are not evaluated."""
+        calls: list[object] = []
+
+        class Item(blueprint.Blueprint):
+            bonus = 5
+            other = fields.Property(calls.append)
+            name = fields.FormatTemplate('Item +{bonus:{width}}')  # noqa: RUF027
+            width = 3
+
+        item = Item()
+        calls.clear()
+        assert item.name == 'Item +  5'
+        assert calls == []
+
+    def test_format_template_caches_rendering(self) -> None:
+        """Test that renderings are cached until a referenced field is reassigned."""
+
+        class Item(blueprint.Blueprint):
+            bonus = 5
+            name = fields.FormatTemplate('Item +{bonus}')  # noqa: RUF027
+
+        item = Item()
+        first = item.name
+        assert item.name is first
+        item.bonus = 6
+        assert item.name == 'Item +6'
+
+    def test_format_template_mutable_values_are_not_cached(self) -> None:
+        """Test that renderings of mutable values are always fresh."""
+
+        class Item(blueprint.Blueprint):
+            bag = fields.All('rope')
+            name = fields.FormatTemplate('{bag}')  # noqa: RUF027
+
+        item = Item()
+        assert item.name == "['rope']"
+        item.bag.append('torch')  # type: ignore[attr-defined]
+        assert item.name == "['rope', 'torch']"
+
+    def test_format_template_dynamic_template(self) -> None:
+        """Test templates that are themselves fields."""
+
+        class Item(blueprint.Blueprint):
+            bonus = 5
+            name = fields.FormatTemplate(fields.PickOne('+{bonus}'))  # noqa: RUF027
+
+        assert Item().name == '+5'
+
+    def test_format_template_self_reference(self) -> None:
+        """Test that a template cannot refer to itself."""
+
+        class Item(blueprint.Blueprint):
+            name = fields.FormatTemplate('{name}')
+
+        with pytest.raises(KeyError, match='name'):
+            Item()
+
+    def test_format_template_unknown_name(self) -> None:
+        """Test that a template can only refer to fields, ``meta`` and ``parent``."""
+
+        class Item(blueprint.Blueprint):
+            name = fields.FormatTemplate('{missing}')
+
+        with pytest.raises(KeyError, match='missing'):
+            Item()
+
+    def test_format_template_cache_is_per_instance(self) -> None:
+        """Test that copies and recycled instances do not share cached renderings."""
+
+        class Item(blueprint.Blueprint):
+            bonus = fields.RandomInt(1, 1000)
+            name = fields.FormatTemplate('{bonus}')  # noqa: RUF027
+
+        item = Item(seed='a')
+        assert item.name == str(item.bonus)
+        assert copy.deepcopy(item).meta.cache == {}
+        with Item.pool(1) as pool:
+            pool.release(item)
+            recycled = pool.master(seed='b')
+            assert recycled.name == str(recycled.bonus)  # type: ignore[attr-defined]
+
 
 class TestProperty:
     """Test Property field."""
@@ -402,6 +1029,77 @@ class TestProperty:
         assert isinstance(Item.prop, fields.Property)
 
 
+class TestCachedProperty:
+    """Test CachedProperty field."""
+
+    def test_cached_property_is_computed_once(self) -> None:
+        """Test that the value is cached on the mastered blueprint."""
+        calls: list[object] = []
+
+        def double(self: blueprint.Blueprint) -> int:
+            calls.append(self)
+            return self.value * 2  # type: ignore[attr-defined, no-any-return]
+
+        class Item(blueprint.Blueprint):
+            value = fields.RandomInt(5, 5)
+            doubled = blueprint.CachedProperty(double)
+
+        item = Item()
+        assert [item.doubled for _ in range(3)] == [10, 10, 10]
+        assert calls == [item]
+        assert isinstance(Item.doubled, fields.CachedProperty)
+
+    def test_cached_property_dependencies(self) -> None:
+        """Test that reassigning a dependency invalidates the cached value."""
+
+        @fields.depends_on('multiplier')
+        def effective(self: blueprint.Blueprint) -> int:
+            return self.damage * self.multiplier  # type: ignore[attr-defined, no-any-return]
+
+        field = blueprint.CachedProperty(effective, depends_on='damage')
+        assert field.depends_on == {'damage', 'multiplier'}
+        assert blueprint.CachedProperty(effective, depends_on=['damage']).depends_on == field.depends_on
+
+        class Gadget(blueprint.Blueprint):
+            damage = 3
+            multiplier = 2
+            effective_damage = field
+
+        gadget = Gadget()
+        assert gadget.effective_damage == 6
+        gadget.damage = 5
+        assert gadget.effective_damage == 10
+
+    def test_cached_property_mods(self) -> None:
+        """Test that values set by mods invalidate the cached value."""
+
+        class Gadget(blueprint.Blueprint):
+            damage = 3
+            effective_damage = blueprint.CachedProperty(lambda self: self.damage * 2, depends_on='damage')
+
+        class Sharp(blueprint.Mod):
+            damage = 10
+
+        gadget = Gadget()
+        assert gadget.effective_damage == 6
+        assert Sharp(gadget).effective_damage == 20  # type: ignore[attr-defined]
+
+    def test_cached_property_invalidate(self) -> None:
+        """Test explicit invalidation after in-place changes."""
+
+        class Bag(blueprint.Blueprint):
+            items = fields.All('rope')
+            count = blueprint.CachedProperty(lambda self: len(self.items), depends_on='items')
+
+        bag = Bag()
+        assert bag.count == 1
+        bag.items.append('torch')  # type: ignore[attr-defined]
+        assert bag.count == 1
+        Bag.count.invalidate(bag)
+        Bag.count.invalidate(bag)
+        assert bag.count == 2
+
+
 class TestWithTags:
     """Test WithTags field."""
 
@@ -448,6 +1146,22 @@ class TestWithTags:
         container = Container()
         assert all(not item.meta.abstract for item in container.items)  # type: ignore[attr-defined]
 
+    def test_with_tags_results_are_cached(self) -> None:
+        """Test that WithTags shares cached results but returns a fresh list."""
+
+        class Cached(blueprint.Blueprint):
+            tags = 'with-tags-cache'  # type: ignore[assignment]
+
+        class Container(blueprint.Blueprint):
+            items = fields.WithTags('with-tags-cache')
+
+        field = fields.WithTags('with-tags-cache')
+        container = Container()
+        assert field.results(container) is field.results(container)
+        assert field.results(container) == (Cached,)
+        assert container.items == [Cached]  # type: ignore[comparison-overlap]
+        assert field(container) is not field(container)
+
     def test_with_tags_with_or_tags(self) -> None:
         """Test WithTags with or_tags (union)."""
 
@@ -0,0 +1,103 @@
+"""Tests for Tracery-style grammars."""
+
+import random
+from types import SimpleNamespace
+
+import pytest
+
+import blueprint
+from blueprint.grammar import Grammar
+
+
+def _parent(seed: int = 0, **attrs: object) -> SimpleNamespace:
+    return SimpleNamespace(meta=SimpleNamespace(random=random.Random(seed)), **attrs)  # noqa: S311
+
+
+class TestGrammar:
+    """Test grammar compilation and expansion."""
+
+    def test_blueprint_field(self) -> None:
+        """Test that grammars expand with the blueprint's fields and random number generator."""
+
+        class Sword(blueprint.Blueprint):
+            metal = blueprint.PickOne('iron', 'bronze')
+            description = Grammar({
+                'origin': '{metal} sword {history}',
+                'history': ['forged in {place}', 'found in {place}'],
+                'place': {'the north': 1, 'a barrow': 1, 'the sea': 0},
+            })
+
+        sword = Sword(seed='x')
+        words = sword.description.split()  # type: ignore[attr-defined]
+        assert words[0] == sword.metal
+        assert ' '.join(words[2:4]) in {'forged in', 'found in'}
+        assert ' '.join(words[4:]) in {'the north', 'a barrow'}
+        assert Sword(seed='x').description == sword.description
+        assert Sword.description.depends_on == {'metal'}
+
+    def test_modifiers_and_format_specs(self) -> None:
+        """Test that modifiers and format specs apply to a symbol's whole expansion."""
+        grammar = Grammar({
+            'origin': '{beast.a.capitalize}|{beast.upper}|{beast.title:>12}|{beast.lower}',
+            'beast': '{kind} owl',
+            'kind': 'eagle',
+        })
+        assert grammar.expand(_parent()) == 'An eagle owl|EAGLE OWL|   Eagle Owl|eagle owl'
+        assert Grammar({'origin': '{x.a}', 'x': 'wolf'}).expand(_parent()) == 'a wolf'
+
+    def test_fields_conversions_and_meta(self) -> None:
+        """Test that other names are looked up on the parent, with conversions and format specs."""
+        grammar = Grammar({'origin': '{name!r} {stats[str]:03d} {meta.seed} {parent.name}'})
+        parent = _parent(name='Bob', stats={'str': 7})
+        parent.meta.seed = 's'
+        assert grammar.expand(parent) == "'Bob' 007 s Bob"
+        assert grammar.depends_on == {'name', 'stats'}
+
+    def test_weighted_alternatives(self) -> None:
+        """Test that weighted alternatives are picked in proportion to their weight."""
+        grammar = Grammar({'origin': [('common', 9), ('rare', 1)]})
+        picks = grammar.expand_many(_parent(), 1000)
+        assert set(picks) == {'common', 'rare'}
+        assert 850 < picks.count('common') < 950
+
+    def test_expand_many_matches_repeated_expansion(self) -> None:
+        """Test that a batch draws the same expansions as expanding one at a time."""
+        grammar = Grammar({'origin': '{a}{a}', 'a': list('xyz')})
+        parent = _parent()
+        one_at_a_time = [grammar.expand(parent) for _ in range(20)]
+        assert grammar.expand_many(_parent(), 20) == one_at_a_time
+        assert grammar.expand_many(_parent(), 1, symbol='a') == [grammar.expand(_parent(), 'a')]
+
+    def test_depth_limit(self) -> None:
+        """Test that deep recursion is cut off without Python recursion."""
+        grammar = Grammar({'origin': '({origin})'}, max_depth=500)
+        assert grammar.expand(_parent()) == '(' * 500 + ')' * 500
+        shallow = Grammar({'origin': '[{origin}]'}, max_depth=2)
+        assert shallow.expand(_parent()) == '[[]]'
+
+    def test_expansion_limit(self) -> None:
+        """Test that the number of expansions is bounded."""
+        grammar = Grammar({'origin': '{x}{x}{x}{x}', 'x': 'x'}, max_expansions=3)
+        assert grammar.expand(_parent()) == 'xx'
+
+    def test_invalid_grammars(self) -> None:
+        """Test that invalid grammars are rejected when compiled."""
+        with pytest.raises(ValueError, match="start symbol 'origin'"):
+            Grammar({'name': 'x'})
+        with pytest.raises(ValueError, match="'name' has no alternatives"):
+            Grammar({'origin': '{name}', 'name': []})
+        with pytest.raises(ValueError, match="Unknown grammar modifier 'shout'"):
+            Grammar({'origin': '{name.shout}', 'name': 'x'})
+        with pytest.raises(ValueError, match='positive total'):
+            Grammar({'origin': {'x': 0, 'y': 0}})
+
+    def test_misspelled_symbol(self) -> None:
+        """Test that a name that is neither a rule nor a field is rejected when the blueprint is defined."""
+        with pytest.raises(ValueError, match=r"refers to \['plce'\], which are neither rules nor fields of Relic"):
+
+            class Relic(blueprint.Blueprint):
+                history = Grammar({'origin': 'found in {plce}', 'place': ['the north', 'a barrow']})
+
+    def test_str(self) -> None:
+        """Test Grammar __str__ method."""
+        assert str(Grammar({'title': 'x', 'y': 'z'}, start='title')) == 'title (2 rules)'
@@ -0,0 +1,131 @@
+"""Tests for tile map grids."""
+
+from array import array
+from typing import Any
+
+import pytest
+
+import blueprint
+from blueprint import fields, grid
+from blueprint.grid import Grid, Threshold, TileMap
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+
+@pytest.fixture(params=['numpy', 'array'])
+def backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run a test with and without NumPy."""
+    if request.param == 'array':
+        monkeypatch.setattr(fields, 'load_numpy', lambda: None)
+    elif np is None:  # pragma: no cover
+        pytest.skip('NumPy is not installed')
+    return str(request.param)
+
+
+needs_numpy = pytest.mark.skipif(np is None, reason='NumPy is not installed')
+
+
+class TestGrid:
+    """Test Grid fields."""
+
+    def test_weighted_cells(self, backend: str) -> None:
+        """Test that weighted cells fill the map in proportion to their weights."""
+
+        class Field(blueprint.Blueprint):
+            tiles = Grid(100, 50, blueprint.WeightedPickOne({'grass': 3, 'flowers': 1, 'never': 0}))
+
+        tiles: TileMap = Field(seed='meadow').tiles  # type: ignore[assignment]
+        assert isinstance(tiles, TileMap)
+        assert (tiles.width, tiles.height) == (100, 50)
+        assert isinstance(tiles.cells, array) == (backend == 'array')
+        counts = tiles.counts()
+        assert set(counts) == {'grass', 'flowers'}
+        assert 0.7 < counts['grass'] / 5000 < 0.8
+        assert Field(seed='meadow').tiles.rows() == tiles.rows()  # type: ignore[attr-defined]
+        assert tiles[99, 49] == tiles.rows()[49][99]
+        assert repr(tiles) == '<TileMap: 100x50, 3 tiles>'
+
+    def test_pick_one_and_dice_table_cells(self, backend: str) -> None:
+        """Test uniform cells, static DiceTable cells and field dimensions."""
+
+        class Map(blueprint.Blueprint):
+            size = 8
+            walls = Grid(blueprint.depends_on('size')(lambda m: m.size), 4, blueprint.PickOne('#', '.'))
+            loot = Grid(4, 4, blueprint.DiceTable('2d6', {'12': 'gold'}, default=''))
+
+        dungeon = Map()
+        assert dungeon.walls.width == 8
+        assert set(dungeon.walls.counts()) <= {'#', '.'}  # type: ignore[attr-defined]
+        assert dungeon.loot.palette == ('', 'gold')  # type: ignore[attr-defined]
+
+    def test_threshold_cells(self, backend: str) -> None:
+        """Test that threshold cells compare a function of the coordinates against each bound."""
+
+        class Coast(blueprint.Blueprint):
+            tiles = Grid(10, 3, Threshold(lambda xs, _: [x / 10 for x in xs], [(0.7, 'sand'), (0.3, 'sea')], 'land'))
+
+        tiles: TileMap = Coast().tiles  # type: ignore[assignment]
+        assert tiles.palette == ('sea', 'sand', 'land')
+        assert tiles.rows()[2] == ['sea'] * 3 + ['sand'] * 4 + ['land'] * 3
+
+    @needs_numpy
+    def test_threshold_field_sources(self) -> None:
+        """Test that field sources are resolved to an object with an evaluate() method."""
+
+        class Gradient:
+            def evaluate(self, xs: Any, ys: Any) -> Any:  # noqa: ANN401
+                return (xs + ys) / 4
+
+        class Slope(blueprint.Field):
+            def __call__(self, parent: blueprint.Blueprint) -> Gradient:
+                return Gradient()
+
+        class Hill(blueprint.Blueprint):
+            tiles = Grid(3, 3, Threshold(Slope(), [(0.5, 'low')], 'high'))
+
+        tiles: TileMap = Hill().tiles  # type: ignore[assignment]
+        assert tiles.rows() == [['low', 'low', 'high'], ['low', 'high', 'high'], ['high', 'high', 'high']]
+        assert 'low' in repr(Hill.tiles.cell)
+
+    def test_smoothing(self, backend: str) -> None:
+        """Test that smoothing replaces cells with the majority of their neighbourhood."""
+
+        class Cave(blueprint.Blueprint):
+            tiles = Grid(5, 5, Threshold(lambda xs, _: [1.0 if x == 2 else 0.0 for x in xs], [(0.5, '.')], '#'))
+            smooth = Grid(
+                5,
+                5,
+                Threshold(lambda xs, ys: [float(x == y == 2) for x, y in zip(xs, ys, strict=True)], [(0.5, '.')], '#'),
+                smoothing=1,
+            )
+
+        cave = Cave()
+        assert cave.tiles.rows()[0] == ['.', '.', '#', '.', '.']  # type: ignore[attr-defined]
+        assert cave.smooth.counts() == {'.': 25}  # type: ignore[attr-defined]
+
+    @needs_numpy
+    def test_smoothing_backends_agree(self) -> None:
+        """Test that both smoothing implementations, including tie-breaking, give the same result."""
+        rng = np.random.default_rng(0)
+        cells = rng.integers(0, 3, size=(16, 24), dtype=np.uint8)
+        expected = grid._smooth_numpy(cells, 3, 24, 16)
+        flat = grid._smooth_array(array('B', cells.ravel().tolist()), 3, 24, 16)
+        assert flat.tolist() == expected.ravel().tolist()
+
+    def test_invalid_cells(self) -> None:
+        """Test that unsupported cells are rejected."""
+        with pytest.raises(TypeError, match='Grid cells must be'):
+            Grid(2, 2, blueprint.RandomInt(1, 6))
+        with pytest.raises(TypeError, match='static dice expression'):
+            Grid(2, 2, blueprint.DiceTable('max(2d6)', {}))
+
+    def test_str(self) -> None:
+        """Test Grid __str__ method."""
+        assert str(Grid(2, 3, blueprint.PickOne('a'))).startswith('2x3 of <PickOne')
+
+    def test_typecodes(self) -> None:
+        """Test that cells use the smallest array type that fits the palette."""
+        assert [grid._typecode(n) for n in (2, 256, 257, 65537)] == ['B', 'B', 'H', 'L']
@@ -0,0 +1,91 @@
+"""Tests for the lazily-importing blueprint package."""
+
+import json
+import subprocess  # noqa: S404
+import sys
+
+import pytest
+
+import blueprint
+
+HEAVY_MODULES = ['blueprint.base', 'blueprint.fields', 'blueprint.dice', 'inspect', 'pprint', 'copy']
+
+
+def run_python(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    """Run ``code`` in a fresh interpreter and return the completed process."""
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *options, '-c', code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+class TestLazyImports:
+    """Test that submodules are only imported on first use."""
+
+    def test_cold_import_loads_no_submodules(self) -> None:
+        """Test that importing the package leaves the heavy submodules unloaded."""
+        result = run_python(
+            f'import sys, json, blueprint; print(json.dumps([m in sys.modules for m in {HEAVY_MODULES!r}]))'
+        )
+        loaded = dict(zip(HEAVY_MODULES, json.loads(result.stdout), strict=True))
+        assert not any(loaded.values()), loaded
+
+    def test_numpy_loads_only_when_used(self) -> None:
+        """Test that defining and mastering blueprints does not import NumPy."""
+        code = (
+            'import sys, blueprint.base, blueprint.fields, blueprint.grid, blueprint.noise\n'
+            'class Hero(blueprint.Blueprint):\n'
+            '    level = blueprint.RandomInt(1, 20)\n'
+            "    veteran = blueprint.Attr('level') >= 10\n"
+            'Hero()\n'
+            "blueprint.noise.NoiseFunction('perlin', tuple(range(256))).at(1.5, 2.5)\n"
+            "print('numpy' in sys.modules)"
+        )
+        assert run_python(code).stdout.strip() == 'False'
+
+    def test_public_names_load_on_first_use(self) -> None:
+        """Test that public names resolve to the objects in their submodules."""
+        from blueprint import fields
+        from blueprint.base import Blueprint
+
+        assert blueprint.Blueprint is Blueprint
+        assert blueprint.PickOne is fields.PickOne
+        assert blueprint.fields is fields
+
+    def test_all_names_resolve(self) -> None:
+        """Test that every name in ``__all__`` is available."""
+        for name in blueprint.__all__:
+            assert getattr(blueprint, name) is not None
+
+    def test_unknown_attribute(self) -> None:
+        """Test that unknown names raise AttributeError."""
+        with pytest.raises(AttributeError, match='no attribute'):
+            blueprint.does_not_exist  # noqa: B018
+
+    def test_dir_lists_lazy_names(self) -> None:
+        """Test that ``dir()`` includes names that have not been imported yet."""
+        names = dir(blueprint)
+        assert 'Blueprint' in names
+        assert 'markov' in names
+
+
+@pytest.mark.slow
+def test_cold_import_time_budget() -> None:
+    """Benchmark the cumulative cold-import cost of the package against ``import json``.
+
+    Uses ``python -X importtime``, which reports cumulative microseconds
+    spent importing each module. Comparing with a standard library import
+    in the same process keeps the budget independent of machine speed and
+    load.
+    """
+    result = run_python('import blueprint, json', '-X', 'importtime')
+    timings = {
+        line.rsplit('|', 1)[-1].strip(): int(line.split('|')[1])
+        for line in result.stderr.splitlines()
+        if line.startswith('import time:') and '|' in line and line.split('|')[1].strip().isdigit()
+    }
+    assert timings['blueprint'] < timings['json'], (
+        f'import blueprint took {timings["blueprint"]}us, json {timings["json"]}us'
+    )
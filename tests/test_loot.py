@@ -0,0 +1,80 @@
+"""Tests for flattened loot tables."""
+
+import collections
+
+import pytest
+
+import blueprint
+from blueprint.loot import LootTable
+
+
+def _probabilities(table: LootTable, parent: object = None) -> dict[object, float]:
+    return dict(table.probabilities(parent))
+
+
+class TestLootTable:
+    """Test compiling and sampling loot tables."""
+
+    def test_flattened_probabilities(self) -> None:
+        """Test that nested picks multiply out, and repeated leaves are summed."""
+        table = LootTable(
+            blueprint.PickOne(
+                'gold',
+                blueprint.WeightedPickOne({'sword': 3, 'shield': 1, 'never': 0}),
+                blueprint.DiceTable('1d4', {'1..3': 'gold'}, default=['rare', 'pair']),
+            )
+        )
+        leaves, probabilities, _ = table.compiled()
+        assert leaves == ('gold', 'sword', 'shield', ['rare', 'pair'])
+        assert probabilities == pytest.approx([1 / 3 + 1 / 4, 1 / 4, 1 / 12, 1 / 12])
+        assert table.explain().splitlines()[0] == " 58.33%  'gold'"
+
+    def test_sampling_matches_the_tree(self) -> None:
+        """Test that picks follow the flattened distribution, with fields resolved once picked."""
+
+        class Drop(blueprint.Blueprint):
+            item = LootTable(
+                blueprint.WeightedPickOne({blueprint.RandomInt(1, 3): 1, blueprint.PickFrom(['a', 'b']): 3})
+            )
+
+        drop = Drop(seed='raid')
+        counts = collections.Counter(Drop.item.sample(drop, 8000))
+        assert set(counts) == {1, 2, 3, 'a', 'b'}
+        assert 0.35 < counts['a'] / 8000 < 0.4
+        assert 0.07 < counts[1] / 8000 < 0.1
+        assert Drop(seed='raid').item == drop.item
+
+    def test_tag_queries(self) -> None:
+        """Test that trees with tag queries compile per parent, and recompile when tags change."""
+
+        class Axe(blueprint.Blueprint):
+            tags = 'loot-axe'  # type: ignore[assignment]
+
+        class Hoard(blueprint.Blueprint):
+            item = LootTable(blueprint.PickOne('coins', blueprint.PickFrom(blueprint.WithTags('loot-axe'))))
+
+        with pytest.raises(TypeError, match='needs a parent'):
+            Hoard.item.explain()
+        hoard = Hoard()
+        assert _probabilities(Hoard.item, hoard) == {'coins': 0.5, Axe: 0.5}
+        assert Hoard.item.compiled(hoard) is Hoard.item.compiled(hoard)
+
+        class Pick(blueprint.Blueprint):
+            tags = 'loot-axe'  # type: ignore[assignment]
+
+        assert _probabilities(Hoard.item, hoard) == {'coins': 0.5, Axe: 0.25, Pick: 0.25}
+        items = {type(item) for item in Hoard.item.sample(hoard, 100)}
+        assert items == {str, Axe, Pick}
+
+    def test_invalid_trees(self) -> None:
+        """Test that branches that cannot be compiled are rejected."""
+        with pytest.raises(TypeError, match='static dice expression'):
+            LootTable(blueprint.PickOne(blueprint.DiceTable('max(2d6)', {})))
+        with pytest.raises(TypeError, match='PickFrom over WithTags'):
+            LootTable(blueprint.PickFrom(blueprint.PickOne(['a'])))
+        with pytest.raises(IndexError, match='empty collection'):
+            LootTable(blueprint.PickFrom([]))
+
+    def test_str(self) -> None:
+        """Test LootTable __str__ method."""
+        assert str(LootTable(blueprint.PickOne('a'))) == "('a',)"
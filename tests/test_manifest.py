@@ -0,0 +1,207 @@
+"""Tests for persisted tag manifests and lazy blueprint proxies."""
+
+import importlib
+import json
+import pathlib
+import sys
+import textwrap
+from collections.abc import Iterator
+
+import pytest
+
+import blueprint
+from blueprint import manifest, taggables
+
+LIBRARY_SOURCE = textwrap.dedent(
+    """
+    import blueprint
+
+
+    class LazyItem(blueprint.Blueprint):
+        tags = 'lazy'
+        value = 1
+
+        class Meta:
+            abstract = True
+
+
+    class LazySword(LazyItem):
+        tags = 'sharp'
+        value = blueprint.RandomInt(5, 10)
+
+
+    class LazyShield(LazyItem):
+        tags = 'sturdy'
+        value = 3
+
+
+    class LazySpikedShield(LazySword, LazyShield):
+        tags = 'spiked'
+    """
+)
+
+
+@pytest.fixture
+def library(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[str]:
+    """Write an importable blueprint library module and return its name."""
+    name = f'lazy_library_{tmp_path.name}'
+    (tmp_path / f'{name}.py').write_text(LIBRARY_SOURCE, encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name
+    sys.modules.pop(name, None)
+
+
+class TestBuildManifest:
+    """Test building manifests from imported blueprints."""
+
+    def test_build_manifest_records_blueprints(self, library: str) -> None:
+        """Test that every importable descendant of the root is recorded."""
+        data = manifest.build_manifest(blueprint.Blueprint, library)
+        entries = {e['path']: e for e in data['blueprints']}
+
+        assert data['version'] == manifest.MANIFEST_VERSION
+        assert data['root'] == 'blueprint.base:Blueprint'
+        assert entries[f'{library}:LazyItem']['abstract'] is True
+        assert entries[f'{library}:LazySword']['abstract'] is False
+        assert 'sharp' in entries[f'{library}:LazySword']['tags']
+        assert 'lazy' in entries[f'{library}:LazySword']['tags']
+        assert len([e for e in data['blueprints'] if e['path'] == f'{library}:LazySpikedShield']) == 1
+
+    def test_build_manifest_skips_local_classes(self) -> None:
+        """Test that classes defined inside functions are left out."""
+
+        class LocalThing(blueprint.Blueprint):
+            value = 1
+
+        data = manifest.build_manifest(blueprint.Blueprint)
+        assert not any('LocalThing' in e['path'] for e in data['blueprints'])
+
+    def test_write_manifest(self, library: str, tmp_path: pathlib.Path) -> None:
+        """Test that the manifest is written as JSON."""
+        path = tmp_path / 'manifest.json'
+        data = manifest.write_manifest(path, blueprint.Blueprint, library)
+        assert json.loads(path.read_text(encoding='utf-8')) == data
+
+
+class TestLoadManifest:
+    """Test populating tag repositories from manifests."""
+
+    def test_load_manifest_does_not_import(self, library: str, tmp_path: pathlib.Path) -> None:
+        """Test that loading a manifest registers proxies without importing modules."""
+        path = tmp_path / 'manifest.json'
+        manifest.write_manifest(path, blueprint.Blueprint, library)
+        sys.modules.pop(library)
+
+        repo = manifest.load_manifest(path)
+        swords = {p.path for p in repo.query(with_tags=['sharp'])}  # type: ignore[attr-defined]
+
+        assert library not in sys.modules
+        assert f'{library}:LazySword' in swords
+        assert f'{library}:LazyShield' not in swords
+
+    def test_load_manifest_skips_abstract(self, library: str) -> None:
+        """Test that abstract blueprints are not registered."""
+        repo = manifest.load_manifest(manifest.build_manifest(blueprint.Blueprint, library))
+        paths = {p.path for p in repo.query(with_tags=['lazy'])}  # type: ignore[attr-defined]
+        assert f'{library}:LazySword' in paths
+        assert f'{library}:LazyShield' in paths
+        assert f'{library}:LazyItem' not in paths
+
+    def test_load_manifest_into_existing_repo(self, library: str) -> None:
+        """Test that an existing repository can be populated."""
+        repo = taggables.TagRepository()
+        result = manifest.load_manifest(manifest.build_manifest(blueprint.Blueprint, library), repo)
+        assert result is repo
+
+    def test_load_manifest_rejects_unknown_version(self) -> None:
+        """Test that manifests in an unknown format are rejected."""
+        with pytest.raises(ValueError, match='Unsupported blueprint manifest version'):
+            manifest.load_manifest({'version': 99, 'blueprints': []})
+
+
+class TestBlueprintProxy:
+    """Test lazy blueprint proxies."""
+
+    def test_proxy_masters_real_blueprint(self, library: str) -> None:
+        """Test that calling a proxy imports and masters the real class."""
+        repo = taggables.TagRepository()
+        proxy = manifest.BlueprintProxy(repo, f'{library}:LazySword', {'sharp'})
+        assert not proxy.loaded
+
+        sword = proxy(seed='abc')
+
+        assert proxy.loaded
+        assert type(sword).__name__ == 'LazySword'
+        assert 5 <= sword.value <= 10
+        assert sword.value == proxy(seed='abc').value
+
+    def test_proxy_steps_aside_for_real_class(self, library: str) -> None:
+        """Test that a loaded proxy leaves the repository its real class registers with."""
+        repo = blueprint.Blueprint.tag_repo
+        assert repo is not None
+        proxy = manifest.BlueprintProxy(repo, f'{library}:LazyShield', {'sturdy', f'proxy-{library}'})
+        assert proxy in repo.query_tag(f'proxy-{library}')
+
+        cls = proxy.load()
+
+        assert proxy.tag_repo is None
+        assert proxy not in repo.query_tag(f'proxy-{library}')
+        assert cls in repo.query_tag('sturdy')  # type: ignore[comparison-overlap]
+
+    def test_direct_import_evicts_proxies(self, library: str) -> None:
+        """Test that importing a module after loading its manifest does not register its blueprints twice."""
+        repo = blueprint.Blueprint.tag_repo
+        assert repo is not None
+        data = manifest.build_manifest(blueprint.Blueprint, library)
+        # Start over as a fresh process would, with nothing imported or registered.
+        stale = sys.modules.pop(library)
+        repo.remove_object(stale.LazySword, stale.LazyShield, stale.LazySpikedShield)
+        manifest.load_manifest(data, repo)
+        proxies = {p.path: p for p in repo.query_tag('sharp') if isinstance(p, manifest.BlueprintProxy)}
+        sword_proxy = proxies[f'{library}:LazySword']
+
+        module = importlib.import_module(library)
+
+        swords = [s for s in repo.query(with_tags=['sharp']) if s in {module.LazySword, sword_proxy}]
+        assert swords == [module.LazySword]
+        assert sword_proxy.tag_repo is None
+        assert sword_proxy.loaded
+        assert sword_proxy.load() is module.LazySword
+
+    def test_load_after_import_skips_registered_classes(self, library: str) -> None:
+        """Test that loading a manifest does not add proxies for classes already registered with the repository."""
+        repo = blueprint.Blueprint.tag_repo
+        assert repo is not None
+        data = manifest.build_manifest(blueprint.Blueprint, library)
+        module = sys.modules[library]
+
+        manifest.load_manifest(data, repo)
+
+        sharp = repo.query_tag('sharp')
+        assert not [p for p in sharp if isinstance(p, manifest.BlueprintProxy) and p.path.startswith(f'{library}:')]
+        assert {module.LazySword, module.LazySpikedShield} <= set(sharp)
+        fresh = manifest.load_manifest(data)
+        assert f'{library}:LazySword' in {p.path for p in fresh.query(with_tags=['sharp'])}  # type: ignore[attr-defined]
+
+    def test_proxy_resolves_as_field(self, library: str) -> None:
+        """Test that proxies picked by tag queries are mastered like blueprint classes."""
+        repo = taggables.TagRepository()
+        proxy = manifest.BlueprintProxy(repo, f'{library}:LazyShield', {'sturdy'})
+
+        class Holder(blueprint.Blueprint):
+            gear = blueprint.PickOne(proxy)
+
+        assert type(Holder().gear).__name__ == 'LazyShield'
+
+    def test_proxy_equality_and_repr(self) -> None:
+        """Test that proxies compare by class path."""
+        a = manifest.BlueprintProxy(None, 'pkg.mod:Thing', {'thing'})
+        b = manifest.BlueprintProxy(None, 'pkg.mod:Thing', {'other'})
+        c = manifest.BlueprintProxy(None, 'pkg.mod:Other', {'thing'})
+
+        assert a == b
+        assert a != c
+        assert a != object()
+        assert hash(a) == hash(b)
+        assert repr(a) == '<BlueprintProxy: pkg.mod:Thing>'
+        assert a.meta.abstract is False
@@ -0,0 +1,106 @@
+"""Tests for seeded coherent noise."""
+
+import itertools
+
+import pytest
+
+import blueprint
+from blueprint import fields, noise
+from blueprint.grid import Grid, Threshold, TileMap
+from blueprint.noise import Noise, NoiseFunction
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+needs_numpy = pytest.mark.skipif(np is None, reason='NumPy is not installed')
+
+
+class Terrain(blueprint.Blueprint):
+    perlin = Noise('perlin', scale=8, octaves=3)
+    simplex = Noise('simplex', scale=8, octaves=2)
+    value = Noise('value', scale=4)
+
+
+class TestNoise:
+    """Test Noise fields and the functions they resolve to."""
+
+    def test_resolves_to_seeded_function(self) -> None:
+        """Test that noise functions are seeded from the blueprint and reproducible."""
+        terrain = Terrain(seed='hills')
+        height: NoiseFunction = terrain.perlin  # type: ignore[assignment]
+        assert isinstance(height, NoiseFunction)
+        assert sorted(height.permutation) == list(range(256))
+        assert Terrain(seed='hills').perlin.permutation == height.permutation  # type: ignore[attr-defined]
+        assert Terrain(seed='dales').perlin.permutation != height.permutation  # type: ignore[attr-defined]
+        assert repr(height) == '<NoiseFunction: perlin, scale=8, octaves=3>'
+
+    @pytest.mark.parametrize('kind', sorted(noise.KINDS))
+    def test_values_are_coherent(self, kind: str) -> None:
+        """Test that values lie in [0, 1], vary, and change little between close points."""
+        function: NoiseFunction = getattr(Terrain(seed='hills'), kind)
+        points = [function.at(x, y) for x in range(0, 80, 2) for y in range(0, 80, 2)]
+        assert all(0.0 <= value <= 1.0 for value in points)
+        assert max(points) - min(points) > 0.3
+        assert abs(function.at(10, 10) - function.at(10.01, 10)) < 0.01
+
+    def test_lattice_points(self) -> None:
+        """Test that gradient noise is exactly one half at lattice points."""
+        function = NoiseFunction('perlin', tuple(range(256)))
+        assert function.at(3, 5) == pytest.approx(0.5)
+
+    @needs_numpy
+    @pytest.mark.parametrize('kind', sorted(noise.KINDS))
+    def test_vectorised_evaluation_matches_points(self, kind: str) -> None:
+        """Test that array evaluation agrees with evaluating one point at a time."""
+        function: NoiseFunction = getattr(Terrain(seed='hills'), kind)
+        xs = np.linspace(-20, 20, 57)
+        ys = np.linspace(30, -5, 57)
+        values = function.evaluate(xs, ys)
+        assert values.shape == (57,)
+        expected = list(itertools.starmap(function.at, zip(xs, ys, strict=True)))
+        assert np.allclose(values, expected)
+
+    def test_evaluation_without_numpy(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that evaluation falls back to a list of point values without NumPy."""
+        function: NoiseFunction = Terrain(seed='hills').simplex  # type: ignore[assignment]
+        monkeypatch.setattr(fields, 'load_numpy', lambda: None)
+        assert function.evaluate([1, 2], [3, 4]) == [function.at(1, 3), function.at(2, 4)]
+
+    @pytest.mark.parametrize('numpy', [pytest.param(True, marks=needs_numpy), False])
+    def test_tiles_are_cached(self, monkeypatch: pytest.MonkeyPatch, numpy: bool) -> None:
+        """Test that tiles cover their region and that only recent tiles are kept."""
+        if not numpy:
+            monkeypatch.setattr(fields, 'load_numpy', lambda: None)
+
+        class Small(blueprint.Blueprint):
+            height = Noise('value', scale=4, tile_size=4, cache_size=2)
+
+        function: NoiseFunction = Small().height  # type: ignore[assignment]
+        tile = function.tile(1, 2)
+        assert tile[3][1] == pytest.approx(function.at(5, 11))
+        assert function.tile(1, 2) is tile
+        function.tile(0, 0)
+        function.tile(1, 2)
+        function.tile(5, 5)
+        assert list(function._tiles) == [(1, 2), (5, 5)]
+
+    def test_drives_threshold_grids(self) -> None:
+        """Test that noise fields can be thresholded into tile maps."""
+
+        class Island(blueprint.Blueprint):
+            tiles = Grid(32, 32, Threshold(Noise('perlin', scale=8), [(0.45, 'sea'), (0.6, 'sand')], 'land'))
+
+        tiles: TileMap = Island(seed='isle').tiles  # type: ignore[assignment]
+        assert set(tiles.counts()) == {'sea', 'sand', 'land'}
+        assert Island(seed='isle').tiles.rows() == tiles.rows()  # type: ignore[attr-defined]
+
+    def test_invalid_kind(self) -> None:
+        """Test that unknown kinds of noise are rejected."""
+        with pytest.raises(ValueError, match="not 'worley'"):
+            Noise('worley')
+
+    def test_str(self) -> None:
+        """Test Noise __str__ method."""
+        assert str(Noise('value', octaves=2)).startswith("value {'scale': 1.0, 'octaves': 2")
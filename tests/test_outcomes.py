@@ -0,0 +1,169 @@
+"""Tests for exact outcome distributions."""
+
+from fractions import Fraction
+
+import pytest
+
+import blueprint
+from blueprint import fields
+from blueprint.outcomes import Outcomes, analyse
+
+
+class Chest(blueprint.Blueprint):
+    lock = blueprint.PickOne('none', 'magic', 'magic')
+    gold = blueprint.RandomInt(1, 4) * 10 + 5
+    size = 'small'
+
+
+class Item(blueprint.Blueprint):
+    name = 'item'
+
+
+class TestAnalyse:
+    """Test exact analysis of individual fields."""
+
+    def test_static_value(self) -> None:
+        """Test that static values are certain."""
+        assert analyse('gold') == {'gold': Fraction(1)}
+
+    def test_random_int(self) -> None:
+        """Test that RandomInt is uniform over its range."""
+        assert analyse(blueprint.RandomInt(1, 2)) == {1: Fraction(1, 2), 2: Fraction(1, 2)}
+
+    def test_pick_one_of_fields(self) -> None:
+        """Test that PickOne mixes the distributions of its choices."""
+        dist = analyse(blueprint.PickOne('a', blueprint.PickOne('a', 'b')))
+        assert dist == {'a': Fraction(3, 4), 'b': Fraction(1, 4)}
+
+    def test_weighted_pick_one(self) -> None:
+        """Test that WeightedPickOne weights its choices exactly."""
+        dist = analyse(blueprint.WeightedPickOne({'a': 0.5, blueprint.PickOne('a', 'b'): 1, 'c': 0}))
+        assert dist == {'a': Fraction(2, 3), 'b': Fraction(1, 3), 'c': 0}
+
+    def test_dice_table(self) -> None:
+        """Test that DiceTable weights each entry by the dice distribution."""
+        table = blueprint.DiceTable('1d4', {'1..3': 'common', 4: 'rare', '4': 'rare'}, default='none')
+        assert analyse(table) == {'common': Fraction(3, 4), 'rare': Fraction(1, 4)}
+
+    def test_dice_table_default(self) -> None:
+        """Test that missing table entries use the default."""
+        table = blueprint.DiceTable('2d2', {'2': 'low'}, default='high')
+        assert analyse(table) == {'low': Fraction(1, 4), 'high': Fraction(3, 4)}
+
+    def test_nested_operators(self) -> None:
+        """Test that operator trees are folded exactly."""
+        dist = analyse((blueprint.RandomInt(1, 2) + blueprint.RandomInt(1, 2)) * 2)
+        assert dist == {4: Fraction(1, 4), 6: Fraction(1, 2), 8: Fraction(1, 4)}
+
+    def test_negative(self) -> None:
+        """Test that negation maps each value."""
+        assert analyse(-blueprint.RandomInt(1, 2)) == {-1: Fraction(1, 2), -2: Fraction(1, 2)}
+        assert analyse(-blueprint.Dice('1d6')) is None
+
+    @pytest.mark.parametrize(
+        'field',
+        [
+            blueprint.RandomInt(1, 1000),
+            blueprint.DiceTable('10d100', {}),
+            blueprint.DiceTable('max(1d6)', {}),
+            blueprint.PickOne(1, lambda _parent: 2),
+            blueprint.RandomInt(1, 40) * blueprint.RandomInt(1, 40),
+            blueprint.RandomInt(1, 2) + (lambda _parent: 1),
+            blueprint.RandomInt(1, 2) + blueprint.RandomInt(1, 1000),
+            blueprint.PickOne([1], [2]),
+            fields.Divide(1, blueprint.RandomInt(0, 1)),
+            fields._Operator(1, 2),
+            blueprint.Dice('1d6'),
+        ],
+        ids=[
+            'random-int-too-large',
+            'dice-too-large',
+            'dice-unsupported',
+            'pick-one-callable',
+            'operator-too-large',
+            'operator-callable',
+            'operator-item-too-large',
+            'unhashable',
+            'zero-division',
+            'operator-without-op',
+            'unknown-field',
+        ],
+    )
+    def test_unanalysable_fields(self, field: object) -> None:
+        """Test that fields that cannot be analysed exactly return None."""
+        assert analyse(field, max_states=100) is None
+
+
+class TestEnumerateOutcomes:
+    """Test Blueprint.enumerate_outcomes."""
+
+    def test_exact_marginals(self) -> None:
+        """Test exact marginal distributions for every field."""
+        outcomes = Chest.enumerate_outcomes()
+
+        assert isinstance(outcomes, Outcomes)
+        assert outcomes.marginals == {
+            'gold': {15: Fraction(1, 4), 25: Fraction(1, 4), 35: Fraction(1, 4), 45: Fraction(1, 4)},
+            'lock': {'none': Fraction(1, 3), 'magic': Fraction(2, 3)},
+            'size': {'small': 1},
+        }
+        assert outcomes.exact == {'gold', 'lock', 'size'}
+        assert outcomes.sampled == frozenset()
+        assert outcomes.joint is None
+        assert outcomes.joint_fields == ()
+        assert repr(outcomes) == "<Outcomes: exact=['gold', 'lock', 'size'] sampled=[]>"
+
+    def test_exact_joint(self) -> None:
+        """Test that the exact joint distribution is the product of the marginals."""
+        outcomes = Chest.enumerate_outcomes(['lock', 'size'], joint=True)
+
+        assert outcomes.joint_fields == ('lock', 'size')
+        assert outcomes.joint == {('none', 'small'): Fraction(1, 3), ('magic', 'small'): Fraction(2, 3)}
+
+    def test_joint_too_large(self) -> None:
+        """Test that an oversized exact joint distribution is refused."""
+        with pytest.raises(ValueError, match='more than max_states=5'):
+            Chest.enumerate_outcomes(joint=True, max_states=5)
+
+    def test_sampled_fields(self) -> None:
+        """Test that unanalysable fields are sampled, counting blueprints by class."""
+
+        class Hoard(blueprint.Blueprint):
+            item = Item
+            bag = blueprint.PickOne(['rope'], ['rope'])
+            coins = blueprint.Property(lambda _self: 7)
+            lock = blueprint.PickOne('none', 'magic')
+
+        outcomes = Hoard.enumerate_outcomes(samples=10)
+
+        assert outcomes.exact == {'lock'}
+        assert outcomes.sampled == {'bag', 'coins', 'item'}
+        assert outcomes.marginals['item'] == {Item: 1.0}
+        assert outcomes.marginals['bag'] == {"['rope']": 1.0}
+        assert outcomes.marginals['coins'] == {7: 1.0}
+        assert outcomes.marginals['lock'] == {'none': Fraction(1, 2), 'magic': Fraction(1, 2)}
+
+    def test_sampled_joint(self) -> None:
+        """Test that the joint distribution is sampled when any field is sampled."""
+
+        class Hoard(blueprint.Blueprint):
+            coins = blueprint.Property(lambda _self: 7)
+            lock = blueprint.PickOne('none', 'magic')
+
+        outcomes = Hoard.enumerate_outcomes(joint=True, samples=200)
+
+        assert outcomes.joint_fields == ('coins', 'lock')
+        assert outcomes.joint is not None
+        assert set(outcomes.joint) == {(7, 'none'), (7, 'magic')}
+        assert sum(outcomes.joint.values()) == pytest.approx(1.0)
+        assert outcomes.marginals['lock'] == {'none': Fraction(1, 2), 'magic': Fraction(1, 2)}
+
+    def test_sampling_is_reproducible(self) -> None:
+        """Test that sampling uses deterministic seeds."""
+
+        class Roll(blueprint.Blueprint):
+            value = blueprint.Dice('1d6')
+
+        first = Roll.enumerate_outcomes(samples=50, seed='x')
+        second = Roll.enumerate_outcomes(samples=50, seed='x')
+        assert first.marginals == second.marginals
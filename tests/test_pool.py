@@ -0,0 +1,133 @@
+"""Tests for blueprint instance pools."""
+
+import pytest
+
+import blueprint
+from blueprint.pool import BlueprintPool, ReleasedBlueprintError
+
+
+class Encounter(blueprint.Blueprint):
+    monsters = blueprint.RandomInt(1, 100)
+    loot = 'nothing'
+
+
+class TestBlueprintPool:
+    """Test recycling of mastered blueprints."""
+
+    def test_pool_returns_pool(self) -> None:
+        """Test that Blueprint.pool builds a pool for the class."""
+        pool = Encounter.pool(8)
+        assert isinstance(pool, BlueprintPool)
+        assert pool.blueprint is Encounter
+        assert pool.size == 8
+        assert len(pool) == 0
+
+    def test_master_without_released_instances(self) -> None:
+        """Test that an empty pool masters new instances."""
+        with Encounter.pool(2) as pool:
+            encounter = pool.master(seed='a', loot='gold')
+        assert isinstance(encounter, Encounter)
+        assert encounter.meta.mastered
+        assert encounter.loot == 'gold'
+
+    def test_released_instances_are_recycled(self) -> None:
+        """Test that a released instance is re-mastered in place."""
+        expected = Encounter(seed='second')
+        with Encounter.pool(2) as pool:
+            first = pool.master(seed='first', loot='gold')
+            meta, rng = first.meta, first.meta.random
+            pool.release(first)
+            assert len(pool) == 1
+
+            second = pool.master(seed='second')
+
+        assert second is first
+        assert second.meta is meta
+        assert second.meta.random is rng
+        assert second.meta.seed == 'second'
+        assert second.monsters == expected.monsters  # type: ignore[attr-defined]
+        assert second.loot == 'nothing'  # type: ignore[attr-defined]
+        assert second.meta.kwargs == {}
+
+    def test_recycled_instances_forget_parent(self) -> None:
+        """Test that parents are not carried over between masterings."""
+        parent = Encounter()
+        with Encounter.pool(1) as pool:
+            child = pool.master(parent=parent)
+            assert child.meta.parent is parent
+            pool.release(child)
+            assert pool.master().meta.parent is None
+
+    def test_release_beyond_size_drops_instances(self) -> None:
+        """Test that the pool holds at most ``size`` released instances."""
+        pool = Encounter.pool(1)
+        pool.release(pool.master(), pool.master())
+        assert len(pool) == 1
+
+    def test_close_drops_released_instances(self) -> None:
+        """Test that leaving the context empties the pool."""
+        with Encounter.pool(4) as pool:
+            pool.release(pool.master())
+        assert len(pool) == 0
+
+    def test_release_wrong_class(self) -> None:
+        """Test that only instances of the pooled class can be released."""
+
+        class Other(blueprint.Blueprint):
+            value = 1
+
+        pool = Encounter.pool(1)
+        with pytest.raises(TypeError, match='Cannot release Other'):
+            pool.release(Other())
+
+    def test_classes_overriding_new_cannot_be_pooled(self) -> None:
+        """Test that mods and factories are rejected."""
+
+        class Magical(blueprint.Mod):
+            value = 2
+
+        with pytest.raises(TypeError, match='cannot be pooled'):
+            Magical.pool(1)
+
+
+class TestBlueprintPoolDebug:
+    """Test use-after-release detection."""
+
+    def test_use_after_release(self) -> None:
+        """Test that released instances cannot be read or written in debug mode."""
+        pool = Encounter.pool(1, debug=True)
+        encounter = pool.master()
+        pool.release(encounter)
+
+        with pytest.raises(ReleasedBlueprintError, match="'monsters'"):
+            encounter.monsters  # type: ignore[attr-defined]  # noqa: B018
+        with pytest.raises(ReleasedBlueprintError, match="'loot'"):
+            encounter.loot = 'gold'  # type: ignore[attr-defined]
+        assert repr(encounter) == '<released blueprint>'
+
+    def test_double_release(self) -> None:
+        """Test that releasing twice is detected in debug mode."""
+        pool = Encounter.pool(1, debug=True)
+        encounter = pool.master()
+        pool.release(encounter)
+        with pytest.raises(ReleasedBlueprintError, match='more than once'):
+            pool.release(encounter)
+
+    def test_reacquired_instance_is_usable(self) -> None:
+        """Test that recycled instances work normally again."""
+        pool = Encounter.pool(1, debug=True)
+        encounter = pool.master()
+        pool.release(encounter)
+        again = pool.master(seed='x')
+        assert again is encounter
+        assert type(again) is Encounter
+        assert 1 <= again.monsters <= 100
+
+    def test_dropped_instances_are_still_poisoned(self) -> None:
+        """Test that instances dropped by a full pool are still flagged as released."""
+        pool = Encounter.pool(0, debug=True)
+        encounter = pool.master()
+        pool.release(encounter)
+        assert len(pool) == 0
+        with pytest.raises(ReleasedBlueprintError):
+            encounter.meta  # noqa: B018
@@ -0,0 +1,118 @@
+"""Tests for pools of prefetched blueprints."""
+
+import random
+import time
+from typing import Any
+
+import pytest
+
+import blueprint
+from blueprint.collection import BlueprintCollection
+from blueprint.prefetch import ReadyPool
+
+
+class Loot(blueprint.Blueprint):
+    gold = blueprint.RandomInt(1, 100)
+
+
+class Nap(blueprint.Field):
+    """Sleeps for a random moment, so that workers finish out of order."""
+
+    def __call__(self, parent: Any) -> None:  # noqa: ANN401
+        time.sleep(random.random() / 100)  # noqa: S311
+
+
+class Slow(blueprint.Blueprint):
+    nap = Nap()
+
+
+class Curse(blueprint.Field):
+    """Fails for the blueprint seeded ``'c1'``."""
+
+    def __call__(self, parent: Any) -> None:  # noqa: ANN401
+        if parent.meta.seed == 'c1':
+            msg = 'cursed c1'
+            raise RuntimeError(msg)
+
+
+class Cursed(blueprint.Blueprint):
+    curse = Curse()
+
+
+class TestReadyPool:
+    """Test ReadyPool buffering and fallbacks."""
+
+    def test_get_falls_back_to_inline_mastering(self) -> None:
+        """Test that an empty, unstarted pool masters inline."""
+        pool = ReadyPool(Loot, size=4, start=False)
+        loot = pool.get()
+        assert isinstance(loot, Loot)
+        assert pool.misses == 1
+        assert pool.hits == 0
+        assert pool.fill_level == pytest.approx(0.0)
+
+    def test_background_threads_fill_the_buffer(self) -> None:
+        """Test that workers keep the buffer full and get() serves from it."""
+        with ReadyPool(Loot, size=4, workers=2) as pool:
+            assert pool.fill(timeout=10)
+            assert len(pool) == 4
+            assert pool.fill_level == pytest.approx(1.0)
+
+            loot = pool.get()
+
+            assert isinstance(loot, Loot)
+            assert pool.hits == 1
+            assert pool.fill(timeout=10)
+            assert pool.produced >= 5
+            assert pool.refill_rate > 0
+
+    def test_collection_sources_are_served_in_index_order(self) -> None:
+        """Test that collections are consumed by index."""
+        collection = BlueprintCollection(Loot, seed='hoard')
+        with ReadyPool(collection, size=3) as pool:
+            assert pool.fill(timeout=10)
+            served = [pool.get() for _ in range(3)]
+        assert [item.meta.seed for item in served] == ['hoard0', 'hoard1', 'hoard2']
+
+    def test_callable_sources(self) -> None:
+        """Test that any zero-argument callable can be used as a source."""
+        pool = ReadyPool(lambda: 'item', size=1, start=False)
+        assert pool.get() == 'item'
+
+    def test_close_stops_workers(self) -> None:
+        """Test that close() stops refilling, and start() is idempotent."""
+        pool = ReadyPool(Loot, size=2)
+        pool.start()
+        assert pool.fill(timeout=10)
+        pool.close()
+        pool.get()
+        assert len(pool) == 1
+
+    def test_fill_timeout(self) -> None:
+        """Test that fill() gives up when nothing refills the buffer."""
+        pool = ReadyPool(Loot, size=1, start=False)
+        assert not pool.fill(timeout=0.01)
+
+    def test_metrics(self) -> None:
+        """Test the metrics snapshot."""
+        pool = ReadyPool(Loot, size=0, start=False)
+        assert pool.metrics() == {'fill_level': 0.0, 'refill_rate': 0.0, 'hits': 0, 'misses': 0, 'produced': 0}
+
+    def test_many_workers_serve_in_order_without_loss(self) -> None:
+        """Test that workers finishing out of order neither reorder nor drop instances."""
+        collection = BlueprintCollection(Slow, seed='hoard')
+        with ReadyPool(collection, size=2, workers=4) as pool:
+            served = [pool.get() for _ in range(12)]
+            assert pool.fill(timeout=10)
+            assert len(pool) == 2
+        assert [item.meta.seed for item in served] == [f'hoard{i}' for i in range(12)]
+
+    def test_source_errors_are_reraised(self) -> None:
+        """Test that an error in a worker is raised by get() in place of the failed instance."""
+        with ReadyPool(BlueprintCollection(Cursed, seed='c'), size=3, workers=2) as pool:
+            assert pool.get().meta.seed == 'c0'
+            with pytest.raises(RuntimeError, match='cursed c1'):
+                pool.get()
+            assert pool.get().meta.seed == 'c2'
+        with ReadyPool(BlueprintCollection(Cursed, seed='c'), size=3) as pool, pytest.raises(RuntimeError):
+            pool.fill(timeout=10)
@@ -0,0 +1,125 @@
+"""Tests for memory-mapped word list tables."""
+
+import collections
+import copy
+import pathlib
+import pickle  # noqa: S403
+import random
+import types
+
+import pytest
+
+import blueprint
+from blueprint.tables import Table, TableField, convert, read_entries, write_table
+
+
+class TestWriteTable:
+    """Test writing and reading table files."""
+
+    def test_round_trip(self, tmp_path: pathlib.Path) -> None:
+        """Test that entries are stored in order and decoded on access."""
+        path = tmp_path / 'names.table'
+        assert write_table(['Ælfric', ('Brunhild', 2), ('', 0)], path) == 3
+        with Table(path) as table:
+            assert len(table) == 3
+            assert [table[i] for i in range(3)] == ['Ælfric', 'Brunhild', '']
+            assert [table[i] for i in range(-3, 0)] == ['Ælfric', 'Brunhild', '']
+            for index in (3, -4):
+                with pytest.raises(IndexError, match='out of range'):
+                    table[index]
+            assert table.total == pytest.approx(3.0)
+            assert repr(table) == f'<Table: {path} (3 entries)>'
+
+    def test_weighted_picks(self, tmp_path: pathlib.Path) -> None:
+        """Test that picks follow the weights, and zero-weight entries are never picked."""
+        path = tmp_path / 'loot.table'
+        write_table([('common', 9), ('never', 0), ('rare', 1)], path)
+        rng = random.Random(0)  # noqa: S311
+        with Table(path) as table:
+            counts = collections.Counter(table.pick(rng) for _ in range(10000))
+        assert set(counts) == {'common', 'rare'}
+        assert 0.85 < counts['common'] / 10000 < 0.95
+
+    @pytest.mark.parametrize('entries', [['a', 'b', 'c'], [('a', 1), ('b', 2), ('c', 1), ('never', 0)]])
+    def test_picks_clamp_to_last_entry(self, tmp_path: pathlib.Path, entries: list[str]) -> None:
+        """Test that a random value rounding up to the total picks the last entry with a positive weight."""
+        path = tmp_path / 'edge.table'
+        write_table(entries, path)
+        with Table(path) as table:
+            assert table.pick(types.SimpleNamespace(random=lambda: 1.0)) == 'c'
+
+    def test_uniform_picks(self, tmp_path: pathlib.Path) -> None:
+        """Test that uniform tables pick every entry."""
+        path = tmp_path / 'uniform.table'
+        write_table(['a', 'b', 'c'], path)
+        rng = random.Random(0)  # noqa: S311
+        with Table(path) as table:
+            assert {table.pick(rng) for _ in range(100)} == {'a', 'b', 'c'}
+
+    def test_invalid_weights(self, tmp_path: pathlib.Path) -> None:
+        """Test that empty tables and negative weights are rejected."""
+        with pytest.raises(ValueError, match='at least one entry'):
+            write_table([], tmp_path / 'empty.table')
+        with pytest.raises(ValueError, match='at least one entry'):
+            write_table([('a', 0)], tmp_path / 'zero.table')
+        with pytest.raises(ValueError, match='non-negative'):
+            write_table([('a', -1)], tmp_path / 'negative.table')
+
+    def test_not_a_table(self, tmp_path: pathlib.Path) -> None:
+        """Test that other files are rejected."""
+        path = tmp_path / 'words.txt'
+        path.write_text('not a table\n')
+        with pytest.raises(ValueError, match='not a blueprint table file'):
+            Table(path)
+        path.write_text('x')
+        with pytest.raises(ValueError, match='not a blueprint table file'):
+            Table(path)
+
+
+class TestConvert:
+    """Test converting word lists."""
+
+    def test_text(self, tmp_path: pathlib.Path) -> None:
+        """Test that text files have one entry per line, with optional tab-separated weights."""
+        source = tmp_path / 'words.txt'
+        source.write_text('alpha\n\nbeta\t2.5\ngamma\t\n', encoding='utf-8')
+        assert list(read_entries(source)) == [('alpha', 1.0), ('beta', 2.5), ('gamma', 1.0)]
+
+    def test_csv(self, tmp_path: pathlib.Path) -> None:
+        """Test that CSV files have entries in the first column and weights in the second."""
+        source = tmp_path / 'words.csv'
+        source.write_text('"Smith, John",3\nJane\n', encoding='utf-8')
+        path = tmp_path / 'words.table'
+        assert convert(source, path) == 2
+        with Table(path) as table:
+            assert table[0] == 'Smith, John'
+            assert table.total == pytest.approx(4.0)
+
+
+class TestTableField:
+    """Test TableField."""
+
+    def test_field(self, tmp_path: pathlib.Path) -> None:
+        """Test that the field picks from the table with the parent's random number generator."""
+        path = tmp_path / 'titles.table'
+        write_table([('the Bold', 1), ('the Wise', 1), ('the Unready', 2)], path)
+
+        class Hero(blueprint.Blueprint):
+            title = TableField(path)
+
+        assert Hero(seed='x').title == Hero(seed='x').title
+        assert Hero().title in {'the Bold', 'the Wise', 'the Unready'}  # type: ignore[comparison-overlap]
+        assert str(Hero.title) == str(path)
+        Hero.title.table.close()
+
+    def test_copies_map_the_file_again(self, tmp_path: pathlib.Path) -> None:
+        """Test that fields can be copied and pickled after their table is mapped."""
+        path = tmp_path / 'titles.table'
+        write_table(['the Bold'], path)
+        field = TableField(path)
+        table = field.table
+        for other in (copy.deepcopy(field), pickle.loads(pickle.dumps(field))):  # noqa: S301
+            assert other.table is not table
+            assert other.table[0] == 'the Bold'
+            other.table.close()
+        table.close()
@@ -263,6 +263,24 @@ class TestTagRepository:
         assert t in repo.query_tag('foo')
         assert t.tag_repo is None
 
+    def test_tag_repository_generation(self) -> None:
+        """Test that every mutation advances the repository's generation."""
+        repo = taggables.TagRepository()
+        t = taggables.Taggable(None, 'foo')
+        generations = [repo.generation]
+        repo.add_object(t)
+        generations.append(repo.generation)
+        t.add_tag('bar')
+        generations.append(repo.generation)
+        t.remove_tag('bar')
+        generations.append(repo.generation)
+        repo.remove_object(t)
+        generations.append(repo.generation)
+        repo.query_tag('foo')
+        generations.append(repo.generation)
+
+        assert generations == [0, 1, 2, 3, 4, 4]
+
     def test_tag_repository_remove_object(self, repo: taggables.TagRepository, t1: taggables.Taggable) -> None:
         """Test removing object from repository."""
         repo.remove_object(t1)
@@ -341,3 +359,55 @@ class TestTagSet:
         result = ts.query_tags_difference('bar')
         assert t1 in result
         assert t2 not in result
+
+
+class TestQueryCache:
+    """Test the LRU query cache."""
+
+    def test_hits_and_misses(self) -> None:
+        """Test that results are computed once per key and generation."""
+        cache = taggables.QueryCache()
+        assert cache.get(0, 'a', lambda: 1) == 1
+        assert cache.get(0, 'a', lambda: 2) == 1
+        assert cache.get(1, 'a', lambda: 3) == 3
+        assert cache.info() == {'hits': 1, 'misses': 2, 'size': 1, 'maxsize': 256}
+
+    def test_lru_eviction(self) -> None:
+        """Test that the least recently used result is evicted."""
+        cache = taggables.QueryCache(maxsize=2)
+        cache.get(0, 'a', lambda: 1)
+        cache.get(0, 'b', lambda: 2)
+        cache.get(0, 'a', lambda: 1)
+        cache.get(0, 'c', lambda: 3)
+        assert len(cache) == 2
+        assert cache.get(0, 'b', lambda: 4) == 4
+        assert cache.get(0, 'c', lambda: 5) == 3
+
+    def test_stale_results_are_not_stored(self) -> None:
+        """Test that a result computed for an outdated generation is not cached."""
+        cache = taggables.QueryCache()
+
+        def compute() -> int:
+            cache.get(1, 'other', lambda: 0)
+            return 1
+
+        assert cache.get(0, 'a', compute) == 1
+        assert cache.get(1, 'a', lambda: 2) == 2
+
+    def test_clear(self) -> None:
+        """Test clearing the cache."""
+        cache = taggables.QueryCache()
+        cache.get(0, 'a', lambda: 1)
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_repository_queries_are_cached(self, repo: taggables.TagRepository, t1: taggables.Taggable) -> None:
+        """Test that repository queries reuse results until the repository changes."""
+        first = repo.query(['foo'])
+        first.clear()
+        assert t1 in repo.query(iter(['foo']))
+        assert repo.query_cache.hits == 1
+
+        t1.remove_tag('foo')
+        assert t1 not in repo.query(['foo'])
+        assert repo.query_cache.misses == 2